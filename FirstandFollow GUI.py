@@ -1,35 +1,11 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext
 from FirstandFollow import GrammarAnalyzer  
-
-# ترمینال های تک حرفی
-TERMINAL_SYMBOLS = ['(', ')', '+', '*', '-', '/', '^', '=', '|'] 
-
-def tokenize_production(production_str):
-    """توکن‌بندی صحیح نمادها با فاصله"""
-    for symbol in TERMINAL_SYMBOLS:
-        production_str = production_str.replace(symbol, f' {symbol} ')
-    production_str = ' '.join(production_str.split())
-    return production_str
-
-def parse_grammar(text):
-    #تدبیل متن گرامر به دیکشنری
-    grammar = {}
-    for line in text.split("\n"):
-        line = line.strip()
-        if not line or ":" not in line or line.startswith(":"):
-            continue
-        try:
-            left, right = line.split(":", 1)
-            left = left.strip()
-            if not right.strip():
-                continue
-            tokenized_right = tokenize_production(right)
-            productions = [p.strip() for p in tokenized_right.split("|")]
-            grammar[left] = [p for p in productions if p]
-        except ValueError:
-            continue
-    return grammar
+from background import BackgroundJob
+from grammar_cache import GrammarCache
+from grammar_loader import parse_grammar
+from instrumentation import AnalyzerStats
+from ll1_table import LL1Table
 
 # ----------------------- GUI -----------------------
 
@@ -42,6 +18,12 @@ class GrammarGUI(tk.Tk):
         self.style = ttk.Style(self)
         self.style.theme_use('clam')
         self.set_dark_theme()
+        self.job = None
+        self.analyzer = None
+        try:
+            self.cache = GrammarCache()     # نتیجه ی گرامرهای تکراری از دیسک خوانده میشه
+        except OSError:
+            self.cache = None
         self.create_widgets()
 
     def set_dark_theme(self):
@@ -99,8 +81,19 @@ F: ( E ) | id""")
         self.grammar_box.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
 
         # --- دکمه Run ---
-        run_btn = ttk.Button(main_frame, text="Compute FIRST & FOLLOW", command=self.run_analysis)
-        run_btn.pack(fill=tk.X, pady=(0, 20))
+        self.run_btn = ttk.Button(main_frame, text="Compute FIRST & FOLLOW", command=self.run_analysis)
+        self.run_btn.pack(fill=tk.X, pady=(0, 5))
+
+        self.status_label = ttk.Label(main_frame, text="", foreground="#CCCCCC", font=("Segoe UI", 10))
+        self.status_label.pack(fill=tk.X, pady=(0, 5))
+
+        # --- دکمه جدول LL(1) ---
+        table_btn = ttk.Button(main_frame, text="Show LL(1) Parse Table", command=self.show_ll1_table)
+        table_btn.pack(fill=tk.X, pady=(0, 5))
+
+        # --- دکمه آمار محاسبه ---
+        stats_btn = ttk.Button(main_frame, text="Show Statistics", command=self.show_stats)
+        stats_btn.pack(fill=tk.X, pady=(0, 15))
 
         # --- خروجی‌ها ---
         output_frame = ttk.Frame(main_frame)
@@ -131,8 +124,13 @@ F: ( E ) | id""")
         return frame
 
     def run_analysis(self):
+        if self.job is not None:
+            self.job.cancel()   # دکمه در حین محاسبه نقش Cancel را دارد
+            return
+
         raw = self.grammar_box.get("1.0", tk.END).strip()
-        grammar = parse_grammar(raw)
+        errors = []
+        grammar = parse_grammar(raw, errors)
 
         self.first_output.text_box.delete("1.0", tk.END)
         self.follow_output.text_box.delete("1.0", tk.END)
@@ -140,15 +138,126 @@ F: ( E ) | id""")
         if not grammar:
             messagebox.showwarning("خطا در ورودی", "لطفاً گرامر معتبر را وارد کنید.")
             return
+        if errors:
+            # خط های نادرست رد میشن و بقیه ی گرامر تحلیل میشه
+            messagebox.showwarning("خطا در ورودی", "\n".join(str(e) for e in errors[:10]))
 
-        try:
-            start_symbol = list(grammar.keys())[0]
-            analyzer = GrammarAnalyzer(grammar, start_symbol=start_symbol)
+        start_symbol = list(grammar.keys())[0]
+        self.analyzer = None
+
+        def work(progress):
+            stats = AnalyzerStats()
+            if self.cache is not None:
+                return self.cache.analyze(grammar, start_symbol, progress=progress, stats=stats,
+                                          solver="worklist")
+            analyzer = GrammarAnalyzer(grammar, start_symbol=start_symbol, solver="worklist")
+            analyzer.progress = progress
+            analyzer.stats = stats
             analyzer.compute_follow_sets()
-            self._show_sets(self.first_output.text_box, analyzer.first)
-            self._show_sets(self.follow_output.text_box, analyzer.follow)
-        except Exception as e:
-            messagebox.showerror("خطای محاسبه", f"در محاسبه First/Follow خطایی رخ داد: \n{e}")
+            return analyzer
+
+        def show_progress(value):
+            phase, passes = value
+            self.status_label.configure(text=f"{phase}: pass {passes}")
+
+        self.run_btn.configure(text="Cancel")
+        self.job = BackgroundJob(self, work, self.analysis_done, on_progress=show_progress,
+                                 on_error=self.analysis_failed, on_cancel=self.analysis_cancelled).start()
+
+    def _job_finished(self, status=""):
+        self.job = None
+        self.run_btn.configure(text="Compute FIRST & FOLLOW")
+        self.status_label.configure(text=status)
+
+    def analysis_done(self, analyzer):
+        status = ""
+        if self.cache is not None:
+            stats = self.cache.stats()
+            status = f"cache: {stats['hits']} hits / {stats['misses']} misses"
+        self._job_finished(status)
+        self.analyzer = analyzer
+        self._show_sets(self.first_output.text_box, analyzer.first)
+        self._show_sets(self.follow_output.text_box, analyzer.follow)
+
+    def analysis_failed(self, e):
+        self._job_finished()
+        messagebox.showerror("خطای محاسبه", f"در محاسبه First/Follow خطایی رخ داد: \n{e}")
+
+    def analysis_cancelled(self):
+        self._job_finished("Cancelled")
+
+    def show_ll1_table(self):
+        if self.analyzer is None:
+            messagebox.showwarning("خطا در ورودی", "ابتدا FIRST و FOLLOW را محاسبه کنید.")
+            return
+
+        if self.cache is not None:
+            table = self.cache.ll1_table(self.analyzer)
+        else:
+            table = LL1Table(self.analyzer)
+        terminals = table.grammar.terminals[1:]     # ستون اپسیلون نمایش داده نمیشه
+
+        window = tk.Toplevel(self)
+        window.title("LL(1) Parse Table")
+        window.geometry("900x500")
+        window.configure(bg="#1E1F22")
+        frame = ttk.Frame(window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = [f"c{i}" for i in range(len(terminals) + 1)]
+        tree = ttk.Treeview(frame, columns=columns, show='headings')
+        tree.heading("c0", text="")
+        tree.column("c0", width=80, anchor='center', stretch=False)
+        for col, terminal in zip(columns[1:], terminals):
+            tree.heading(col, text=terminal)
+            tree.column(col, width=120, anchor='center', stretch=False)
+        for nonterminal, cells in table.rows():
+            tree.insert("", tk.END, values=(nonterminal, *cells))
+
+        x_scroll = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=tree.xview)
+        y_scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        # --- تداخل ها ---
+        report = scrolledtext.ScrolledText(window, height=6, font=("Consolas", 11),
+                                           bg="#1D1F22", fg="#E0E0E0")
+        if table.is_ll1:
+            report.insert(tk.END, "Grammar is LL(1): no conflicts.")
+        else:
+            report.insert(tk.END, "\n".join(table.describe_conflicts()))
+        report.configure(state=tk.DISABLED)
+        report.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+    def show_stats(self):
+        if self.analyzer is None or self.analyzer.stats is None:
+            messagebox.showwarning("خطا در ورودی", "ابتدا FIRST و FOLLOW را محاسبه کنید.")
+            return
+        stats = self.analyzer.stats
+
+        window = tk.Toplevel(self)
+        window.title("Analysis Statistics")
+        window.geometry("600x500")
+        window.configure(bg="#1E1F22")
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=".json",
+                                                filetypes=[("JSON Files", "*.json")])
+            if path:
+                try:
+                    stats.write_json(path)
+                except OSError as e:
+                    messagebox.showerror("خطا", f"ذخیره ی فایل ممکن نشد: \n{e}", parent=window)
+
+        export_btn = ttk.Button(window, text="Export JSON", command=export)
+        export_btn.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        report = scrolledtext.ScrolledText(window, font=("Consolas", 11), bg="#1D1F22", fg="#E0E0E0")
+        report.insert(tk.END, stats.format())
+        report.configure(state=tk.DISABLED)
+        report.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def _show_sets(self, box, data):
         output_lines = []
@@ -1,11 +1,110 @@
+from collections import deque
+
+from compiled_grammar import CompiledGrammar
+
+
+# روش های حل:
+#   fixpoint : تکرار روی همه ی قوانین تا وقتی چیزی تغییر نکند (پیاده سازی مرجع)
+#   worklist : فقط قوانینی که ورودی شان تغییر کرده دوباره بررسی میشن،
+#              FOLLOW هم با ادغام مولفه های قویا همبند (SCC) یک بار محاسبه میشه
+SOLVERS = ('fixpoint', 'worklist')
+
+
+def _strongly_connected_components(nodes, successors):
+    """
+    الگوریتم Tarjan بدون بازگشت.
+    مولفه ها به ترتیب توپولوژیک معکوس برگردانده میشن (هر مولفه بعد از همه ی مقصدهایش)
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            v, children = work[-1]
+            for w in children:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(successors[w])))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+# بیت های روشن هر بایت - برای تبدیل سریع بیت ماسک به شماره ی ترمینال ها
+_BYTE_BITS = [tuple(i for i in range(8) if byte >> i & 1) for byte in range(256)]
+
+
+def _bit_ids(value):
+    # شماره ی بیت های روشن، بایت به بایت به جای یک دور به ازای هر بیت
+    ids = []
+    for k, byte in enumerate(value.to_bytes((value.bit_length() + 7) // 8, 'little')):
+        if byte:
+            base = k * 8
+            for i in _BYTE_BITS[byte]:
+                ids.append(base + i)
+    return ids
+
+
+def _merge_bits(values, i, new):
+    # values[i] |= new  -  خروجی: آیا چیزی اضافه شد
+    merged = values[i] | new
+    if merged == values[i]:
+        return False
+    values[i] = merged
+    return True
+
+
+def _merge_set(values, i, new):
+    if new <= values[i]:        # بدون ساخت مجموعه ی جدید وقتی چیزی اضافه نمیشه
+        return False
+    values[i] = values[i] | new
+    return True
+
+
 class GrammarAnalyzer:
-    def __init__(self, grammar, start_symbol, epsilon="ε", eof="$"):
+    def __init__(self, grammar, start_symbol, epsilon="ε", eof="$", solver="fixpoint",
+                 bitsets=False):
+        if solver not in SOLVERS:
+            raise ValueError(f"unknown solver {solver!r}, expected one of {SOLVERS}")
+        self.solver = solver
+        # در حالت bitsets هر مجموعه در حین حل یک عدد صحیح (بیت ماسک) است
+        # (در غیر این صورت frozenset) و در پایان به مجموعه ی رشته ها تبدیل میشه
+        self.bitsets = bitsets
         self.grammar = grammar
         self.start = start_symbol #نماد شروع گرامر
         self.epsilon = epsilon
         self.eof = eof
 
         self.non_terminals = set(grammar.keys())
+
+        # گرامر یک بار به شکل داخلی (شماره ی نمادها، قوانین به صورت tuple) تبدیل میشه
+        self.compiled = CompiledGrammar(grammar, epsilon, eof)
         
         #ساخت مجموعه خالی فرست و فالو برای هر نان_ترمینال
         self.first = {nt: set() for nt in self.non_terminals}
@@ -13,6 +112,12 @@ class GrammarAnalyzer:
         
         self.follow[self.start].add(self.eof)
 
+        # تابع گزارش پیشرفت (اختیاری) - با (مرحله, تعداد دور) صدا زده میشه
+        self.progress = None
+
+        # آمار حل (اختیاری) - یک instrumentation.AnalyzerStats
+        self.stats = None
+
     # -----------------------------------------------------
     # --------------------توایع کمکی----------------
     # ------------------------------------
@@ -49,98 +154,225 @@ class GrammarAnalyzer:
         return result
     
 
-    def _find_nonterminal_occurrences(self, production):
-        # این تابع تو محاسبه فالو ها لازممون میشه
-        # find B and betha in "A --> ...'B' beta"
-        result = []
-        production_symbols = production.split()
-        for i, symbol in enumerate(production_symbols):
-            if symbol in self.non_terminals:
-                beta = production_symbols[i + 1:]
-                result.append((symbol, beta))
-        return result
+    # ---------------------------------------------------------
+    # ---------------- نمایش داخلی مجموعه ها -----------------
+    # --------------------------------------
+    #   هر دو حل کننده روی CompiledGrammar کار میکنن و اعضای مجموعه ها شماره ی ترمینال ها هستن:
+    #     bitsets=False : frozenset از شماره ها
+    #     bitsets=True  : عدد صحیح (بیت t یعنی ترمینال t)
+    #   عملگرهای | و & و - برای هر دو نمایش یکسان کار میکنن
+
+    def _prepare(self):
+        g = self.compiled
+        if self.bitsets:
+            self._const = [1 << t for t in range(len(g.terminals))]
+            self._empty = 0
+            self._merge = _merge_bits
+        else:
+            self._const = [frozenset((t,)) for t in range(len(g.terminals))]
+            self._empty = frozenset()
+            self._merge = _merge_set
+        self._eps = self._const[0]
+
+    def _first_of_codes(self, first, codes):
+        # مثل _get_first_of_sequence ولی روی کد نمادها
+        const, eps = self._const, self._eps
+        result = self._empty
+        for symbol in codes:
+            fst = first[symbol] if symbol >= 0 else const[~symbol]
+            if not fst & eps:
+                return result | fst
+            result = result | (fst - eps)
+        return result | eps
+
+    def terminal_ids(self, value):
+        """شماره ی ترمینال های یک مجموعه ی داخلی (برای هر دو نمایش)"""
+        if not self.bitsets:
+            return value
+        return _bit_ids(value)
+
+    def _publish(self, values):
+        terminals = self.compiled.terminals
+        return {nt: {terminals[t] for t in self.terminal_ids(value)}
+                for nt, value in zip(self.compiled.nonterminals, values)}
+
+    def snapshot(self):
+        """FIRST و FOLLOW به صورت بیت ماسک (بیت t یعنی ترمینال t) برای ذخیره در کش"""
+        if self.bitsets:
+            return list(self._first), list(self._follow)
+        def pack(value):
+            return sum(1 << t for t in value)
+        return [pack(value) for value in self._first], [pack(value) for value in self._follow]
+
+    def restore(self, first, follow):
+        """بارگذاری نتیجه ی snapshot بدون اجرای دوباره ی حل کننده ها"""
+        self._prepare()
+        if self.bitsets:
+            self._first, self._follow = list(first), list(follow)
+        else:
+            self._first = [frozenset(_bit_ids(value)) for value in first]
+            self._follow = [frozenset(_bit_ids(value)) for value in follow]
+        self.first = self._publish(self._first)
+        self.follow = self._publish(self._follow)
+        self.suffix_first = [self._suffix_firsts(self._first, codes) for codes in self.compiled.rhs]
 
     # ---------------------------------------------------------
     # ---------------------- FIRST SETS --------------
     # -------------------------------------------
 
-    def compute_first_sets(self): 
-        
-        changed = True
-        """ 
-    فلگ برای بررسی مجدد فرست تمام
-    نان ترمینال ها وقتی که یکیشون تغییر کنه
-    """
-        while changed:
-            changed = False
-            for A in self.non_terminals:
-                for rule_str in self.grammar[A]:
-                    
-                    # محاسبه First برای سمت راست قانون
-                    rule_symbols = rule_str.split()
-                    rule_first = self._get_first_of_sequence(rule_symbols)
-
-                    # اضاف»نه کردن به مجموعه First فعلی A
-                    before_count = len(self.first[A])
-                    self.first[A].update(rule_first)
-                    if len(self.first[A]) > before_count:
-                        changed = True
-
-    # ---------------------------------------------------------
-    # ---------------- FOLLOW SETS -----------------
-    # --------------------------------------
+    def compute_first_sets(self):
+        g = self.compiled
+        self._prepare()
+        first_of, merge = self._first_of_codes, self._merge
+        lhs, rhs = g.lhs, g.rhs
+        first = [self._empty] * len(g.nonterminals)
+        phase = self.stats.begin('FIRST', self) if self.stats is not None else None
 
-    def _apply_follow_rules(self, A, B, beta):
+        if self.solver == 'worklist':
+            # فقط قوانینی که به یک FIRST تغییر کرده وابسته اند دوباره بررسی میشن
+            work = deque(range(len(rhs)))
+            queued = [True] * len(rhs)
+            evaluated = 0
+            while work:
+                p = work.popleft()
+                queued[p] = False
+                evaluated += 1
+                if phase is not None:
+                    phase.evaluated(len(work))
+                if self.progress is not None and not evaluated % 1024:
+                    self.progress(('FIRST', evaluated))
 
+                A = lhs[p]
+                if merge(first, A, first_of(first, rhs[p])):
+                    if phase is not None:
+                        phase.grew(A)
+                    for q in g.users[A]:
+                        if not queued[q]:
+                            queued[q] = True
+                            work.append(q)
+        else:
+            changed = True
+            """
+        فلگ برای بررسی مجدد فرست تمام
+        نان ترمینال ها وقتی که یکیشون تغییر کنه
         """
-        اعمال قوانین 
-        FOLLOW 
-        برای
-          A -> ... 'B'beta
-        """
-        if beta:
-            ''' rule1 : Follow(B) += First(beta) - {ε}'''
-            first_of_beta_seq = self._get_first_of_sequence(beta)
-            self.follow[B].update(first_of_beta_seq - {self.epsilon})
+            passes = 0
+            while changed:
+                changed = False
+                passes += 1
+                if self.progress is not None:
+                    self.progress(('FIRST', passes))
+                if phase is not None:
+                    phase.new_pass(len(rhs))
+                for p in range(len(rhs)):
+                    # اضافه کردن First سمت راست قانون به First فعلی A
+                    if merge(first, lhs[p], first_of(first, rhs[p])):
+                        changed = True
+                        if phase is not None:
+                            phase.grew(lhs[p])
 
+        self._first = first
+        self.first = self._publish(first)
+        if phase is not None:
+            phase.finish(g.nonterminals, self.first)
 
-            ''' rule2 : if epsilon be in First(beta) then
-                --> Follow (B)=Follow(A)+follow(B)'''
-            if self.epsilon in first_of_beta_seq:
-                self.follow[B].update(self.follow[A])
-        else: # بتا وجود نداشته باشه
+        # FIRST هر پسوند هر قانون (rhs[p][i:]) یک بار حساب و نگه داشته میشه
+        self.suffix_first = [self._suffix_firsts(first, codes) for codes in rhs]
+
+    def _suffix_firsts(self, first, codes):
+        const, eps = self._const, self._eps
+        acc = eps
+        suffix = [acc]
+        for symbol in reversed(codes):
+            fst = first[symbol] if symbol >= 0 else const[~symbol]
+            acc = (fst - eps) | acc if fst & eps else fst
+            suffix.append(acc)
+        suffix.reverse()
+        return tuple(suffix)
+
+    # ---------------------------------------------------------
+    # ---------------- FOLLOW SETS -----------------
+    # --------------------------------------
 
-            self.follow[B].update(self.follow[A])
-            
     def compute_follow_sets(self):
         """اجرای کامل الگوریتم FOLLOW تا تثبیت همشون
           (FIXED-POINT algorithm)
           مسابه بخس محاسبه فرست ها"""
-        
+
         self.compute_first_sets() #محاسبه تمام فرست هی گرامر
 
-        changed = True # مشابه بخش محاسبه فرست ها
-        while changed:
-            changed = False
-            
-            for A in self.non_terminals: 
-                for production_str in self.grammar[A]: 
-                    
-                    # پیدا کردن تمام الگوهای بدون نان ترمینال در سمت راست
-                    occurrences = self._find_nonterminal_occurrences(production_str)
-                    
-                    # اجرای قوانین روی تک‌تک موارد B
-                    for (nonterminal, beta) in occurrences:
-                        before = len(self.follow[nonterminal])
-                        self._apply_follow_rules(A, nonterminal, beta)
+        g = self.compiled
+        eps = self._eps
+        follow = [self._empty] * len(g.nonterminals)
+        start = g.nt_ids[self.start]
+        follow[start] = self._const[1]      # eof
+        phase = self.stats.begin('FOLLOW', self) if self.stats is not None else None
 
-                        if len(self.follow[nonterminal]) > before:
-                            changed = True
+        # هر رخداد  A -> ... B beta  همراه با First(beta) از کش پسوندها
+        occurrences = [(g.lhs[p], B, self.suffix_first[p][pos + 1])
+                       for B in range(len(g.nonterminals)) for p, pos in g.occurrences[B]]
 
+        if self.solver == 'worklist':
+            components = self._solve_follow_scc(follow, occurrences)
+            if phase is not None:
+                phase.new_pass(len(occurrences), None)
+                phase.components = components
+        else:
+            changed = True # مشابه بخش محاسبه فرست ها
+            passes = 0
+            while changed:
+                changed = False
+                passes += 1
+                if self.progress is not None:
+                    self.progress(('FOLLOW', passes))
+                if phase is not None:
+                    phase.new_pass(len(occurrences))
+                for A, B, first_of_beta in occurrences:
+                    # rule1 : Follow(B) += First(beta) - {ε}
+                    # rule2 : if epsilon be in First(beta) then Follow(B) += Follow(A)
+                    if first_of_beta & eps:
+                        first_of_beta = (first_of_beta - eps) | follow[A]
+                    if self._merge(follow, B, first_of_beta):
+                        changed = True
+                        if phase is not None:
+                            phase.grew(B)
 
+        self._follow = follow
+        self.follow = self._publish(follow)
+        if phase is not None:
+            phase.finish(g.nonterminals, self.follow)
 
+    def _solve_follow_scc(self, follow, occurrences):
+        """
+        قیدهای FOLLOW دو نوع اند:
+            Follow(B) ⊇ First(beta) - {ε}       (ثابت - بعد از محاسبه ی FIRST)
+            Follow(B) ⊇ Follow(A)  اگر beta تهی‌پذیر باشد  (یال A -> B)
+        گراف یال ها به مولفه های قویا همبند تقسیم میشه؛ همه ی اعضای یک مولفه
+        FOLLOW یکسان دارند و هر مولفه دقیقا یک بار به ترتیب توپولوژیک حساب میشه.
+        خروجی: تعداد مولفه ها
+        """
+        eps = self._eps
+        successors = [set() for _ in follow]
+        for A, B, first_of_beta in occurrences:
+            if first_of_beta & eps:
+                follow[B] = follow[B] | (first_of_beta - eps)
+                successors[A].add(B)
+            else:
+                follow[B] = follow[B] | first_of_beta
 
-    # ---------------------------------------------------------
+        components = _strongly_connected_components(range(len(follow)), successors)
+        for done, component in enumerate(reversed(components), 1):
+            if self.progress is not None and not done % 1024:
+                self.progress(('FOLLOW', done))
+
+            value = self._empty
+            for nt in component:
+                value = value | follow[nt]
+            for nt in component:
+                follow[nt] = value
+                for B in successors[nt]:
+                    follow[B] = follow[B] | value
+        return len(components)
 
 
 
@@ -155,4 +387,8 @@ if __name__ == "__main__":
     }
 
     analyzer = GrammarAnalyzer(test_grammar, start_symbol='E')
-    analyzer.run()
\ No newline at end of file
+    analyzer.compute_follow_sets()
+    for nt in test_grammar:
+        print(f"FIRST({nt}) = {{ {', '.join(sorted(analyzer.first[nt]))} }}")
+    for nt in test_grammar:
+        print(f"FOLLOW({nt}) = {{ {', '.join(sorted(analyzer.follow[nt]))} }}")
\ No newline at end of file
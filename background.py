@@ -0,0 +1,82 @@
+import threading
+
+
+class JobCancelled(Exception):
+    """بعد از cancel() از داخل تابع گزارش پیشرفت کار raise میشه"""
+
+
+class BackgroundJob:
+    """
+    اجرای work(progress) در یک thread جدا؛ نتیجه با سرکشی after() به thread
+    رابط Tk برگردونده میشه:
+
+      * work هر چند وقت progress(value) را صدا میزنه؛ آخرین مقدار هر interval
+        میلی ثانیه به on_progress داده میشه. بعد از cancel()، progress()
+        خطای JobCancelled میده و کار از همان گزارش بعدی متوقف میشه.
+      * on_done(result)، on_error(exc) یا on_cancel() روی thread رابط Tk اجرا میشن.
+        بدون on_error خطای کار همان جا دوباره raise میشه.
+    """
+
+    def __init__(self, widget, work, on_done, on_progress=None, on_error=None,
+                 on_cancel=None, interval=100):
+        self.widget = widget
+        self.work = work
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.interval = interval
+
+        self._cancelled = threading.Event()
+        self._progress = None
+        self._shown = None
+        self._outcome = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self.widget.after(self.interval, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def running(self):
+        return self._outcome is None
+
+    # ---------- thread کار ----------
+    def report(self, value):
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        self._progress = value
+
+    def _run(self):
+        try:
+            self._outcome = ('done', self.work(self.report))
+        except JobCancelled:
+            self._outcome = ('cancelled', None)
+        except Exception as e:
+            self._outcome = ('error', e)
+
+    # ---------- thread رابط Tk ----------
+    def _poll(self):
+        progress = self._progress
+        if self.on_progress is not None and progress is not None and progress != self._shown:
+            self._shown = progress
+            self.on_progress(progress)
+
+        if self._outcome is None:
+            self.widget.after(self.interval, self._poll)
+            return
+
+        kind, value = self._outcome
+        if kind == 'done':
+            self.on_done(value)
+        elif kind == 'error':
+            if self.on_error is None:
+                # مثل خطای هر callback دیگر Tk به report_callback_exception میرسه و گم نمیشه
+                raise value
+            self.on_error(value)
+        elif kind == 'cancelled' and self.on_cancel is not None:
+            self.on_cancel()
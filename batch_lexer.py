@@ -0,0 +1,163 @@
+import os
+from array import array
+from functools import partial
+
+from lexer import Lexer, map_file
+from token_buffer import TokenBuffer
+
+# کوچکترین تکه در lex_parallel - تکه های کوچکتر هزینه ی ارسال بیشتری از پیمایش دارن
+_MIN_CHUNK = 1 << 20
+
+
+def _lex_file(path, engine, cache=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        code = f.read()
+    lexer = Lexer(code, engine=engine)
+    if cache is None:
+        return lexer.tokenize()
+    hits, saved = cache.hits, cache.bytes_saved
+    buffer, table = cache.tokenize(lexer)
+    # در پردازه های فرزند آمار کش همراه نتیجه برمیگرده (None یعنی miss)
+    saved = cache.bytes_saved - saved if cache.hits > hits else None
+    return list(buffer), table, saved
+
+
+def merge_symbol_tables(tables):
+    """
+    ادغام جدول شناسه های چند فایل به ترتیب ورودی:
+    هر شناسه شماره ی اولین جایی که دیده شده را میگیره
+    """
+    merged = {}
+    for table in tables:
+        for name in table:          # ترتیب درج = ترتیب شماره های محلی
+            if name not in merged:
+                merged[name] = len(merged) + 1
+    return merged
+
+
+def lex_files(paths, workers=None, engine='regex', cache=None):
+    """
+    توکن سازی تعداد زیادی فایل به صورت موازی (ProcessPoolExecutor).
+    با cache (یک TokenCache) فایل های تغییرنکرده دوباره اسکن نمیشن.
+
+    خروجی: (لیست (path, tokens, symbol_table) به ترتیب paths, جدول شناسه ی سراسری)
+    نتیجه به تعداد workers بستگی ندارد
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    job = partial(_lex_file, engine=engine, cache=cache)
+    if workers <= 1 or len(paths) <= 1:
+        results = [job(path) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(job, paths, chunksize=chunksize))
+        if cache is not None:
+            for _, _, saved in results:
+                cache.record(saved)
+    if cache is not None:
+        results = [(tokens, table) for tokens, table, _ in results]
+
+    files = [(path, tokens, table) for path, (tokens, table) in zip(paths, results)]
+    return files, merge_symbol_tables(table for _, _, table in files)
+
+
+def split_lines(code, parts, min_size=None):
+    """
+    تقسیم code (str یا bytes/mmap) به حداکثر parts تکه ی (start, end) که همه
+    بعد از '\n' تمام میشن. هیچ توکنی از '\n' عبور نمیکنه پس هر تکه مستقل لکس میشه
+    """
+    newline = '\n' if isinstance(code, str) else b'\n'
+    size = max(min_size or _MIN_CHUNK, -(-len(code) // max(parts, 1)))
+    bounds = []
+    start = 0
+    while start < len(code):
+        end = code.find(newline, start + size - 1) + 1 or len(code)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _run_parallel(job, jobs, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        return [job(*args) for args in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(job, *zip(*jobs)))
+
+
+def _lex_chunk(code, first_line, engine):
+    return Lexer(code, engine=engine).tokenize(first_line)
+
+
+def lex_parallel(code, workers=None, engine='regex', chunks=None):
+    """
+    توکن سازی یک متن بزرگ با چند پردازه: متن در مرز خط ها به تکه ها تقسیم میشه،
+    هر تکه با شماره خط اول خودش لکس میشه و نتیجه ها پشت سر هم قرار میگیرن.
+    جدول شناسه ها به ترتیب اولین رخداد دوباره شماره گذاری میشه، پس خروجی دقیقا
+    همان Lexer(code, engine).tokenize() است
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    bounds = split_lines(code, chunks or workers * 4)
+    jobs = []
+    line = 1
+    for start, end in bounds:
+        jobs.append((code[start:end], line, engine))
+        line += code.count('\n', start, end)
+
+    tokens = []
+    tables = []
+    for chunk_tokens, table in _run_parallel(_lex_chunk, jobs, workers):
+        tokens.extend(chunk_tokens)
+        tables.append(table)
+    return tokens, merge_symbol_tables(tables)
+
+
+def _lex_file_chunk(path, start, end, first_line):
+    # هر پردازه فایل را خودش map میکنه؛ فقط ستون ها (با مکان های کل فایل) برمیگردن
+    data = map_file(path)
+    lexer = Lexer(memoryview(data)[start:end])
+    columns = lexer._scan_columns(lexer.code, first_line, start)
+    return columns, lexer.symbol_table
+
+
+def _count_newlines(data, start, end, step=1 << 26):
+    # شمارش بلوک به بلوک تا کل فایل یکجا در حافظه کپی نشه
+    count = 0
+    for pos in range(start, end, step):
+        count += data[pos:min(pos + step, end)].count(b'\n')
+    return count
+
+
+def lex_file_parallel(path, workers=None, chunks=None):
+    """
+    مثل Lexer.from_file(path).tokenize_buffer() ولی با چند پردازه روی تکه های هم مرز
+    با خط. فایل در هیچ پردازه ای کامل خوانده نمیشه (هر کدام map میکنن) و فقط ستون های
+    فشرده ی TokenBuffer منتقل میشن. خروجی: (TokenBuffer روی نگاشت فایل, جدول شناسه ها)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    data = map_file(path)
+    bounds = split_lines(data, chunks or workers * 4)
+    jobs = []
+    line = 1
+    for start, end in bounds:
+        jobs.append((path, start, end, line))
+        line += _count_newlines(data, start, end)
+
+    buffer = TokenBuffer(data)
+    if len(data) >= 1 << 32:
+        buffer.starts, buffer.ends = array('Q'), array('Q')
+    tables = []
+    for columns, table in _run_parallel(_lex_file_chunk, jobs, workers):
+        for column, part in zip((buffer.types, buffer.starts, buffer.ends, buffer.lines), columns):
+            if column.typecode == part.typecode:
+                column.extend(part)
+            else:
+                column.fromlist(part.tolist())      # تکه های اول فایل بزرگتر از 4GB
+        tables.append(table)
+    return buffer, merge_symbol_tables(tables)
@@ -0,0 +1,91 @@
+"""
+زمان شروع cli.py با python -X importtime: هیچ ماژول رابط گرافیکی نباید import بشه
+و مجموع زمان import ها باید زیر بودجه بمونه (در غیر این صورت با کد 1 خارج میشه)
+
+    python benchmarks/bench_cli_startup.py [budget_ms]
+"""
+import compileall
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synth import generate_source
+
+FORBIDDEN = ('tkinter', '_tkinter', 'customtkinter')
+RUNS = 10
+
+
+def import_profile(args):
+    """(ماژول های import شده, مجموع زمان import های سطح اول به میلی ثانیه)"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          text=True, check=True)
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        modules.add(name.strip())
+        if not name.startswith(' '):
+            total_us += int(parts[1])
+    return modules, total_us / 1000
+
+
+def wall_time(args):
+    best = float('inf')
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    # بدون bytecode آماده زمان کامپایل هم اندازه گیری میشه
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'input.txt')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(generate_source(50, seed=1))
+        grammar = os.path.join(tmp, 'grammar.txt')
+        with open(grammar, 'w', encoding='utf-8') as f:
+            f.write("E : T E'\nE' : + T E' | ε\nT : F T'\nT' : * F T' | ε\nF : ( E ) | id\n")
+
+        commands = [
+            ('--help', ['cli.py', '--help']),
+            ('lex', ['cli.py', 'lex', source, '--summary']),
+            ('first-follow', ['cli.py', 'first-follow', grammar, '--ll1']),
+        ]
+        baseline = wall_time(['-c', 'pass'])
+        print(f"{'command':>13} {'imports':>10} {'wall':>10} {'over bare python':>17}")
+        failed = False
+        for name, args in commands:
+            profiles = [import_profile(args) for _ in range(3)]
+            modules = set().union(*(m for m, _ in profiles))
+            imports_ms = min(ms for _, ms in profiles)
+            wall_ms = wall_time(args)
+            print(f"{name:>13} {imports_ms:8.1f}ms {wall_ms:8.1f}ms {wall_ms - baseline:15.1f}ms")
+
+            gui = sorted(m for m in modules if m in FORBIDDEN)
+            if gui:
+                print(f"  FAIL: imports {', '.join(gui)}")
+                failed = True
+            if imports_ms > budget_ms:
+                print(f"  FAIL: imports take {imports_ms:.1f}ms, budget is {budget_ms:.0f}ms")
+                failed = True
+        print(f"bare python: {baseline:.1f}ms")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
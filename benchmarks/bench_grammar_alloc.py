@@ -0,0 +1,60 @@
+"""
+زمان و تخصیص حافظه ی تحلیل گرامر برای هر حل کننده و هر نمایش مجموعه.
+
+CPython شمارنده ی کل تخصیص ها را ندارد، پس به جای آن اوج tracemalloc،
+تعداد فراخوانی str.split (هر کدام یک لیست و چند رشته ی جدید) و تعداد کل
+فراخوانی های تابع (cProfile) گزارش میشه
+
+    python benchmarks/bench_grammar_alloc.py [n_nonterminals]
+"""
+import cProfile
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from synth import generate_grammar
+
+
+def run(grammar, solver, bitsets):
+    analyzer = GrammarAnalyzer(grammar, start_symbol='N0', solver=solver, bitsets=bitsets)
+    t0 = time.perf_counter()
+    analyzer.compute_follow_sets()
+    elapsed = time.perf_counter() - t0
+
+    analyzer = GrammarAnalyzer(grammar, start_symbol='N0', solver=solver, bitsets=bitsets)
+    tracemalloc.start()
+    analyzer.compute_follow_sets()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    analyzer = GrammarAnalyzer(grammar, start_symbol='N0', solver=solver, bitsets=bitsets)
+    profile = cProfile.Profile()
+    profile.runcall(analyzer.compute_follow_sets)
+    stats = pstats.Stats(profile)
+    splits = sum(row[1] for func, row in stats.stats.items() if func[2] == "<method 'split' of 'str' objects>")
+    return analyzer, elapsed, peak, splits, stats.total_calls
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    grammar = generate_grammar(n, rules_per_nt=4, n_terminals=n // 4, epsilon_rate=0.2, seed=n)
+    print(f"{n} nonterminals, {sum(len(r) for r in grammar.values())} rules")
+    reference = None
+    for solver in SOLVERS:
+        for bitsets in (False, True):
+            analyzer, elapsed, peak, splits, calls = run(grammar, solver, bitsets)
+            if reference is None:
+                reference = analyzer
+            elif (analyzer.first, analyzer.follow) != (reference.first, reference.follow):
+                raise AssertionError(f"{solver}/bitsets={bitsets} differs")
+            print(f"{solver:>9} bitsets={bitsets!s:<5}: {elapsed:8.3f} s   peak {peak / 1024:9.1f} KB"
+                  f"   str.split {splits:8,d}   calls {calls:10,d}")
+
+
+if __name__ == '__main__':
+    main()
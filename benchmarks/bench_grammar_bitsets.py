@@ -0,0 +1,40 @@
+"""
+مجموعه های پایتونی در برابر بیت ماسک (bitsets=True) روی گرامرهایی با صدها ترمینال
+
+    python benchmarks/bench_grammar_bitsets.py [n_terminals]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from synth import generate_grammar
+
+
+def analyze(grammar, **options):
+    analyzer = GrammarAnalyzer(grammar, start_symbol='N0', **options)
+    t0 = time.perf_counter()
+    analyzer.compute_follow_sets()
+    return analyzer, time.perf_counter() - t0
+
+
+def main():
+    n_terminals = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+
+    for n_nts in (100, 200, 400):
+        grammar = generate_grammar(n_nts, rules_per_nt=4, n_terminals=n_terminals,
+                                   epsilon_rate=0.25, seed=n_nts)
+        print(f"{n_nts} nonterminals, {n_terminals} terminals")
+        for solver in SOLVERS:
+            sets, t_sets = analyze(grammar, solver=solver)
+            bits, t_bits = analyze(grammar, solver=solver, bitsets=True)
+            if (sets.first, sets.follow) != (bits.first, bits.follow):
+                raise AssertionError(f"bitset result differs ({solver}, {n_nts})")
+            print(f"  {solver:>9}: sets {t_sets:8.3f} s   bitsets {t_bits:8.3f} s   "
+                  f"x{t_sets / t_bits:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
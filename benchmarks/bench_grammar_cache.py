@@ -0,0 +1,94 @@
+"""
+کش دیسکی تحلیل گرامر: زمان بارگذاری از کش در مقایسه با محاسبه ی دوباره،
+شمارنده های hit/miss، حذف LRU و دسترسی همزمان چند پردازه
+
+    python benchmarks/bench_grammar_cache.py [max_nonterminals]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from grammar_cache import GrammarCache
+from ll1_table import LL1Table
+from synth import generate_grammar
+
+
+def _grammar(n):
+    return generate_grammar(n, rules_per_nt=4, n_terminals=max(4, n // 4), seed=n)
+
+
+def _analyze_in_process(directory, n):
+    # هر پردازه کش خودش را باز میکنه؛ هماهنگی فقط از طریق فایل ها است
+    cache = GrammarCache(directory)
+    analyzer = cache.analyze(_grammar(n), 'N0', solver='worklist')
+    table = cache.ll1_table(analyzer)
+    return analyzer.first, analyzer.follow, table.table.tobytes()
+
+
+def check_concurrent(directory):
+    sizes = [50, 100, 150, 200] * 4
+    with ProcessPoolExecutor(4) as pool:
+        results = list(pool.map(_analyze_in_process, [directory] * len(sizes), sizes))
+    for n, (first, follow, table) in zip(sizes, results):
+        analyzer = GrammarAnalyzer(_grammar(n), 'N0')
+        analyzer.compute_follow_sets()
+        if (first, follow, table) != (analyzer.first, analyzer.follow, LL1Table(analyzer).table.tobytes()):
+            raise AssertionError(f"concurrent cache result differs for size {n}")
+
+
+def check_eviction(directory):
+    cache = GrammarCache(directory, max_bytes=1)
+    for n in (20, 30, 40):
+        cache.analyze(_grammar(n), 'N0')
+    if len(cache.cache.entries()) > 1 or cache.cache.evictions < 2:
+        raise AssertionError("LRU eviction did not bound the cache size")
+
+
+def main():
+    max_nts = int(sys.argv[1]) if len(sys.argv) > 1 else 3200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_concurrent(os.path.join(tmp, 'concurrent'))
+        check_eviction(os.path.join(tmp, 'evict'))
+
+        directory = os.path.join(tmp, 'cache')
+        print(f"{'nts':>6} {'solver':>9} {'compute':>9} {'load':>8} {'speedup':>8} "
+              f"{'ll1 build':>10} {'ll1 load':>9} {'entry':>9}")
+        n = 200
+        while n <= max_nts:
+            grammar = _grammar(n)
+            for solver in SOLVERS:
+                cache = GrammarCache(directory)
+                cache.cache.clear()
+
+                t0 = time.perf_counter()
+                computed = cache.analyze(grammar, 'N0', solver=solver)
+                t1 = time.perf_counter()
+                built = cache.ll1_table(computed)
+                t2 = time.perf_counter()
+
+                warm = GrammarCache(directory)
+                loaded = warm.analyze(grammar, 'N0', solver=solver)
+                t3 = time.perf_counter()
+                table = warm.ll1_table(loaded)
+                t4 = time.perf_counter()
+
+                if (loaded.first, loaded.follow, table.table) != (computed.first, computed.follow, built.table):
+                    raise AssertionError(f"cached analysis differs at size {n}")
+                # ll1_table همان ورودی خوانده شده در analyze را به کار میبره: یک خواندن، یک hit
+                cold, stats = cache.stats(), warm.stats()
+                if (cold['hits'], cold['misses'], stats['hits'], stats['misses']) != (0, 1, 1, 0):
+                    raise AssertionError(f"unexpected cache counters {cold} / {stats}")
+
+                print(f"{n:>6} {solver:>9} {t1 - t0:8.3f}s {t3 - t2:7.3f}s {(t1 - t0) / (t3 - t2):7.1f}x "
+                      f"{t2 - t1:9.3f}s {t4 - t3:8.3f}s {warm.cache.size / 1024:7.1f}KB")
+            n *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+زمان و اوج حافظه ی خواندن فایل های گرامر بزرگ: روش قبلی (خواندن کل فایل، str.replace
+برای هر ترمینال تک حرفی روی هر سمت راست و بعد split/join) در برابر grammar_loader
+(خواندن جریانی و سمت راست های از پیش توکن شده).
+زمان ساخت CompiledGrammar هم جدا گزارش میشه چون با ورودی tuple دیگر split نمیکنه
+
+    python benchmarks/bench_grammar_loader.py [n_nonterminals]     (پیش فرض 50,000)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_grammar import CompiledGrammar
+from grammar_loader import TERMINAL_SYMBOLS, GrammarError, load_grammar, parse_grammar
+from synth import generate_grammar
+
+_OPERATORS = ['(', ')', '+', '*', '-', '/', '^', '=']
+
+
+def legacy_load(path):
+    # همان پیاده سازی قبلی grammar_loader
+    def tokenize_production(production_str):
+        for symbol in TERMINAL_SYMBOLS:
+            production_str = production_str.replace(symbol, f' {symbol} ')
+        return ' '.join(production_str.split())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    grammar = {}
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line or ":" not in line or line.startswith(":"):
+            continue
+        left, right = line.split(":", 1)
+        left = left.strip()
+        if not right.strip():
+            continue
+        productions = [p.strip() for p in tokenize_production(right).split("|")]
+        grammar[left] = [p for p in productions if p]
+    return grammar
+
+
+def write_grammar(path, n):
+    # عملگرهای چسبیده به نمادها تا شکستن ترمینال های تک حرفی هم سنجیده بشه
+    grammar = generate_grammar(n, rules_per_nt=6, n_terminals=max(20, n // 4), epsilon_rate=0.1, seed=n)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, (nt, rules) in enumerate(grammar.items()):
+            op = _OPERATORS[i % len(_OPERATORS)]
+            f.write(f"{nt} : {' | '.join(rule.replace(' ', op, 1) for rule in rules)}\n")
+
+
+def check():
+    text = "E: T E'\nE': + T E' | ε\nF: (E) | id\nG:a*b^c|d=e/f-g\nH : a :b | | c\n\n"
+    expected = {nt: [' '.join(rule) for rule in rules] for nt, rules in parse_grammar(text).items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'grammar.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        if legacy_load(path) != expected:
+            raise AssertionError("grammar_loader differs from the previous loader")
+
+    errors = []
+    grammar = parse_grammar("A : x\nbad\n: y\nA B : z\nC : |\nD : d", errors)
+    if list(grammar) != ['A', 'D'] or [e.line for e in errors] != [2, 3, 4, 5]:
+        raise AssertionError("malformed lines are not reported")
+    try:
+        parse_grammar("A : x\nB")
+    except GrammarError as e:
+        if e.line != 2:
+            raise AssertionError("wrong line number in GrammarError")
+    else:
+        raise AssertionError("malformed line did not raise")
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    check()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'grammar.txt')
+        write_grammar(path, n)
+        size = os.path.getsize(path)
+
+        old, old_load = timed(legacy_load, path)
+        new, new_load = timed(load_grammar, path)
+        if {nt: [' '.join(rule) for rule in rules] for nt, rules in new.items()} != old:
+            raise AssertionError("large grammar: loaders differ")
+        old_compiled, old_compile = timed(CompiledGrammar, old)
+        new_compiled, new_compile = timed(CompiledGrammar, new)
+        if old_compiled.rhs != new_compiled.rhs or old_compiled.terminals != new_compiled.terminals:
+            raise AssertionError("large grammar: compiled grammars differ")
+
+        print(f"{n:,} nonterminals, {len(new_compiled):,} rules, {size / 1024 / 1024:.1f}MB")
+        print(f"{'':>10} {'load':>9} {'compile':>9} {'total':>9} {'load peak':>11}")
+        for name, load, compile_, func in (('previous', old_load, old_compile, legacy_load),
+                                          ('loader', new_load, new_compile, load_grammar)):
+            peak = peak_memory(func, path)
+            print(f"{name:>10} {load:8.3f}s {compile_:8.3f}s {load + compile_:8.3f}s {peak / 1024 / 1024:9.1f}MB")
+        print(f"speedup: load x{old_load / new_load:.2f}, total x{(old_load + old_compile) / (new_load + new_compile):.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+مقایسه ی حل کننده های FIRST/FOLLOW (fixpoint / worklist) روی گرامرهای مصنوعی بزرگ.
+خروجی همه ی حل کننده ها با پیاده سازی مرجع مقایسه میشه
+
+    python benchmarks/bench_grammar_solvers.py [max_nonterminals]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from synth import generate_grammar
+
+
+def analyze(grammar, **options):
+    analyzer = GrammarAnalyzer(grammar, start_symbol='N0', **options)
+    t0 = time.perf_counter()
+    analyzer.compute_follow_sets()
+    return analyzer, time.perf_counter() - t0
+
+
+def main():
+    max_nts = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+
+    # گرامرهای کوچک با نسبت های مختلف اپسیلون برای بررسی درستی
+    for seed in range(30):
+        grammar = generate_grammar(15, epsilon_rate=0.1 * (seed % 5), seed=seed)
+        reference, _ = analyze(grammar)
+        for solver in SOLVERS:
+            result, _ = analyze(grammar, solver=solver)
+            if (result.first, result.follow) != (reference.first, reference.follow):
+                raise AssertionError(f"solver {solver!r} differs on seed {seed}")
+
+    n = 50
+    while n <= max_nts:
+        grammar = generate_grammar(n, rules_per_nt=4, n_terminals=n // 2, seed=n)
+        n_rules = sum(len(rules) for rules in grammar.values())
+        row = [f"{n:>6} nts {n_rules:>7} rules"]
+        reference = None
+        for solver in SOLVERS:
+            result, elapsed = analyze(grammar, solver=solver)
+            if reference is None:
+                reference = result
+            elif (result.first, result.follow) != (reference.first, reference.follow):
+                raise AssertionError(f"solver {solver!r} differs at size {n}")
+            row.append(f"{solver}: {elapsed:8.3f} s")
+        print("   ".join(row))
+        n *= 2
+
+
+if __name__ == '__main__':
+    main()
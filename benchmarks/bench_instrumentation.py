@@ -0,0 +1,91 @@
+"""
+هزینه ی آمارگیری (instrumentation) در Lexer و GrammarAnalyzer: زمان بدون stats و با stats.
+اول بررسی میشه که با stats خروجی عوض نمیشه و شمارش توکن ها با خود توکن ها یکی است
+
+    python benchmarks/bench_instrumentation.py [n_lines] [n_nonterminals]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from instrumentation import AnalyzerStats, LexerStats
+from lexer import ENGINES, Lexer
+from synth import generate_grammar, generate_source
+
+
+def best_of(run, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def lex(code, engine, stats):
+    lexer = Lexer(code, engine=engine)
+    lexer.stats = LexerStats() if stats else None
+    return lexer.tokenize(), lexer.stats
+
+
+def analyze(grammar, solver, stats):
+    analyzer = GrammarAnalyzer(grammar, 'N0', solver=solver)
+    analyzer.stats = AnalyzerStats() if stats else None
+    analyzer.compute_follow_sets()
+    return analyzer
+
+
+def check(code, grammar):
+    for engine in ENGINES:
+        plain, _ = lex(code, engine, False)
+        result, stats = lex(code, engine, True)
+        if result != plain:
+            raise AssertionError(f"{engine}: stats change the tokens")
+        if stats.tokens != Counter(tok_type for _, _, tok_type in result[0]):
+            raise AssertionError(f"{engine}: token counts differ")
+    lexer = Lexer(code)
+    lexer.stats = LexerStats()
+    buffer, _ = lexer.tokenize_buffer()
+    if lexer.stats.token_count != len(buffer):
+        raise AssertionError("tokenize_buffer: token count differs")
+    # هر توکن دقیقا یک تطبیق الگو است (فاصله ها توکن نیستن)
+    if sum(count for group, (count, _) in lexer.stats.groups.items() if group != 'ws') != len(buffer):
+        raise AssertionError("tokenize_buffer: pattern group matches do not add up")
+
+    for solver in SOLVERS:
+        plain = analyze(grammar, solver, False)
+        measured = analyze(grammar, solver, True)
+        if (measured.first, measured.follow) != (plain.first, plain.follow):
+            raise AssertionError(f"{solver}: stats change FIRST/FOLLOW")
+        first = measured.stats.first
+        if sum(changed for _, changed in first.passes) != sum(first.growth.values()):
+            raise AssertionError(f"{solver}: FIRST growth does not add up")
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    code = generate_source(n_lines)
+    grammar = generate_grammar(n, rules_per_nt=4, n_terminals=n // 4, epsilon_rate=0.3, seed=n)
+    check(generate_source(300, seed=7), generate_grammar(100, rules_per_nt=4, n_terminals=25,
+                                                         epsilon_rate=0.2, seed=7))
+
+    print(f"lexer: {len(code):,} chars")
+    for engine in ENGINES:
+        off = best_of(lambda: lex(code, engine, False))
+        on = best_of(lambda: lex(code, engine, True))
+        print(f"{engine:>10}: off {off:7.3f} s   on {on:7.3f} s   x{on / off:5.2f}")
+
+    print(f"grammar: {n:,} nonterminals")
+    for solver in SOLVERS:
+        off = best_of(lambda: analyze(grammar, solver, False))
+        on = best_of(lambda: analyze(grammar, solver, True))
+        print(f"{solver:>10}: off {off:7.3f} s   on {on:7.3f} s   x{on / off:5.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+مقیاس پذیری lex_files با 1، 2، 4 و 8 پردازه روی تعداد زیادی فایل کوچک
+
+    python benchmarks/bench_lex_files.py [n_files]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_lexer import lex_files
+from synth import generate_source
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        total = 0
+        for i in range(n_files):
+            path = os.path.join(tmp, f"file_{i:05d}.txt")
+            code = generate_source(200, seed=i)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            paths.append(path)
+            total += len(code)
+
+        print(f"{n_files} files, {total:,} chars, {os.cpu_count()} cpus")
+        reference = None
+        for workers in (1, 2, 4, 8):
+            t0 = time.perf_counter()
+            result = lex_files(paths, workers=workers)
+            elapsed = time.perf_counter() - t0
+            if reference is None:
+                reference = result
+            elif result != reference:
+                raise AssertionError(f"workers={workers} produced a different result")
+            print(f"workers={workers}: {elapsed:7.2f} s  {total / elapsed:14,.0f} chars/s  "
+                  f"{n_files / elapsed:8.1f} files/s")
+
+
+if __name__ == '__main__':
+    main()
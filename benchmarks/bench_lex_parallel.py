@@ -0,0 +1,88 @@
+"""
+مقیاس پذیری lex_file_parallel روی یک فایل بزرگ با 1، 2، 4 و 8 پردازه.
+اول روی ورودی های کوچک (با تکه های خیلی کوچک) بررسی میشه که lex_parallel دقیقا
+خروجی tokenize و lex_file_parallel دقیقا خروجی tokenize_buffer را میده
+
+    python benchmarks/bench_lex_parallel.py [size_mb]     (پیش فرض 500)
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_lexer
+from batch_lexer import lex_file_parallel, lex_parallel
+from lexer import ENGINES, Lexer
+from synth import generate_source
+
+
+def write_file(path, size_mb):
+    block = generate_source(2000, seed=size_mb).encode('utf-8')
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def digest(buffer, symbol_table):
+    # خلاصه ی نتیجه تا لازم نباشه دو نتیجه ی چند گیگابایتی همزمان در حافظه بمونن
+    h = hashlib.sha256()
+    for column in (buffer.types, buffer.starts, buffer.ends, buffer.lines):
+        h.update(column)
+    h.update(repr(list(symbol_table.items())).encode('utf-8'))
+    return h.hexdigest()
+
+
+def check(tmp):
+    min_chunk = batch_lexer._MIN_CHUNK
+    batch_lexer._MIN_CHUNK = 1          # تکه های چند خطی تا مرزها واقعا امتحان بشن
+    try:
+        path = os.path.join(tmp, 'small.txt')
+        for seed in range(5):
+            code = generate_source(300, seed=seed) + 'x # c\n\n@ م é\n'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            expected_buffer, expected_table = Lexer.from_file(path).tokenize_buffer()
+            expected = digest(expected_buffer, expected_table)
+            for workers, chunks in ((1, 7), (2, 2), (2, 37), (3, 300)):
+                for engine in ENGINES:
+                    if lex_parallel(code, workers, engine, chunks) != Lexer(code, engine=engine).tokenize():
+                        raise AssertionError(f"lex_parallel differs ({engine}, {chunks} chunks)")
+                if digest(*lex_file_parallel(path, workers, chunks)) != expected:
+                    raise AssertionError(f"lex_file_parallel differs ({chunks} chunks)")
+    finally:
+        batch_lexer._MIN_CHUNK = min_chunk
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        check(tmp)
+
+        path = os.path.join(tmp, 'input.txt')
+        size = write_file(path, size_mb)
+        print(f"input: {size / 1024 / 1024:,.0f}MB, {os.cpu_count()} cpus")
+        reference = None
+        base = None
+        for workers in (1, 2, 4, 8):
+            t0 = time.perf_counter()
+            buffer, symbol_table = lex_file_parallel(path, workers=workers)
+            elapsed = time.perf_counter() - t0
+            result = digest(buffer, symbol_table)
+            count = len(buffer)
+            del buffer
+            if reference is None:
+                reference, base = result, elapsed
+            elif result != reference:
+                raise AssertionError(f"workers={workers} produced a different result")
+            print(f"workers={workers}: {elapsed:8.2f} s  {size / elapsed / 1024 / 1024:8.2f} MB/s  "
+                  f"x{base / elapsed:5.2f}  ({count:,} tokens)")
+
+
+if __name__ == '__main__':
+    main()
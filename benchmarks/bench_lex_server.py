@@ -0,0 +1,185 @@
+"""
+آزمون بار lex_server.py: چند کلاینت همزمان درخواست های کوچک لکس و FIRST/FOLLOW
+میفرستن و تاخیر p50/p99 و درخواست در ثانیه گزارش میشه؛ یک بار با دسته بندی
+درخواست ها و یک بار بدون آن (--batch-size 1)، در برابر اجرای یک پروسه ی تازه ی
+cli.py برای هر درخواست. اول خروجی سرور با Lexer و GrammarAnalyzer مستقیم مقایسه میشه
+
+    python benchmarks/bench_lex_server.py [requests] [concurrency] [workers]
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from FirstandFollow import GrammarAnalyzer
+from lex_client import AsyncLexClient, LexClient, ServerError
+from lexer import Lexer
+from synth import MIXES, generate_grammar, generate_mix, generate_source
+from token_buffer import TOKEN_LABELS
+
+GRAMMAR = "E : T E'\nE' : + T E' | ε\nT : F T'\nT' : * F T' | ε\nF : ( E ) | id\n"
+FRESH_RUNS = 10
+
+
+class Server:
+    """lex_server.py در یک پروسه ی جدا؛ آدرس از خط 'listening on ...' خوانده میشه"""
+
+    def __init__(self, tmp, *options):
+        if hasattr(socket, 'AF_UNIX'):
+            self.path = os.path.join(tmp, 'lex.sock')
+            address = ['--unix', self.path]
+        else:
+            self.path = None
+            address = ['--port', '0']
+        self.proc = subprocess.Popen([sys.executable, 'lex_server.py', *address, *options], cwd=ROOT,
+                                     stdout=subprocess.PIPE, text=True)
+        listening = self.proc.stdout.readline().split()
+        if not listening:
+            raise RuntimeError("lex_server.py did not start")
+        self.port = None if self.path else int(listening[-1].rsplit(':', 1)[1])
+
+    def connect(self):
+        if self.path:
+            return LexClient(self.path)
+        return LexClient(port=self.port)
+
+    async def connect_async(self):
+        if self.path:
+            return await AsyncLexClient.connect(self.path)
+        return await AsyncLexClient.connect(port=self.port)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            with self.connect() as client:
+                client.shutdown()
+        finally:
+            self.proc.wait(timeout=30)
+
+
+def expected_lex(code, engine='regex'):
+    tokens, table = Lexer(code, engine=engine).tokenize()
+    return {'tokens': [[tok_type, display[len(TOKEN_LABELS[tok_type]) + 1:-1], line]
+                       for display, line, tok_type in tokens],
+            'symbol_table': table}
+
+
+def check(server):
+    grammar = generate_grammar(60, rules_per_nt=4, n_terminals=20, epsilon_rate=0.2, seed=3)
+    analyzer = GrammarAnalyzer(grammar, 'N0')
+    analyzer.compute_follow_sets()
+    with server.connect() as client:
+        for mix in MIXES:
+            code = generate_mix(200, mix, seed=5)
+            for engine in ('char', 'regex'):
+                if client.lex(code, engine) != expected_lex(code, engine):
+                    raise AssertionError(f"{mix}/{engine}: server tokens differ")
+        big = generate_source(3000, seed=9)         # بزرگتر از حد دسته بندی
+        if client.lex(big) != expected_lex(big):
+            raise AssertionError("large request: server tokens differ")
+
+        for _ in range(2):                          # بار دوم از کش سرور
+            result = client.first_follow(grammar, 'N0', ll1=True)
+            if (result['first'] != {nt: sorted(analyzer.first[nt]) for nt in grammar}
+                    or result['follow'] != {nt: sorted(analyzer.follow[nt]) for nt in grammar}):
+                raise AssertionError("server FIRST/FOLLOW differ")
+        if client.stats().get('grammar_hits') != 1:
+            raise AssertionError("analyzed grammar was not cached")
+        try:
+            client.first_follow("A : x\nB")
+        except ServerError as e:
+            if not str(e).startswith("line 2:"):
+                raise AssertionError(f"unexpected error message: {e}")
+        else:
+            raise AssertionError("malformed grammar did not fail")
+
+
+def workload(n_requests):
+    # 90% لکس کدهای کوتاه (مثل یک فایل یا ناحیه ی باز در ویرایشگر)، 10% تحلیل چند گرامر تکراری
+    grammars = [GRAMMAR] + [generate_grammar(40, rules_per_nt=3, n_terminals=15, seed=seed)
+                            for seed in range(4)]
+    requests = []
+    for i in range(n_requests):
+        if i % 10 == 9:
+            requests.append(('first_follow', grammars[i // 10 % len(grammars)]))
+        else:
+            requests.append(('lex', generate_source(20 + i % 40, seed=i)))
+    return requests
+
+
+async def load(server, requests, concurrency):
+    """هر کلاینت اتصال خودش را داره و درخواست بعدی را بعد از گرفتن پاسخ قبلی میفرسته"""
+    latencies = []
+    queue = iter(requests)
+
+    async def client_loop():
+        client = await server.connect_async()
+        try:
+            for op, payload in queue:
+                t0 = time.perf_counter()
+                if op == 'lex':
+                    await client.lex(payload)
+                else:
+                    await client.first_follow(payload)
+                latencies.append(time.perf_counter() - t0)
+        finally:
+            await client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - t0
+
+
+def fresh_process(tmp):
+    # همان کار بدون سرور: یک پروسه ی تازه ی cli.py برای هر درخواست
+    source = os.path.join(tmp, 'input.txt')
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write(generate_source(40, seed=1))
+    latencies = []
+    for _ in range(FRESH_RUNS):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, 'cli.py', 'lex', source], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, check=True)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, sum(latencies)
+
+
+def report(name, latencies, seconds):
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    print(f"{name:>14} {percentiles[49] * 1000:8.2f}ms {percentiles[98] * 1000:8.2f}ms "
+          f"{len(latencies) / seconds:10.0f}")
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    workers = sys.argv[3] if len(sys.argv) > 3 else str(os.cpu_count() or 1)
+    requests = workload(n_requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{n_requests:,} requests, {concurrency} clients, {workers} workers")
+        print(f"{'':>14} {'p50':>10} {'p99':>10} {'req/s':>10}")
+        for name, options in (('batched', []), ('unbatched', ['--batch-size', '1'])):
+            with Server(tmp, '--workers', workers, *options) as server:
+                if name == 'batched':
+                    check(server)
+                asyncio.run(load(server, requests[:concurrency], concurrency))     # گرم کردن pool
+                latencies, seconds = asyncio.run(load(server, requests, concurrency))
+                report(name, latencies, seconds)
+                if name == 'batched':
+                    # یک کلاینت تنها (قابل مقایسه با پروسه ی تازه): دسته ها تا batch_delay صبر میکنن
+                    report('one client', *asyncio.run(load(server, requests[:500], 1)))
+        report('fresh process', *fresh_process(tmp))
+
+
+if __name__ == '__main__':
+    main()
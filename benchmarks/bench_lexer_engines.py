@@ -0,0 +1,47 @@
+"""
+سرعت موتورهای لکسر (char / regex / numpy) بر حسب کاراکتر بر ثانیه.
+در آخر numpy و char روی ترکیب های ASCII (synth.MIXES) مقایسه میشن.
+یکسان بودن خروجی موتورها در tests/test_lexer_engines.py بررسی میشه
+
+    python benchmarks/bench_lexer_engines.py [n_lines]
+"""
+import os
+import sys
+import time
+from importlib.util import find_spec
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import ENGINES, Lexer
+from synth import generate_mix, generate_source
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = generate_source(n_lines)
+    print(f"input: {len(code):,} chars, {n_lines:,} lines")
+    for engine in ENGINES:
+        lexer = Lexer(code, engine=engine)
+        t0 = time.perf_counter()
+        tokens, _ = lexer.tokenize()
+        elapsed = time.perf_counter() - t0
+        print(f"{engine:>6}: {elapsed:8.3f} s  {len(code) / elapsed:14,.0f} chars/s  ({len(tokens):,} tokens)")
+
+    if find_spec('numpy') is None:
+        print("numpy is not installed: the numpy engine falls back to char")
+        return
+    print("\nnumpy vs char (ASCII mixes):")
+    for mix in ('balanced', 'identifiers', 'numbers', 'comments'):
+        code = generate_mix(n_lines, mix, seed=1)
+        times = {}
+        for engine in ('char', 'numpy'):
+            lexer = Lexer(code, engine=engine)
+            t0 = time.perf_counter()
+            lexer.tokenize()
+            times[engine] = time.perf_counter() - t0
+        print(f"{mix:>12}: char {times['char']:7.3f} s  numpy {times['numpy']:7.3f} s  "
+              f"x{times['char'] / times['numpy']:5.2f}")
+
+
+if __name__ == '__main__':
+    main()
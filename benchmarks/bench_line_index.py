@@ -0,0 +1,118 @@
+"""
+شماره خط از روی LineIndex (شروع خط ها) در برابر شمردن '\\n' برای هر کاراکتر:
+اول درستی (خط و ستون هر توکن، به روزرسانی بعد از relex و پرش به خط) بررسی میشه،
+بعد سرعت لکسر با و بدون شمارش کاراکتر به کاراکتر و هزینه ی ساخت فهرست
+
+    python benchmarks/bench_line_index.py [n_lines]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from line_index import LineIndex
+from synth import generate_source
+from token_view import first_row_at_line
+
+
+class PerCharLexer(Lexer):
+    """مرجع: _advance مثل قبل هر کاراکتر را برای '\\n' بررسی میکنه (شمارنده ی جدا)"""
+
+    newlines = 0
+
+    def _advance(self, n=1):
+        for _ in range(n):
+            if self.pos >= self.len:
+                return
+            ch = self.code[self.pos]
+            self.pos += 1
+            if ch == '\n':
+                self.newlines += 1
+
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def check_positions(code):
+    buffer, _ = Lexer(code).tokenize_buffer()
+    for i in range(len(buffer)):
+        start = buffer.starts[i]
+        expected = (code.count('\n', 0, start) + 1, start - code.rfind('\n', 0, start))
+        if buffer.position(i) != expected or buffer.lines[i] != expected[0]:
+            raise AssertionError(f"token {i}: {buffer.position(i)} != {expected}")
+    for engine in ('char', 'regex'):
+        if [line for _, line, _ in Lexer(code, engine=engine).tokenize()[0]] != list(buffer.lines):
+            raise AssertionError(f"{engine} engine line numbers differ")
+
+
+def check_relex(code, seed):
+    rng = random.Random(seed)
+    lexer = Lexer(code)
+    buffer, _ = lexer.tokenize_buffer()
+    for _ in range(200):
+        offset = rng.randrange(len(buffer.source) + 1)
+        deleted = rng.randrange(min(20, len(buffer.source) - offset) + 1)
+        lexer.relex(buffer, offset, deleted, rng.choice(['', 'x', '\n', 'a\nb = 1\n', '\n\n']))
+        if buffer.line_index.starts != LineIndex(buffer.source).starts:
+            raise AssertionError("line index not updated by relex")
+
+
+def check_goto(code):
+    buffer, _ = Lexer(code).tokenize_buffer()
+    lines = list(buffer.lines)
+    rows = buffer.indices('id')
+    for line in range(0, lines[-1] + 3):
+        expected = next((i for i, tok_line in enumerate(lines) if tok_line >= line), len(lines))
+        if first_row_at_line(buffer, line) != expected:
+            raise AssertionError(f"go to line {line}")
+        expected = next((k for k, i in enumerate(rows) if lines[i] >= line), len(rows))
+        if first_row_at_line(buffer, line, rows) != expected:
+            raise AssertionError(f"go to line {line} (filtered)")
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for code in ['', '\n', 'a', '\n\na\n', 'x\n  y = 1\n\n@\n', '\n@\n#c\n']:
+        check_positions(code)
+    for seed in range(20):
+        code = generate_source(60, seed=seed)
+        check_positions(code)
+        if PerCharLexer(code).tokenize() != Lexer(code).tokenize():
+            raise AssertionError("per-character reference differs")
+    check_relex(generate_source(200, seed=3), 3)
+    check_goto(generate_source(200, seed=4))
+
+    code = generate_source(n_lines)
+    n_tokens = len(Lexer(code).tokenize_buffer()[0])
+    print(f"input: {len(code):,} chars, {n_lines:,} lines, {n_tokens:,} tokens")
+
+    rows = (
+        ('char, per-char newline check', lambda: PerCharLexer(code, engine='char').tokenize()),
+        ('char, line index', lambda: Lexer(code, engine='char').tokenize()),
+        ('regex, line index', lambda: Lexer(code, engine='regex').tokenize()),
+        ('tokenize_buffer', lambda: Lexer(code).tokenize_buffer()),
+    )
+    for name, func in rows:
+        elapsed = best_of(func)
+        print(f"{name:>30}: {elapsed:7.3f} s  {len(code) / elapsed:12,.0f} chars/s")
+
+    elapsed = best_of(lambda: LineIndex(code))
+    print(f"{'build LineIndex':>30}: {elapsed * 1000:7.2f} ms")
+    buffer = Lexer(code).tokenize_buffer()[0]
+    buffer.position(0)
+    elapsed = best_of(lambda: [buffer.position(i) for i in range(len(buffer))])
+    print(f"{'(line, column) of every token':>30}: {elapsed * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+سرعت (توکن بر ثانیه) و حافظه ی اوج پارسر LL(1) که توکن ها را مستقیم از لکسر میگیره.
+در حالت فقط-بررسی (validate) ورودی از فایل جریانی خوانده میشه و اوج حافظه
+باید با بزرگ شدن فایل تقریبا ثابت بمونه
+
+    python benchmarks/bench_ll1_parser.py [max_statements]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import GrammarAnalyzer
+from lexer import Lexer
+from ll1_parser import LL1Parser, ParseError
+from ll1_table import LL1Table
+from synth import STATEMENT_GRAMMAR, generate_program
+
+
+def measure(func):
+    # زمان و حافظه در دو اجرای جدا اندازه گیری میشن چون tracemalloc خودش کند است
+    t0 = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def check_parser(parser):
+    # درخت باید دقیقا همه ی توکن های غیر کامنت را به ترتیب در برگ هایش داشته باشه
+    source = generate_program(400, seed=3)
+    tokens = Lexer(source, engine='regex').tokenize()[0]
+    root = parser.parse(Lexer(engine='regex').iter_tokens(source))
+    leaves = [(node.text, node.line) for _, node in root.walk() if node.text is not None]
+    expected = [(display[display.index('(') + 1:-1], line)
+                for display, line, tok_type in tokens if tok_type != 'comment']
+    if leaves != expected or parser.parse(tokens, build_tree=False) != len(expected):
+        raise AssertionError("parse tree leaves differ from the token stream")
+
+    for broken in (source.replace(';', '', 1), source + '}\n', source + 'x = 1 @ 2;\n'):
+        try:
+            parser.parse(Lexer(broken, engine='regex').tokenize()[0], build_tree=False)
+        except ParseError:
+            continue
+        raise AssertionError("invalid program was accepted")
+
+
+def main():
+    max_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 160000
+
+    table = LL1Table(GrammarAnalyzer(STATEMENT_GRAMMAR, start_symbol='P', solver='worklist'))
+    if not table.is_ll1:
+        raise AssertionError('\n'.join(table.describe_conflicts()))
+    parser = LL1Parser(table)
+    check_parser(parser)
+
+    block = generate_program(2000, seed=11)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'program.txt')
+        print(f"{'statements':>10} {'mode':>9} {'tokens':>10} {'time':>8} {'tokens/s':>11} {'peak':>9}")
+        n = 10000
+        while n <= max_statements:
+            with open(path, 'w', encoding='utf-8') as f:
+                for _ in range(n // 2000):
+                    f.write(block)
+
+            def validate():
+                with open(path, encoding='utf-8') as f:
+                    return parser.parse(Lexer(engine='regex').iter_tokens(f), build_tree=False)
+
+            def tree():
+                with open(path, encoding='utf-8') as f:
+                    root = parser.parse(Lexer(engine='regex').iter_tokens(f))
+                return sum(1 for _, node in root.walk() if node.text is not None)
+
+            for mode, func in (('validate', validate), ('tree', tree)):
+                count, elapsed, peak = measure(func)
+                print(f"{n:>10} {mode:>9} {count:>10,} {elapsed:7.2f}s {count / elapsed:>11,.0f} "
+                      f"{peak / 1024 / 1024:7.1f}MB")
+            n *= 4
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+زمان ساخت و حافظه ی جدول LL(1) روی گرامرهای مصنوعی با هزاران قانون
+
+    python benchmarks/bench_ll1_table.py [max_nonterminals]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import GrammarAnalyzer
+from ll1_table import LL1Table
+from synth import generate_grammar
+
+
+def main():
+    max_nts = int(sys.argv[1]) if len(sys.argv) > 1 else 3200
+
+    n = 200
+    while n <= max_nts:
+        grammar = generate_grammar(n, rules_per_nt=4, n_terminals=n // 4, seed=n)
+        analyzer = GrammarAnalyzer(grammar, start_symbol='N0', solver='worklist', bitsets=True)
+        analyzer.compute_follow_sets()
+
+        t0 = time.perf_counter()
+        table = LL1Table(analyzer)
+        elapsed = time.perf_counter() - t0
+
+        reference = LL1Table(GrammarAnalyzer(grammar, start_symbol='N0'))
+        if table.table != reference.table or table.conflicts != reference.conflicts:
+            raise AssertionError(f"bitset and set tables differ at size {n}")
+
+        print(f"{n:>6} nts {len(table.grammar):>7} rules {table.width:>5} terminals: "
+              f"build {elapsed:7.3f} s  table {table.nbytes / 1024:9.1f} KB  "
+              f"{len(table.conflicts):>8,} conflicts")
+        n *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+ساخت اتوماتای LR(0) و جدول های فشرده ی SLR(1)/LALR(1):
+زمان ساخت، اندازه ی جدول (فشرده و کامل) و سرعت پارس در مقایسه با پارسر LL(1)
+
+    python benchmarks/bench_lr_table.py [max_nonterminals]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import GrammarAnalyzer
+from lexer import Lexer
+from ll1_parser import LL1Parser
+from ll1_table import LL1Table
+from lr_parser import LRParser
+from lr_table import METHODS, LRTable
+from synth import STATEMENT_GRAMMAR, generate_grammar, generate_program
+
+
+def check_tables():
+    # گرامر کتاب اژدها (4.49): LALR(1) هست ولی SLR(1) نیست
+    grammar = {'S': ['L = R', 'R'], 'L': ['* R', 'id'], 'R': ['L']}
+    slr = LRTable(GrammarAnalyzer(grammar, start_symbol='S'), 'slr')
+    lalr = LRTable(GrammarAnalyzer(grammar, start_symbol='S'), 'lalr')
+    if [c[0] for c in slr.conflicts] != ['shift/reduce'] or lalr.conflicts:
+        raise AssertionError("unexpected conflicts for the L = R grammar")
+    LRParser(lalr).parse(Lexer('* x = * * y').tokenize()[0], build_tree=False)
+
+    # درخت LR باید با درخت LL همان گرامر یکی باشه
+    source = generate_program(400, seed=3)
+    tokens = Lexer(source, engine='regex').tokenize()[0]
+    analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, start_symbol='P')
+    expected = [(d, n.symbol, n.text) for d, n in LL1Parser(LL1Table(analyzer)).parse(tokens).walk()]
+    for method in METHODS:
+        root = LRParser(LRTable(analyzer, method)).parse(tokens)
+        if [(d, n.symbol, n.text) for d, n in root.walk()] != expected:
+            raise AssertionError(f"{method} parse tree differs from the LL(1) tree")
+
+
+def bench_construction(max_nts):
+    print(f"{'nts':>6} {'rules':>7} {'states':>7} {'method':>6} {'build':>8} "
+          f"{'packed':>10} {'dense':>10} {'conflicts':>10}")
+    n = 50
+    while n <= max_nts:
+        grammar = generate_grammar(n, rules_per_nt=4, n_terminals=n // 4, seed=n)
+        analyzer = GrammarAnalyzer(grammar, start_symbol='N0', solver='worklist', bitsets=True)
+        analyzer.compute_follow_sets()
+        for method in METHODS:
+            t0 = time.perf_counter()
+            table = LRTable(analyzer, method)
+            elapsed = time.perf_counter() - t0
+            print(f"{n:>6} {len(table.grammar):>7} {len(table.automaton):>7} {method:>6} "
+                  f"{elapsed:7.2f}s {table.nbytes / 1024:8.1f}KB {table.dense_nbytes / 1024:8.1f}KB "
+                  f"{len(table.conflicts):>10,}")
+        n *= 2
+
+
+def bench_parse():
+    tokens = Lexer(generate_program(40000, seed=11), engine='regex').tokenize()[0]
+    analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, start_symbol='P')
+    parsers = [('ll1', LL1Parser(LL1Table(analyzer)))]
+    parsers += [(method, LRParser(LRTable(analyzer, method))) for method in METHODS]
+
+    print(f"\n{'parser':>6} {'mode':>9} {'tokens':>9} {'time':>8} {'tokens/s':>11}")
+    for name, parser in parsers:
+        for build_tree in (False, True):
+            t0 = time.perf_counter()
+            parser.parse(tokens, build_tree=build_tree)
+            elapsed = time.perf_counter() - t0
+            mode = 'tree' if build_tree else 'validate'
+            print(f"{name:>6} {mode:>9} {len(tokens):>9,} {elapsed:7.2f}s {len(tokens) / elapsed:>11,.0f}")
+
+
+def main():
+    max_nts = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    check_tables()
+    bench_construction(max_nts)
+    bench_parse()
+
+
+if __name__ == '__main__':
+    main()
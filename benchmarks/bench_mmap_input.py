@@ -0,0 +1,104 @@
+"""
+ورودی نگاشت شده (Lexer.from_file) در برابر خواندن کل فایل در یک str:
+حافظه ی اوج پردازه (RSS) و سرعت پیمایش. هر حالت در پردازه ی جدا اجرا میشه
+تا اوج حافظه ی یک حالت روی دیگری اثر نگذاره.
+در حالت mmap اوج RSS باید نزدیک حجم فایل بمونه (صفحه های خود فایل)
+
+    python benchmarks/bench_mmap_input.py [size_mb]     (پیش فرض 1024)
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from synth import generate_source
+
+MODES = ('read', 'mmap')
+
+
+def write_file(path, size_mb):
+    block = generate_source(2000, seed=size_mb).encode('utf-8')
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def peak_rss():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024     # لینوکس: کیلوبایت
+
+
+def child(mode, path):
+    base = peak_rss()
+    t0 = time.perf_counter()
+    if mode == 'read':
+        with open(path, encoding='utf-8') as f:
+            lexer = Lexer(f.read(), engine='regex')
+    else:
+        lexer = Lexer.from_file(path)
+    count = sum(1 for _ in lexer.iter_spans())
+    elapsed = time.perf_counter() - t0
+    json.dump({'tokens': count, 'seconds': elapsed, 'rss': peak_rss() - base,
+               'symbols': len(lexer.symbol_table)}, sys.stdout)
+
+
+def check_same_output(path):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    expected = Lexer(text, engine='regex').tokenize()
+    for data in (text.encode('utf-8'), memoryview(text.encode('utf-8'))):
+        if Lexer(data).tokenize() != expected:
+            raise AssertionError(f"bytes input differs ({type(data).__name__})")
+    lexer = Lexer.from_file(path)
+    buffer, symbols = lexer.tokenize_buffer()
+    if (list(buffer), symbols) != expected or buffer.symbol_table() != symbols:
+        raise AssertionError("mapped TokenBuffer differs")
+    spans = list(Lexer.from_file(path).iter_spans())
+    if [text.encode('utf-8')[start:end].decode('utf-8') for _, start, end, _ in spans] \
+            != [buffer.text(i) for i in range(len(buffer))]:
+        raise AssertionError("iter_spans offsets differ")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+        return
+    if find_spec('resource') is None:
+        sys.exit("RSS measurement needs the resource module (not available on Windows)")
+
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.txt')
+
+        # متن با کاراکترهای چند بایتی هم باید همان خروجی ورودی str را بده
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_source(500, seed=7) + "\nنام = 1e+ ; é € 𝄞 x # توضیح\n")
+        check_same_output(path)
+
+        size = write_file(path, size_mb)
+        print(f"input: {size / 1024 / 1024:,.0f}MB")
+        print(f"{'mode':>6} {'time':>9} {'tokens/s':>12} {'peak RSS':>11} {'RSS/file':>9}")
+        counts = set()
+        for mode in MODES:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, path],
+                                 check=True, capture_output=True, text=True).stdout
+            result = json.loads(out)
+            counts.add((result['tokens'], result['symbols']))
+            print(f"{mode:>6} {result['seconds']:8.1f}s {result['tokens'] / result['seconds']:12,.0f} "
+                  f"{result['rss'] / 1024 / 1024:9.0f}MB {result['rss'] / size:8.2f}x")
+        if len(counts) != 1:
+            raise AssertionError(f"modes disagree on token count: {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+تاخیر یک ویرایش تک کاراکتری با relex در برابر tokenize_buffer کامل.
+بعد از هر ویرایش خروجی با پیمایش کامل متن جدید مقایسه میشه
+
+    python benchmarks/bench_relex.py [n_lines]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from synth import generate_source
+
+EDITS = ['a', '1', ' ', '\n', '.', 'e', '/', '#', '=', '']
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(0)
+    code = generate_source(n_lines)
+
+    lexer = Lexer(code)
+    t0 = time.perf_counter()
+    buffer, _ = lexer.tokenize_buffer()
+    full = time.perf_counter() - t0
+    print(f"input: {len(code):,} chars, {len(buffer):,} tokens")
+    print(f"full re-lex:      {full * 1000:9.2f} ms")
+
+    timings = []
+    for _ in range(50):
+        source = buffer.source
+        offset = rng.randrange(len(source))
+        inserted = rng.choice(EDITS)
+        deleted = 0 if inserted else 1
+        t0 = time.perf_counter()
+        lexer.relex(buffer, offset, deleted, inserted)
+        timings.append(time.perf_counter() - t0)
+
+        reference, symbols = Lexer(buffer.source).tokenize_buffer()
+        if list(buffer) != list(reference) or lexer.symbol_table != symbols:
+            raise AssertionError("relex output differs from a full re-lex")
+
+    timings.sort()
+    print(f"keystroke (p50):  {timings[len(timings) // 2] * 1000:9.2f} ms")
+    print(f"keystroke (max):  {timings[-1] * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+حافظه ی اوج (tracemalloc) در حالت جریانی در مقایسه با tokenize معمولی.
+در حالت جریانی اوج حافظه باید با بزرگ شدن فایل تقریبا ثابت بمونه
+
+    python benchmarks/bench_streaming_memory.py [max_mb]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import ENGINES, Lexer
+from synth import generate_source
+
+
+def write_file(path, size_mb):
+    block = generate_source(2000, seed=size_mb)
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+
+
+def measure(func):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def check_same_output(path, chunk_size):
+    with open(path, encoding='utf-8') as f:
+        batch = Lexer(f.read(), engine='regex').tokenize()
+    for engine in ENGINES:
+        lexer = Lexer(engine=engine)
+        with open(path, encoding='utf-8') as f:
+            streamed = list(lexer.iter_tokens(f, chunk_size=chunk_size))
+        if (streamed, lexer.symbol_table) != batch:
+            raise AssertionError(f"streaming output differs ({engine}, chunk_size={chunk_size})")
+
+
+def main():
+    max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    sizes = [1]
+    while sizes[-1] * 4 <= max_mb:
+        sizes.append(sizes[-1] * 4)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.txt')
+
+        # مرز بلوک ها وسط کامنت/عدد/شناسه هم باید همان خروجی tokenize را بده
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_source(300, seed=7))
+        for chunk_size in (1, 7, 64, 4096):
+            check_same_output(path, chunk_size)
+
+        print(f"{'size':>8} {'mode':>8} {'time':>9} {'peak memory':>14}")
+        for size_mb in sizes:
+            write_file(path, size_mb)
+
+            def streaming():
+                with open(path, encoding='utf-8') as f:
+                    return sum(1 for _ in Lexer(engine='regex').iter_tokens(f))
+
+            def batch():
+                with open(path, encoding='utf-8') as f:
+                    return len(Lexer(f.read(), engine='regex').tokenize()[0])
+
+            for mode, func in (('stream', streaming), ('batch', batch)):
+                _, elapsed, peak = measure(func)
+                print(f"{size_mb:>6}MB {mode:>8} {elapsed:8.2f}s {peak / 1024 / 1024:12.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
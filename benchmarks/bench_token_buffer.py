@@ -0,0 +1,56 @@
+"""
+لیست تاپل ها (tokenize) در برابر TokenBuffer (tokenize_buffer):
+زمان ساخت، حافظه به ازای هر توکن و هزینه ی ساخت رشته ی نمایشی در صورت نیاز
+
+    python benchmarks/bench_token_buffer.py [n_lines]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from synth import generate_source
+
+
+def measure(func):
+    tracemalloc.start()
+    result = func()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - t0
+    return result, elapsed, current
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = generate_source(n_lines)
+
+    tokens, symbols = Lexer(code, engine='regex').tokenize()
+    buffer, buffer_symbols = Lexer(code).tokenize_buffer()
+    if list(buffer) != tokens or buffer[:] != tokens or symbols != buffer_symbols:
+        raise AssertionError("TokenBuffer does not match tokenize()")
+    if buffer[-1] != tokens[-1] or buffer[len(tokens) // 2] != tokens[len(tokens) // 2]:
+        raise AssertionError("TokenBuffer indexing does not match tokenize()")
+
+    print(f"input: {len(code):,} chars, {len(tokens):,} tokens")
+    rows = (
+        ('tuple list', lambda: Lexer(code, engine='regex').tokenize()[0]),
+        ('TokenBuffer', lambda: Lexer(code).tokenize_buffer()[0]),
+    )
+    for name, func in rows:
+        result, elapsed, memory = measure(func)
+        print(f"{name:>12}: build {elapsed:7.3f} s   {memory / len(result):7.1f} bytes/token")
+
+    t0 = time.perf_counter()
+    for _ in buffer:
+        pass
+    print(f"{'render all':>12}: {time.perf_counter() - t0:7.3f} s (TokenBuffer, on demand)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+کش توکن ها روی یک درخت فایل: اجرای سرد، اجرای گرم و اجرای بعد از تغییر
+بخشی از فایل ها - در مقایسه با lex_files بدون کش
+
+    python benchmarks/bench_token_cache.py [n_files]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_lexer import lex_files
+from lexer import Lexer
+from synth import generate_source
+from token_cache import TokenCache
+
+
+def check_eviction(directory):
+    cache = TokenCache(directory, max_bytes=64 * 1024)
+    for seed in range(20):
+        cache.tokenize(Lexer(generate_source(300, seed=seed)))
+    if cache.cache.size > 64 * 1024 or not cache.cache.evictions:
+        raise AssertionError("LRU eviction did not bound the cache size")
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_eviction(os.path.join(tmp, 'evict'))
+
+        paths = []
+        for i in range(n_files):
+            path = os.path.join(tmp, f"file_{i:05d}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_source(200, seed=i))
+            paths.append(path)
+
+        t0 = time.perf_counter()
+        reference = lex_files(paths, workers=1)
+        baseline = time.perf_counter() - t0
+        print(f"{n_files} files, no cache: {baseline:7.2f} s")
+
+        for workers in (1, 2):
+            cache = TokenCache(os.path.join(tmp, f'cache{workers}'))
+            runs = [('cold', None), ('warm', None), ('10% edited', n_files // 10)]
+            for name, edited in runs:
+                if edited:
+                    for path in paths[:edited]:
+                        with open(path, 'a', encoding='utf-8') as f:
+                            f.write(f"edited_{workers} = 1;\n")
+                    reference = lex_files(paths, workers=1)
+
+                before = cache.stats()
+                t0 = time.perf_counter()
+                result = lex_files(paths, workers=workers, cache=cache)
+                elapsed = time.perf_counter() - t0
+                if result != reference:
+                    raise AssertionError(f"cached result differs ({name}, workers={workers})")
+
+                stats = cache.stats()
+                hits = stats['hits'] - before['hits']
+                saved = stats['bytes_saved'] - before['bytes_saved']
+                print(f"workers={workers} {name:>11}: {elapsed:7.2f} s  x{baseline / elapsed:6.1f}  "
+                      f"hit rate {hits / n_files:6.1%}  {saved / 1024:9.1f} KB not re-lexed  "
+                      f"cache {cache.cache.size / 1024:8.1f} KB")
+
+        # بدون ساخت لیست تاپل ها: TokenBuffer مستقیم روی فایل map شده
+        sources = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                sources.append(f.read())
+        t0 = time.perf_counter()
+        for code in sources:
+            Lexer(code).tokenize_buffer()
+        lexed = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for code in sources:
+            cache.tokenize(Lexer(code))
+        loaded = time.perf_counter() - t0
+        print(f"TokenBuffer only: tokenize_buffer {lexed:7.2f} s  cache {loaded:7.2f} s  x{lexed / loaded:6.1f}")
+
+
+if __name__ == '__main__':
+    main()
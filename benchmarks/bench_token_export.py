@@ -0,0 +1,95 @@
+"""
+سرعت خروجی گرفتن از توکن ها در هر قالب (text, csv, jsonl, binary) و خواندن قالب binary.
+اول درستی بررسی میشه: خروجی لیست توکن ها، TokenBuffer و حالت جریانی از لکسر
+باید یکی باشه و load_binary همان توکن ها و جدول شناسه ها را برگردونه
+
+    python benchmarks/bench_token_export.py [n_tokens]     (پیش فرض 10,000,000)
+"""
+import os
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from synth import generate_source
+from token_buffer import TokenBuffer
+from token_export import FORMATS, export_file, export_tokens, load_binary
+
+
+def tiled_buffer(n_tokens):
+    """TokenBuffer با حدود n_tokens توکن از تکرار یک متن نمونه (بدون لکس دوباره)"""
+    code = generate_source(20000, seed=1).replace('م', 'm')    # ASCII: مکان کاراکتر = بایت
+    block, symbol_table = Lexer(code).tokenize_buffer()
+    copies = max(1, -(-n_tokens // len(block)))
+    n_lines = code.count('\n')
+    buffer = TokenBuffer(code * copies)
+    for k in range(copies):
+        shift, line_shift = k * len(code), k * n_lines
+        buffer.types.extend(block.types)
+        buffer.starts.extend(array('I', [start + shift for start in block.starts]))
+        buffer.ends.extend(array('I', [end + shift for end in block.ends]))
+        buffer.lines.extend(array('I', [line + line_shift for line in block.lines]))
+    return buffer, symbol_table
+
+
+def check(tmp):
+    path = os.path.join(tmp, 'source.txt')
+    code = generate_source(400, seed=5) + '\nنام = "x, y" ; é\n'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(code)
+    tokens, symbol_table = Lexer(code, engine='regex').tokenize()
+    buffer, _ = Lexer(code).tokenize_buffer()
+    for fmt in FORMATS:
+        out = os.path.join(tmp, 'check.' + fmt)
+        outputs = []
+        for source in (tokens, buffer, iter(tokens)):
+            export_tokens(out, source, symbol_table, fmt, chunk_size=100)
+            with open(out, 'rb') as f:
+                outputs.append(f.read())
+        count, streamed_symbols = export_file(out, path, fmt, chunk_size=77)
+        with open(out, 'rb') as f:
+            outputs.append(f.read())
+        if count != len(tokens) or streamed_symbols != symbol_table:
+            raise AssertionError(f"{fmt}: streaming export counted differently")
+        if fmt == 'binary':
+            for data in outputs:
+                with open(out, 'wb') as f:
+                    f.write(data)
+                loaded, loaded_symbols = load_binary(out)
+                if list(loaded) != tokens or loaded_symbols != symbol_table:
+                    raise AssertionError("load_binary does not round-trip")
+        elif len(set(outputs)) != 1:
+            raise AssertionError(f"{fmt}: list, TokenBuffer and streaming exports differ")
+
+
+def main():
+    n_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        check(tmp)
+
+        buffer, symbol_table = tiled_buffer(n_tokens)
+        print(f"input: {len(buffer):,} tokens")
+        print(f"{'format':>7} {'from':>12} {'time':>8} {'tokens/s':>12} {'size':>10}")
+        for fmt in FORMATS:
+            out = os.path.join(tmp, 'tokens.' + fmt)
+            for name, source in (('TokenBuffer', buffer), ('tuple stream', iter(buffer))):
+                t0 = time.perf_counter()
+                export_tokens(out, source, symbol_table, fmt)
+                elapsed = time.perf_counter() - t0
+                size = os.path.getsize(out)
+                print(f"{fmt:>7} {name:>12} {elapsed:7.2f}s {len(buffer) / elapsed:12,.0f} "
+                      f"{size / 1024 / 1024:8.1f}MB")
+
+        t0 = time.perf_counter()
+        loaded, _ = load_binary(os.path.join(tmp, 'tokens.binary'))
+        elapsed = time.perf_counter() - t0
+        if len(loaded) != len(buffer) or loaded[len(buffer) // 2] != buffer[len(buffer) // 2]:
+            raise AssertionError("load_binary differs on the large export")
+        print(f"load_binary: {elapsed:.2f}s  {len(loaded) / elapsed:,.0f} tokens/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+مجموعه ی کامل بنچمارک لکسر و تحلیل گرامر با خروجی JSON و مقایسه با یک baseline.
+
+برای هر حالت زمان (کمترین از چند تکرار)، اوج حافظه (tracemalloc) و تعداد بلوک های
+حافظه ای که نتیجه نگه داشته (CPython شمارنده ی کل تخصیص ها را نداره) ثبت میشه.
+ورودی ها قطعی اند پس اجرای دوباره روی همان نسخه همان کارها را تکرار میکنه
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --suite lexer --size small --compare results.json
+    python benchmarks/run.py --compare results.json --threshold 0.2
+
+با --compare اگر زمان یا حافظه ی حالتی بیشتر از threshold بدتر شده باشه کد خروج 1 است
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from lexer import ENGINES, Lexer
+from synth import MIXES, generate_grammar, generate_mix
+
+# اندازه ها: خط های ورودی لکسر و نان ترمینال های گرامر
+SIZES = {
+    'small': {'lines': (2000,), 'nonterminals': (100,)},
+    'medium': {'lines': (2000, 20000), 'nonterminals': (100, 1000)},
+    'large': {'lines': (2000, 20000, 100000), 'nonterminals': (100, 1000, 4000)},
+}
+EPSILON_RATES = (0.05, 0.3)
+RULES_PER_NT = 4
+
+
+def lexer_cases(size):
+    for n_lines in SIZES[size]['lines']:
+        for mix in MIXES:
+            code = generate_mix(n_lines, mix, seed=n_lines)
+            for engine in ENGINES:
+                def run(code=code, engine=engine):
+                    tokens, _ = Lexer(code, engine=engine).tokenize()
+                    return tokens
+                yield (f"lex/{mix}/{n_lines}/{engine}",
+                       {'mix': mix, 'lines': n_lines, 'engine': engine, 'chars': len(code)}, run)
+
+
+def grammar_cases(size):
+    for n in SIZES[size]['nonterminals']:
+        for epsilon_rate in EPSILON_RATES:
+            grammar = generate_grammar(n, rules_per_nt=RULES_PER_NT, n_terminals=max(20, n // 4),
+                                       epsilon_rate=epsilon_rate, seed=n)
+            for solver in SOLVERS:
+                def run(grammar=grammar, solver=solver):
+                    analyzer = GrammarAnalyzer(grammar, 'N0', solver=solver)
+                    analyzer.compute_follow_sets()
+                    return analyzer
+                yield (f"first-follow/{n}/eps{epsilon_rate}/{solver}",
+                       {'nonterminals': n, 'epsilon_rate': epsilon_rate, 'solver': solver,
+                        'rules': sum(len(rules) for rules in grammar.values())}, run)
+
+
+SUITES = {'lexer': lexer_cases, 'grammar': grammar_cases}
+
+
+def measure(run, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+
+    # حافظه در اجرای جدا تا هزینه ی tracemalloc در زمان حساب نشه
+    tracemalloc.start()
+    result = run()
+    peak = tracemalloc.get_traced_memory()[1]
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    items = len(result) if isinstance(result, list) else None
+    del result
+    return {'seconds': best, 'peak_bytes': peak, 'blocks': blocks, 'items': items}
+
+
+def run_suites(suites, size, repeat, only=None):
+    results = {}
+    for suite in suites:
+        for name, params, run in SUITES[suite](size):
+            if only and only not in name:
+                continue
+            entry = dict(params)
+            entry.update(measure(run, repeat))
+            results[name] = entry
+            print(f"{name:<40} {entry['seconds'] * 1000:10.2f} ms {entry['peak_bytes'] / 1024:10.0f} KB "
+                  f"{entry['blocks']:9,d} blocks", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """چاپ نسبت به baseline؛ خروجی: نام حالت هایی که بدتر شده اند"""
+    regressions = []
+    print(f"\n{'case':<40} {'time':>8} {'memory':>8}")
+    for name, entry in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'new':>8}")
+            continue
+        time_ratio = entry['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        memory_ratio = entry['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        flag = ''
+        if time_ratio > 1 + threshold or memory_ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<40} {time_ratio:7.2f}x {memory_ratio:7.2f}x{flag}")
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f"not run (in baseline only): {len(missing)}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='lexer and FIRST/FOLLOW benchmark suite')
+    parser.add_argument('--suite', choices=('all',) + tuple(SUITES), default='all')
+    parser.add_argument('--size', choices=tuple(SIZES), default='medium')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per case (best is kept)')
+    parser.add_argument('--only', help='run only cases whose name contains this text')
+    parser.add_argument('-o', '--output', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed slowdown / memory growth before flagging (default 0.15)')
+    args = parser.parse_args(argv)
+
+    suites = tuple(SUITES) if args.suite == 'all' else (args.suite,)
+    results = run_suites(suites, args.size, args.repeat, args.only)
+
+    if args.output:
+        document = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'size': args.size,
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+تولید ورودی های مصنوعی و قطعی (deterministic) برای بنچمارک ها
+"""
+import random
+
+_SNIPPETS = [
+    'for', 'if', 'while', 'print', 'x', 'y1', '_tmp', 'counter', 'value_2',
+    '0', '42', '3.14', '.5', '1e10', '2.5E-3', '7e+', '9e', '1.', '5.5.5',
+    '>=', '<=', '==', '!=', '>', '<', '=', '+', '-', '*', '/', '%',
+    ':', ';', '(', ')', '{', '}', '[', ']', ',', '.',
+    '@', '!', '$', '"', 'م',
+]
+
+
+def generate_source(n_lines, seed=0, tokens_per_line=12):
+    """متن برنامه ی مصنوعی با n_lines خط - شامل همه ی حالت های مرزی لکسر"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n_lines):
+        parts = [rng.choice(_SNIPPETS) for _ in range(rng.randint(1, tokens_per_line))]
+        sep = rng.choice((' ', ' ', ' ', '\t', ''))
+        line = sep.join(parts)
+        r = rng.random()
+        if r < 0.08:
+            line += ' // comment ' + rng.choice(_SNIPPETS)
+        elif r < 0.14:
+            line += '  # note' + rng.choice(_SNIPPETS)
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+# ترکیب های توکن: (مجموعه ی تکه ها, وزن) - balanced همان _SNIPPETS است
+MIXES = {
+    'balanced': ((_SNIPPETS, 1),),
+    'identifiers': ((['x', 'y1', '_tmp', 'counter', 'value_2', 'longer_identifier_name', 'i', 'for', 'while'], 8),
+                    (['=', '+', '(', ')', ';', ','], 2)),
+    'numbers': ((['0', '42', '3.14', '.5', '1e10', '2.5E-3', '6.02e+23', '1E-9', '7e+', '9e', '1.', '5.5.5'], 8),
+                (['+', '-', '*', '/', ','], 2)),
+    'comments': ((_SNIPPETS, 1),),
+    'errors': ((['@', '!', '$', '"', 'م', '?', '~', '`', '\\'], 6), (_SNIPPETS, 4)),
+}
+
+
+def generate_mix(n_lines, mix='balanced', seed=0, tokens_per_line=12):
+    """
+    مثل generate_source ولی با ترکیب توکن مشخص (کلیدهای MIXES):
+    شناسه ها، اعداد و نماها، کامنت ها (بیشتر خط ها کامنت دارن) یا خطاهای لغوی
+    """
+    if mix not in MIXES:
+        raise ValueError(f"unknown token mix {mix!r}, expected one of {tuple(MIXES)}")
+    rng = random.Random(seed)
+    pools = [pool for pool, _ in MIXES[mix]]
+    weights = [weight for _, weight in MIXES[mix]]
+    comment_rate = 0.7 if mix == 'comments' else 0.1
+    lines = []
+    for _ in range(n_lines):
+        n = rng.randint(1, tokens_per_line)
+        if mix == 'comments':
+            n = max(1, n // 3)
+        parts = [rng.choice(rng.choices(pools, weights)[0]) for _ in range(n)]
+        line = ' '.join(parts)
+        if rng.random() < comment_rate:
+            line += rng.choice(('  // ', '  # ')) + ' '.join(rng.choice(_SNIPPETS) for _ in range(6))
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def generate_grammar(n_nonterminals, rules_per_nt=3, n_terminals=20, max_len=5,
+                     epsilon_rate=0.15, seed=0):
+    """
+    گرامر مصنوعی به همان شکل دیکشنری ورودی GrammarAnalyzer:
+    {'N0': ['t3 N5 N1', 'ε', ...], ...}  -  نماد شروع N0 است
+    """
+    rng = random.Random(seed)
+    nts = [f"N{i}" for i in range(n_nonterminals)]
+    terminals = [f"t{i}" for i in range(n_terminals)]
+    grammar = {}
+    for nt in nts:
+        rules = []
+        for _ in range(rng.randint(1, rules_per_nt)):
+            if rng.random() < epsilon_rate:
+                rules.append('ε')
+                continue
+            symbols = []
+            for _ in range(rng.randint(1, max_len)):
+                symbols.append(rng.choice(nts) if rng.random() < 0.5 else rng.choice(terminals))
+            rules.append(' '.join(symbols))
+        grammar[nt] = rules
+    return grammar
+
+
+# گرامر LL(1) برای زبان کوچک لکسر (دستورهای انتساب، print، if و while)
+STATEMENT_GRAMMAR = {
+    'P': ['S P', 'ε'],
+    'S': ['id = E ;', 'print ( E ) ;', 'if ( C ) { P }', 'while ( C ) { P }'],
+    'C': ['E R E'],
+    'R': ['>', '<', '>=', '<=', '==', '!='],
+    'E': ["T E'"],
+    "E'": ["+ T E'", "- T E'", 'ε'],
+    'T': ["F T'"],
+    "T'": ["* F T'", "/ F T'", "% F T'", 'ε'],
+    'F': ['( E )', 'id', 'num'],
+}
+
+
+def _expression(rng, depth):
+    if depth > 2 or rng.random() < 0.4:
+        return rng.choice(('x', 'y1', '_tmp', 'counter', '0', '42', '3.14', '2.5E-3'))
+    if rng.random() < 0.2:
+        return f"( {_expression(rng, depth + 1)} )"
+    op = rng.choice('+-*/%')
+    return f"{_expression(rng, depth + 1)} {op} {_expression(rng, depth + 1)}"
+
+
+def generate_program(n_statements, seed=0, max_depth=4):
+    """برنامه ی مصنوعی و معتبر برای STATEMENT_GRAMMAR با حدود n_statements دستور"""
+    rng = random.Random(seed)
+    lines = []
+    open_blocks = 0
+    for _ in range(n_statements):
+        indent = '    ' * open_blocks
+        r = rng.random()
+        if r < 0.15 and open_blocks < max_depth:
+            keyword = rng.choice(('if', 'while'))
+            relop = rng.choice(('>', '<', '>=', '<=', '==', '!='))
+            lines.append(f"{indent}{keyword} ({_expression(rng, 1)} {relop} {_expression(rng, 1)}) {{")
+            open_blocks += 1
+        elif r < 0.27 and open_blocks:
+            open_blocks -= 1
+            lines.append('    ' * open_blocks + '}')
+        elif r < 0.37:
+            lines.append(f"{indent}print({_expression(rng, 0)});  // out")
+        else:
+            target = rng.choice(('x', 'y1', '_tmp', 'counter'))
+            lines.append(f"{indent}{target} = {_expression(rng, 0)};")
+    while open_blocks:
+        open_blocks -= 1
+        lines.append('    ' * open_blocks + '}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,192 @@
+"""
+اجرای بدون رابط گرافیکی برای کارهای دسته ای:
+
+    python cli.py lex "src/**/*.txt" --workers 4
+    python cli.py first-follow grammar.txt --ll1
+    python cli.py export big.txt tokens.csv
+
+خروجی JSON است. هیچ چیز در این مسیر tkinter یا customtkinter را import نمیکنه و
+ماژول های سنگین تر فقط داخل همان فرمانی که لازمشان داره import میشن
+"""
+import argparse
+import json
+import sys
+
+from FirstandFollow import SOLVERS
+from lexer import ENGINES
+from token_export import FORMATS as EXPORT_FORMATS
+
+
+def _expand(patterns):
+    import glob
+    import os
+
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for path in matches:
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                paths.append(path)
+            elif not os.path.exists(path):
+                raise FileNotFoundError(f"no such file: {pattern}")
+    return paths
+
+
+def _write_json(value, out, pretty):
+    json.dump(value, out, ensure_ascii=False, indent=2 if pretty else None)
+    out.write('\n')
+
+
+def cmd_lex(args, out):
+    from batch_lexer import lex_files
+    from token_buffer import TOKEN_LABELS
+
+    cache = None
+    if args.cache:
+        from token_cache import TokenCache
+        cache = TokenCache(args.cache_dir)
+
+    paths = _expand(args.paths)
+    files, symbols = lex_files(paths, workers=args.workers, engine=args.engine, cache=cache)
+
+    results = []
+    errors = 0
+    for path, tokens, table in files:
+        entry = {'path': path, 'count': len(tokens), 'symbol_table': table}
+        if not args.summary:
+            entry['tokens'] = [[tok_type, display[len(TOKEN_LABELS[tok_type]) + 1:-1], line]
+                               for display, line, tok_type in tokens]
+        errors += sum(1 for _, _, tok_type in tokens if tok_type == 'error')
+        if args.format == 'jsonl':
+            _write_json(entry, out, False)
+        else:
+            results.append(entry)
+
+    if args.format == 'json':
+        document = {'files': results, 'symbol_table': symbols, 'lexical_errors': errors}
+        if cache is not None:
+            document['cache'] = cache.stats()
+        _write_json(document, out, args.pretty)
+    return 1 if errors and args.strict else 0
+
+
+def cmd_export(args, out):
+    from token_export import export_file, format_for
+
+    fmt = args.format or format_for(args.target)
+    count, symbols = export_file(args.target, args.source, fmt, engine=args.engine)
+    _write_json({'path': args.target, 'format': fmt, 'count': count, 'identifiers': len(symbols)},
+                out, args.pretty)
+    return 0
+
+
+def cmd_first_follow(args, out):
+    from grammar_loader import load_grammar
+
+    grammar = load_grammar(args.grammar)
+    if not grammar:
+        raise ValueError(f"no productions found in {args.grammar}")
+    start = args.start or next(iter(grammar))
+    if start not in grammar:
+        raise ValueError(f"start symbol {start!r} is not a nonterminal")
+
+    options = {'solver': args.solver, 'bitsets': args.bitsets}
+    cache = None
+    if args.cache:
+        from grammar_cache import GrammarCache
+        cache = GrammarCache(args.cache_dir)
+        analyzer = cache.analyze(grammar, start, args.epsilon, args.eof, **options)
+    else:
+        from FirstandFollow import GrammarAnalyzer
+        analyzer = GrammarAnalyzer(grammar, start, args.epsilon, args.eof, **options)
+        analyzer.compute_follow_sets()
+
+    document = {
+        'start': start,
+        'first': {nt: sorted(analyzer.first[nt]) for nt in grammar},
+        'follow': {nt: sorted(analyzer.follow[nt]) for nt in grammar},
+    }
+    conflicts = False
+    if args.ll1:
+        if cache is not None:
+            table = cache.ll1_table(analyzer)
+        else:
+            from ll1_table import LL1Table
+            table = LL1Table(analyzer)
+        conflicts = not table.is_ll1
+        document['ll1'] = {
+            'is_ll1': table.is_ll1,
+            'table': {nt: dict(zip(table.grammar.terminals[1:], cells)) for nt, cells in table.rows()},
+            'conflicts': table.describe_conflicts(),
+        }
+    if cache is not None:
+        document['cache'] = cache.stats()
+    _write_json(document, out, args.pretty)
+    return 1 if conflicts and args.strict else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # گزینه های مشترک همه ی فرمان ها
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--pretty', action='store_true', help='indent the JSON output')
+    common.add_argument('-o', '--output', help='write to this file instead of stdout')
+
+    lex = commands.add_parser('lex', parents=[common], help='tokenize files or glob patterns')
+    lex.add_argument('paths', nargs='+', help='files or glob patterns (** is recursive)')
+    lex.add_argument('--engine', choices=ENGINES, default='regex')
+    lex.add_argument('--workers', type=int, default=1, help='worker processes (default 1)')
+    lex.add_argument('--format', choices=('json', 'jsonl'), default='json',
+                     help='one document, or one line per file')
+    lex.add_argument('--summary', action='store_true', help='omit the token lists')
+    lex.add_argument('--strict', action='store_true', help='exit with 1 on lexical errors')
+    lex.add_argument('--cache', action='store_true', help='use the on-disk token cache')
+    lex.add_argument('--cache-dir', help='token cache directory')
+    lex.set_defaults(run=cmd_lex)
+
+    export = commands.add_parser('export', parents=[common],
+                                 help='stream the tokens of one file into a text/csv/jsonl/binary file')
+    export.add_argument('source', help='file to tokenize')
+    export.add_argument('target', help='export file (.txt, .csv, .jsonl or .tok)')
+    export.add_argument('--format', choices=EXPORT_FORMATS,
+                        help='output format (default: from the target extension)')
+    export.add_argument('--engine', choices=ENGINES, default='regex')
+    export.set_defaults(run=cmd_export)
+
+    ff = commands.add_parser('first-follow', parents=[common],
+                             help='FIRST/FOLLOW sets of a grammar file')
+    ff.add_argument('grammar', help='grammar file, one "A : X Y | Z" rule per line')
+    ff.add_argument('--start', help='start symbol (default: first nonterminal)')
+    ff.add_argument('--epsilon', default='ε')
+    ff.add_argument('--eof', default='$')
+    ff.add_argument('--solver', choices=SOLVERS, default='worklist')
+    ff.add_argument('--bitsets', action='store_true')
+    ff.add_argument('--ll1', action='store_true', help='also build the LL(1) table')
+    ff.add_argument('--strict', action='store_true', help='exit with 1 on LL(1) conflicts')
+    ff.add_argument('--cache', action='store_true', help='use the on-disk grammar cache')
+    ff.add_argument('--cache-dir', help='grammar cache directory')
+    ff.set_defaults(run=cmd_first_follow)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')    # ε و شناسه های غیر ASCII در کنسول ویندوز
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                return args.run(args, out)
+        return args.run(args, sys.stdout)
+    except (OSError, ValueError) as e:
+        print(f"{parser.prog}: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+class CompiledGrammar:
+    """
+    شکل کامپایل شده و تغییرناپذیر گرامر: یک بار ساخته میشه و همه ی
+    حل کننده های FIRST/FOLLOW و سازنده های جدول از آن استفاده میکنن.
+
+    کد نمادها:
+        نان ترمینال n  ->  n   (0, 1, 2, ...)
+        ترمینال t      ->  ~t  (-1, -2, ...)
+    ترمینال 0 همیشه اپسیلون و ترمینال 1 همیشه eof است؛ شماره ی هر ترمینال
+    همان شماره ی بیت آن در حالت bitsets است
+    """
+
+    def __init__(self, grammar, epsilon="ε", eof="$"):
+        self.epsilon = epsilon
+        self.eof = eof
+
+        self.nonterminals = list(grammar)
+        self.nt_ids = {nt: i for i, nt in enumerate(self.nonterminals)}
+        self.terminals = [epsilon, eof]
+        self.t_ids = {epsilon: 0, eof: 1}
+
+        # قوانین: lhs[p] -> rhs[p]  و متن اصلی قانون برای نمایش
+        self.lhs = []
+        self.rhs = []
+        self.rules = []
+        self.by_lhs = [[] for _ in self.nonterminals]
+        # کد نمادهای دیده شده - تبدیل هر قانون با یک map؛ فقط ترمینال تازه از code میگذره
+        codes = {epsilon: ~0, eof: ~1}
+        codes.update(self.nt_ids)
+        get = codes.__getitem__
+        for A, rules in grammar.items():
+            a = self.nt_ids[A]
+            for rule in rules:
+                symbols = rule.split() if isinstance(rule, str) else rule
+                try:
+                    rhs = tuple(map(get, symbols))
+                except KeyError:
+                    for symbol in symbols:
+                        if symbol not in codes:
+                            codes[symbol] = self.code(symbol)
+                    rhs = tuple(map(get, symbols))
+                self.by_lhs[a].append(len(self.rhs))
+                self.lhs.append(a)
+                self.rhs.append(rhs)
+                self.rules.append(rule)
+
+        # occurrences[B] = همه ی (قانون, مکان) هایی که B در سمت راست آمده
+        # users[B]       = قوانینی که B در سمت راستشان هست (بدون تکرار)
+        self.occurrences = occurrences = [[] for _ in self.nonterminals]
+        for p, rhs in enumerate(self.rhs):
+            for pos, symbol in enumerate(rhs):
+                if symbol >= 0:
+                    occurrences[symbol].append((p, pos))
+        # occurrences[B] به ترتیب p است، پس users همان p های بدون تکرار آن است
+        self.users = [list(dict.fromkeys([p for p, _ in places])) for places in occurrences]
+
+    def code(self, symbol):
+        """کد نماد - ترمینال های جدید همینجا شماره میگیرن"""
+        if symbol in self.nt_ids:
+            return self.nt_ids[symbol]
+        if symbol not in self.t_ids:
+            self.t_ids[symbol] = len(self.terminals)
+            self.terminals.append(symbol)
+        return ~self.t_ids[symbol]
+
+    def name(self, code):
+        return self.nonterminals[code] if code >= 0 else self.terminals[~code]
+
+    def rule_text(self, p):
+        """قانون p به شکل  A -> X Y Z"""
+        return f"{self.nonterminals[self.lhs[p]]} -> {' '.join(self.name(s) for s in self.rhs[p])}"
+
+    def __len__(self):
+        return len(self.rhs)
@@ -0,0 +1,165 @@
+import hashlib
+import mmap
+import os
+import tempfile
+
+
+def default_directory(name):
+    """مسیر پیش فرض کش ها: ~/.cache/compiler-project/<name>"""
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'compiler-project', name)
+
+
+def content_key(*parts):
+    """کلید کش: sha256 روی همه ی بخش ها (bytes یا str)"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        h.update(len(part).to_bytes(8, 'little'))   # تا مرز بخش ها هم در کلید باشه
+        h.update(part)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    کش فایلی با حجم محدود: هر مقدار یک فایل <key>.bin در پوشه ی کش است.
+
+    - نوشتن اتمیک است (فایل موقت در همان پوشه + os.replace)، پس چند پردازه
+      میتونن همزمان بخونن و بنویسن و هیچ وقت فایل نیمه کاره دیده نمیشه
+    - ترتیب LRU همان mtime فایل هاست که با هر hit به روز میشه؛ بعد از هر put
+      قدیمی ترین فایل ها تا رسیدن به max_bytes پاک میشن
+    - فایلی که وسط کار توسط پردازه ی دیگری پاک بشه فقط یک miss حساب میشه
+    """
+
+    SUFFIX = '.bin'
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass        # پاک شده یا (در ویندوز) هنوز map شده؛ put بعدی رویش مینویسه
+
+    def get(self, key):
+        """محتوای ذخیره شده (bytes) یا None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(path)
+        return data
+
+    def open(self, key):
+        """مثل get ولی بدون کپی: یک mmap فقط خواندنی (یا None)"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except ValueError:          # فایل خالی (خراب)
+            self.misses += 1
+            self._remove(path)
+            return None
+        self.hits += 1
+        self._touch(path)
+        return data
+
+    def discard(self, key):
+        """پاک کردن ورودی خراب یا ناسازگار؛ جستجویی که آن را برگردونده miss حساب میشه"""
+        self.hits -= 1
+        self.misses += 1
+        self._remove(self.path(key))
+
+    def put(self, key, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            try:
+                os.replace(tmp, self.path(key))
+            except PermissionError:
+                # ویندوز: فایل فعلی هنوز map شده؛ کلید از محتوا ساخته شده پس همان داده را دارد
+                os.remove(tmp)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def entries(self):
+        """(mtime, اندازه, مسیر) برای همه ی فایل های کش"""
+        result = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                result.append((st.st_mtime, st.st_size, entry.path))
+        return result
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue        # مثلا فایلی که در ویندوز هنوز map شده
+            else:
+                self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,185 @@
+import json
+import struct
+import sys
+import time
+from array import array
+
+from disk_cache import DiskCache, content_key, default_directory
+from FirstandFollow import GrammarAnalyzer
+from ll1_table import LL1Table
+
+# با هر تغییر در شکل داده ی ذخیره شده عوض میشه تا فایل های قدیمی استفاده نشن
+_FORMAT = 'grammar-v2'
+_MAGIC = b'GRC2'
+_HEADER = struct.Struct('<4sII')     # magic, طول بخش FIRST/FOLLOW, طول بخش LL(1)
+_CONFLICT_KINDS = ('FIRST/FIRST', 'FIRST/FOLLOW')
+
+
+def grammar_key(grammar, start_symbol, epsilon="ε", eof="$"):
+    """
+    هش گرامر نرمال شده: قوانین به فهرست نمادها شکسته میشن تا فاصله های اضافه
+    کلید را عوض نکنن، ولی ترتیب قوانین حفظ میشه چون شماره ی قوانین و ترمینال ها
+    (و در نتیجه جدول ها) به آن وابسته است
+    """
+    rules = [[nt, [rule.split() if isinstance(rule, str) else list(rule) for rule in productions]]
+             for nt, productions in grammar.items()]
+    normalized = json.dumps([rules, start_symbol, epsilon, eof],
+                            ensure_ascii=False, separators=(',', ':'))
+    # جدول ها با ترتیب بایت همین ماشین ذخیره میشن
+    return content_key(_FORMAT, sys.byteorder, normalized)
+
+
+class GrammarCache:
+    """
+    کش دائمی نتیجه ی تحلیل گرامر روی دیسک.
+    هر ورودی FIRST و FOLLOW (به صورت بیت ماسک) و در صورت ساخته شدن، جدول LL(1) را نگه میداره
+
+        cache = GrammarCache()
+        analyzer = cache.analyze(grammar, 'E')
+        table = cache.ll1_table(analyzer)
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024):
+        self.cache = DiskCache(directory or default_directory('grammar'), max_bytes)
+        self.load_seconds = 0.0
+        self.compute_seconds = 0.0
+        self._entry = None              # (کلید, ورودی) آخرین ورودی خوانده یا نوشته شده
+
+    def _key(self, analyzer):
+        return grammar_key(analyzer.grammar, analyzer.start, analyzer.epsilon, analyzer.eof)
+
+    def _uncount_hit(self):
+        self.cache.hits -= 1
+        self.cache.misses += 1
+
+    def _load(self, key, analyzer):
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        try:
+            entry = self._decode(data)
+            if len(entry['first']) != len(analyzer.compiled.nonterminals):
+                raise ValueError("entry does not match grammar")
+        except (ValueError, TypeError, KeyError, struct.error):     # فایل خراب یا ناسازگار مثل miss رفتار میکنه
+            self.cache.discard(key)
+            return None
+        self._entry = (key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        self.cache.put(key, self._encode(entry))
+        self._entry = (key, entry)
+
+    # ورودی ها فقط داده اند (struct و JSON) نه pickle، چون پوشه ی کش ممکنه بین کاربرها یا
+    # اجراهای CI مشترک باشه و باز کردن pickle یعنی اجرای هر کدی که در آن نوشته شده:
+    #   سرآیند | FIRST/FOLLOW به JSON (بیت ماسک ها hex) | بخش LL(1)
+    # بخش LL(1) (طول جدول، جدول خام و تداخل ها به صورت array('i') شماره ها) فقط در
+    # ll1_table باز میشه
+
+    @staticmethod
+    def _encode(entry):
+        sets = json.dumps({'first': [format(mask, 'x') for mask in entry['first']],
+                           'follow': [format(mask, 'x') for mask in entry['follow']]},
+                          separators=(',', ':')).encode('ascii')
+        part = b''
+        if 'll1' in entry:
+            table, conflicts = entry['ll1']
+            part = len(table).to_bytes(4, 'little') + table + conflicts
+        return _HEADER.pack(_MAGIC, len(sets), len(part)) + sets + part
+
+    @staticmethod
+    def _decode(data):
+        magic, sets_size, ll1_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or len(data) != _HEADER.size + sets_size + ll1_size:
+            raise ValueError("not a grammar cache entry")
+        sets = json.loads(data[_HEADER.size:_HEADER.size + sets_size])
+        entry = {'first': [int(mask, 16) for mask in sets['first']],
+                 'follow': [int(mask, 16) for mask in sets['follow']]}
+        if ll1_size:
+            part = data[_HEADER.size + sets_size:]
+            size = int.from_bytes(part[:4], 'little')
+            entry['ll1'] = (part[4:4 + size], part[4 + size:])
+        return entry
+
+    @staticmethod
+    def _pack_conflicts(table):
+        g = table.grammar
+        codes = array('i')
+        for kind, A, t, q, p in table.conflicts:
+            codes.extend((_CONFLICT_KINDS.index(kind), g.nt_ids[A], g.t_ids[t], q, p))
+        return codes.tobytes()
+
+    @staticmethod
+    def _unpack_conflicts(analyzer, data):
+        g = analyzer.compiled
+        codes = array('i')
+        codes.frombytes(data)
+        return [(_CONFLICT_KINDS[codes[i]], g.nonterminals[codes[i + 1]], g.terminals[codes[i + 2]],
+                 codes[i + 3], codes[i + 4]) for i in range(0, len(codes), 5)]
+
+    @staticmethod
+    def _pack_sets(analyzer):
+        first, follow = analyzer.snapshot()
+        return {'first': first, 'follow': follow}
+
+    def analyze(self, grammar, start_symbol, epsilon="ε", eof="$", progress=None, stats=None, **options):
+        """
+        GrammarAnalyzer با FIRST/FOLLOW آماده - از کش یا با محاسبه و ذخیره.
+        options (solver, bitsets) مستقیم به GrammarAnalyzer داده میشن و روی کلید اثری ندارن.
+        stats (AnalyzerStats) فقط وقتی پر میشه که محاسبه انجام بشه؛ در hit فقط cached=True
+        """
+        analyzer = GrammarAnalyzer(grammar, start_symbol, epsilon, eof, **options)
+        analyzer.progress = progress
+        analyzer.stats = stats
+        key = self._key(analyzer)
+
+        t0 = time.perf_counter()
+        entry = self._load(key, analyzer)
+        if entry is not None:
+            analyzer.restore(entry['first'], entry['follow'])
+            if stats is not None:
+                stats.solver = analyzer.solver
+                stats.cached = True
+            self.load_seconds += time.perf_counter() - t0
+            return analyzer
+
+        analyzer.compute_follow_sets()
+        self.compute_seconds += time.perf_counter() - t0
+        self._store(key, self._pack_sets(analyzer))
+        return analyzer
+
+    def ll1_table(self, analyzer):
+        """جدول LL(1) همان گرامر - از کش یا با ساخت و اضافه کردن به همان ورودی"""
+        key = self._key(analyzer)
+        t0 = time.perf_counter()
+        reused = self._entry is not None and self._entry[0] == key
+        # همان ورودی analyze دوباره خوانده و شمرده نمیشه
+        entry = self._entry[1] if reused else self._load(key, analyzer)
+        table = None
+        if entry is not None and 'll1' in entry:
+            data, conflicts = entry['ll1']
+            try:
+                table = LL1Table.restore(analyzer, data, self._unpack_conflicts(analyzer, conflicts))
+                if len(table.table) != len(analyzer.compiled.nonterminals) * table.width:
+                    raise ValueError("table does not match grammar")
+            except (ValueError, IndexError):    # بخش خراب: جدول دوباره ساخته میشه
+                table = None
+        if table is not None:
+            self.load_seconds += time.perf_counter() - t0
+            return table
+        if entry is not None and not reused:
+            self._uncount_hit()         # جدول در کش نبود و ساخته میشه
+
+        table = LL1Table(analyzer)
+        self.compute_seconds += time.perf_counter() - t0
+        if entry is None:
+            entry = self._pack_sets(analyzer)
+        entry['ll1'] = (table.table.tobytes(), self._pack_conflicts(table))
+        self._store(key, entry)
+        return table
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats['load_seconds'] = self.load_seconds
+        stats['compute_seconds'] = self.compute_seconds
+        return stats
@@ -0,0 +1,91 @@
+"""
+خواندن گرامر از متن یا فایل به شکل دیکشنری ورودی GrammarAnalyzer.
+هر خط:  A : X Y | Z | ε
+
+هر قانون یک بار به نمادها شکسته میشه و سمت راست ها به صورت tuple نمادها
+برگردونده میشن، پس CompiledGrammar دیگر رشته ای را split نمیکنه.
+خط های نادرست با شماره خط گزارش میشن (GrammarError)
+"""
+import re
+
+# ترمینال های تک حرفی
+TERMINAL_SYMBOLS = ['(', ')', '+', '*', '-', '/', '^', '=', '|']
+
+# ترمینال های تک حرفی که باید از نماد کناری جدا بشن ('|' جداکننده ی سمت راست هاست)
+_SPACED = [(symbol, f' {symbol} ') for symbol in TERMINAL_SYMBOLS if symbol != '|']
+_BLANK = re.compile(r'\s')
+
+
+class GrammarError(ValueError):
+    def __init__(self, message, line=None):
+        if line is not None:
+            message = f"line {line}: {message}"
+        super().__init__(message)
+        self.line = line
+
+
+def _space_terminals(right):
+    # فقط ترمینال هایی که واقعا در متن هستن جایگزین میشن (str.replace روی متن کوتاه
+    # از یک regex روی تک تک نمادها سریعتره)
+    for symbol, spaced in _SPACED:
+        if symbol in right:
+            right = right.replace(symbol, spaced)
+    return right
+
+
+def tokenize_production(production_str):
+    """توکن‌بندی صحیح نمادها با فاصله"""
+    return ' '.join(_space_terminals(production_str).replace('|', ' | ').split())
+
+
+def _parse_rule(line, number):
+    # (A, [tuple نمادها, ...]) - None برای خط خالی
+    left, colon, right = line.partition(':')
+    left = left.strip()
+    if not colon:
+        if not left:
+            return None
+        raise GrammarError(f"expected 'A : X Y | Z', got {left!r}", number)
+    if not left:
+        raise GrammarError("missing nonterminal before ':'", number)
+    if _BLANK.search(left):
+        raise GrammarError(f"nonterminal {left!r} contains spaces", number)
+    right = _space_terminals(right)
+    productions = [tuple(symbols) for symbols in map(str.split, right.split('|')) if symbols]
+    if not productions:
+        raise GrammarError(f"no productions for {left!r}", number)
+    return left, productions
+
+
+def iter_rules(lines, errors=None):
+    """
+    قوانین خط به خط: (A, [tuple نمادها, ...], شماره خط).
+    lines هر iterable از خط هاست (مثلا فایل باز شده). خط نادرست اگر errors
+    یک لیست باشه به صورت GrammarError به آن اضافه و رد میشه، وگرنه raise میشه
+    """
+    for number, line in enumerate(lines, 1):
+        try:
+            rule = _parse_rule(line, number)
+        except GrammarError as error:
+            if errors is None:
+                raise
+            errors.append(error)
+            continue
+        if rule is not None:
+            yield rule[0], rule[1], number
+
+
+def read_grammar(lines, errors=None):
+    # مثل نسخه ی قبلی، تعریف دوباره ی یک نان ترمینال جای تعریف قبلی را میگیره
+    return {left: productions for left, productions, _ in iter_rules(lines, errors)}
+
+
+def parse_grammar(text, errors=None):
+    #تدبیل متن گرامر به دیکشنری
+    return read_grammar(text.split('\n'), errors)
+
+
+def load_grammar(path, errors=None):
+    """خواندن جریانی فایل گرامر - متن کامل فایل در حافظه ساخته نمیشه"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return read_grammar(f, errors)
@@ -0,0 +1,269 @@
+"""
+آمار اجرای Lexer و GrammarAnalyzer (اختیاری):
+
+    lexer.stats = LexerStats()
+    lexer.tokenize()
+    print(lexer.stats.to_json())
+
+    analyzer.stats = AnalyzerStats()
+    analyzer.compute_follow_sets()
+
+وقتی stats برابر None است (پیش فرض) هیچ زمان سنجی یا شمارشی انجام نمیشه: لکسر
+فقط یک بار در هر اجرا و تحلیلگر فقط در هر دور یا هر بزرگ شدن مجموعه آن را بررسی میکنه
+"""
+import json
+import time
+from collections import Counter
+
+from token_buffer import TOKEN_TYPES
+
+# روال های موتور char که زمانشان جدا ثبت میشه
+LEXER_ROUTINES = ('_consume_comment_slash', '_consume_comment_hash',
+                  '_consume_identifier_or_keyword', '_consume_number')
+
+
+def _utf8_size(code):
+    if not isinstance(code, str) or code.isascii():
+        return len(code)
+    return len(code.encode('utf-8'))
+
+
+class _Stats:
+    """خروجی JSON مشترک؛ هر زیرکلاس to_dict خودش را داره"""
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+
+class LexerStats(_Stats):
+    """
+    آمار تجمعی همه ی اجراهای یک Lexer (tokenize، tokenize_buffer و بلوک های iter_tokens).
+    موتور char: زمان هر روال _consume_* (routines).
+    موتور regex (و tokenize_buffer): تعداد و زمان تطبیق های هر گروه الگوی ترکیبی
+    (groups - مثلا word، number، comment). خود زمان سنجی به هر دو اضافه میشه.
+    موتور numpy روال یا گروه جدا نداره و فقط زمان کل ثبت میشه
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.seconds = 0.0
+        self.bytes = 0                  # حجم ورودی پیمایش شده به بایت (utf-8)
+        self.tokens = Counter()         # نوع توکن -> تعداد
+        self.routines = {name: [0, 0.0] for name in LEXER_ROUTINES}    # [تعداد صدا زدن, ثانیه]
+        self.groups = {}                # گروه الگوی regex -> [تعداد تطبیق, ثانیه]
+        self._started = None
+
+    @staticmethod
+    def _timed(method, counter):
+        clock = time.perf_counter
+
+        def timed(*args):
+            t0 = clock()
+            try:
+                return method(*args)
+            finally:
+                counter[0] += 1
+                counter[1] += clock() - t0
+        return timed
+
+    def matches(self, finditer):
+        """
+        finditer الگوی ترکیبی با زمان سنجی هر تطبیق به تفکیک گروه (m.lastgroup).
+        بیرون از یک اجرای شروع شده (مثلا relex) همان finditer برگردونده میشه
+        """
+        if self._started is None:
+            return finditer
+        clock, groups = time.perf_counter, self.groups
+
+        def timed(code, pos, endpos):
+            matches = finditer(code, pos, endpos)
+            while True:
+                t0 = clock()
+                m = next(matches, None)
+                elapsed = clock() - t0
+                if m is None:
+                    return
+                counter = groups.get(m.lastgroup)
+                if counter is None:
+                    counter = groups[m.lastgroup] = [0, 0.0]
+                counter[0] += 1
+                counter[1] += elapsed
+                yield m
+        return timed
+
+    def start(self, lexer):
+        # روال ها فقط روی همین نمونه با نسخه ی زمان دار پوشانده میشن
+        for name in LEXER_ROUTINES:
+            setattr(lexer, name, self._timed(getattr(lexer, name), self.routines[name]))
+        self._started = (time.perf_counter(), len(lexer._tokens))
+
+    def stop(self, lexer, buffer=None):
+        """buffer: خروجی tokenize_buffer؛ وگرنه توکن های اضافه شده به lexer._tokens شمرده میشن"""
+        t0, first = self._started
+        self.seconds += time.perf_counter() - t0
+        self._started = None
+        for name in LEXER_ROUTINES:
+            del lexer.__dict__[name]
+        self.runs += 1
+        self.bytes += _utf8_size(lexer.code)
+        if buffer is not None:
+            for code, name in enumerate(TOKEN_TYPES):
+                count = buffer.types.count(code)
+                if count:
+                    self.tokens[name] += count
+        else:
+            self.tokens.update(tok_type for _, _, tok_type in lexer._tokens[first:])
+
+    @property
+    def token_count(self):
+        return sum(self.tokens.values())
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    @property
+    def error_rate(self):
+        total = self.token_count
+        return self.tokens['error'] / total if total else 0.0
+
+    def to_dict(self):
+        return {
+            'runs': self.runs,
+            'seconds': self.seconds,
+            'bytes': self.bytes,
+            'bytes_per_second': self.bytes_per_second,
+            'tokens': self.token_count,
+            'tokens_by_type': dict(self.tokens.most_common()),
+            'error_rate': self.error_rate,
+            'routines': {name: {'calls': calls, 'seconds': seconds}
+                         for name, (calls, seconds) in self.routines.items() if calls},
+            'groups': {name: {'matches': count, 'seconds': seconds}
+                       for name, (count, seconds) in self.groups.items()},
+        }
+
+    def format(self):
+        """متن چند خطی برای پنل آمار"""
+        if not self.runs:
+            return "no lexer runs recorded"
+        lines = [
+            f"runs: {self.runs}   time: {self.seconds:.3f} s   input: {self.bytes:,} bytes   "
+            f"{self.bytes_per_second / 1024 / 1024:.2f} MB/s",
+            f"tokens: {self.token_count:,}   errors: {self.tokens['error']:,} ({self.error_rate:.2%})",
+            "",
+        ]
+        lines += [f"  {name:<10} {count:>12,}" for name, count in self.tokens.most_common()]
+        routines = [(name, calls, seconds) for name, (calls, seconds) in self.routines.items() if calls]
+        if routines:
+            lines += ["", "routines (char engine):"]
+            lines += [f"  {name:<32} {calls:>10,} calls {seconds:9.3f} s" for name, calls, seconds in routines]
+        if self.groups:
+            lines += ["", "pattern groups (regex engine):"]
+            lines += [f"  {name:<32} {count:>10,} matches {seconds:7.3f} s"
+                      for name, (count, seconds) in sorted(self.groups.items(), key=lambda item: -item[1][1])]
+        if not routines and not self.groups:
+            lines += ["", "no per-routine timings (only the char and regex engines record them)"]
+        return "\n".join(lines)
+
+
+class PhaseStats:
+    """
+    آمار یک مرحله (FIRST یا FOLLOW):
+        passes : برای هر دور [قوانین/قیدهای بررسی شده, دفعات بزرگ شدن مجموعه ها].
+                 در fixpoint هر دور یک پیمایش کامل است و در worklist هر دور یک نسل صف
+                 (قوانینی که در دور قبل دوباره به صف رفتن)
+        growth : نان ترمینال -> چند بار مجموعه اش بزرگ شد
+        sizes  : نان ترمینال -> اندازه ی نهایی مجموعه
+    حل FOLLOW با SCC دور ندارد (هر مولفه یک بار حساب میشه): یک دور با changed=None و
+    تعداد مولفه ها در components ثبت میشه
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.passes = []
+        self.growth = Counter()         # تا پایان مرحله کلیدها شماره ی نان ترمینال اند
+        self.sizes = {}
+        self.components = None
+        self._left = 0                  # worklist: قوانین باقیمانده از نسل فعلی
+        self._t0 = time.perf_counter()
+
+    def new_pass(self, evaluated, changed=0):
+        self.passes.append([evaluated, changed])
+
+    def evaluated(self, queued):
+        # worklist: یک قانون از صف برداشته شد؛ queued = طول صف بعد از برداشتن
+        if not self._left:
+            self.passes.append([0, 0])
+            self._left = queued + 1
+        self._left -= 1
+        self.passes[-1][0] += 1
+
+    def grew(self, nt):
+        self.passes[-1][1] += 1
+        self.growth[nt] += 1
+
+    def finish(self, names, sets):
+        self.seconds = time.perf_counter() - self._t0
+        self.growth = Counter({names[nt]: count for nt, count in self.growth.items()})
+        self.sizes = {nt: len(values) for nt, values in sets.items()}
+
+    def to_dict(self):
+        document = {
+            'seconds': self.seconds,
+            'passes': len(self.passes),
+            'evaluated': [evaluated for evaluated, _ in self.passes],
+            'changed': [changed for _, changed in self.passes],
+            'growth': dict(self.growth.most_common()),
+            'sizes': self.sizes,
+        }
+        if self.components is not None:
+            document['components'] = self.components
+        return document
+
+
+class AnalyzerStats(_Stats):
+    """آمار یک بار محاسبه ی FIRST/FOLLOW؛ cached یعنی نتیجه از GrammarCache خوانده شد"""
+
+    def __init__(self):
+        self.solver = None
+        self.cached = False
+        self.first = None
+        self.follow = None
+
+    def begin(self, phase, analyzer):
+        self.solver = analyzer.solver
+        stats = PhaseStats()
+        setattr(self, phase.lower(), stats)
+        return stats
+
+    def to_dict(self):
+        return {
+            'solver': self.solver,
+            'cached': self.cached,
+            'first': self.first and self.first.to_dict(),
+            'follow': self.follow and self.follow.to_dict(),
+        }
+
+    def format(self, top=10):
+        """متن چند خطی برای پنل آمار - top نان ترمینال با بیشترین بزرگ شدن"""
+        if self.cached:
+            return "FIRST/FOLLOW were loaded from the grammar cache: nothing was computed"
+        lines = [f"solver: {self.solver}"]
+        for name, phase in (('FIRST', self.first), ('FOLLOW', self.follow)):
+            if phase is None:
+                continue
+            lines += ["", f"{name}: {phase.seconds:.3f} s, {len(phase.passes)} passes"
+                      + (f", {phase.components:,} components" if phase.components is not None else "")]
+            lines += [f"  pass {i}: {evaluated:,} evaluated" + (f", {changed:,} grew" if changed is not None else "")
+                      for i, (evaluated, changed) in enumerate(phase.passes, 1)]
+            if phase.growth:
+                lines.append("  most updated:")
+                lines += [f"    {nt}: grew {count} times, size {phase.sizes[nt]}"
+                          for nt, count in phase.growth.most_common(top)]
+            largest = sorted(phase.sizes.items(), key=lambda item: -item[1])[:top]
+            lines.append("  largest: " + ", ".join(f"{nt} ({size})" for nt, size in largest))
+        return "\n".join(lines)
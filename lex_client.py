@@ -0,0 +1,179 @@
+"""
+کتابخانه ی کلاینت سرور محلی لکس و FIRST/FOLLOW (lex_server.py).
+
+پروتکل: روی یک اتصال Unix socket یا TCP هر درخواست و هر پاسخ یک خط JSON است:
+    {"id": 1, "op": "lex", "code": "x = 1", "engine": "regex"}
+    {"id": 1, "ok": true, "result": {"tokens": [["id", "x", 1], ...], "symbol_table": {"x": 1}}}
+    {"id": 2, "ok": false, "error": "unknown op 'lexx'"}
+درخواست ها میتونن پشت سر هم فرستاده بشن و پاسخ ها با id جفت میشن (ترتیبشان تضمین نیست).
+این ماژول به جز کتابخانه ی استاندارد چیزی import نمیکنه تا ابزارهای بیرونی سریع بالا بیان
+
+    with LexClient('/tmp/lex.sock') as client:
+        result = client.lex("x = 1")
+"""
+import asyncio
+import json
+import socket
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 1 << 26              # بزرگترین درخواست یا پاسخ (یک خط JSON)
+
+
+class ServerError(Exception):
+    """خطایی که سرور برای یک درخواست برگردونده"""
+
+
+def encode_request(request_id, op, params):
+    request = {'id': request_id, 'op': op}
+    request.update(params)
+    return json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def decode_response(line):
+    """(id, result) - خطای سرور به صورت ServerError"""
+    if not line:
+        raise ConnectionError("server closed the connection")
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise ServerError(response.get('error', 'request failed'))
+    return response.get('id'), response.get('result')
+
+
+class LexClient:
+    """
+    کلاینت همگام (blocking): هر بار یک درخواست و انتظار برای پاسخ آن.
+    path برای Unix socket، وگرنه host و port
+    """
+
+    def __init__(self, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+        if path is not None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(path)
+        else:
+            sock = socket.create_connection((host, port), timeout)
+        self._sock = sock
+        self._file = sock.makefile('rwb')
+        self._next_id = 0
+
+    def request(self, op, **params):
+        self._next_id += 1
+        self._file.write(encode_request(self._next_id, op, params))
+        self._file.flush()
+        response_id, result = decode_response(self._file.readline(MAX_LINE))
+        if response_id != self._next_id:
+            raise ConnectionError(f"response {response_id} does not match request {self._next_id}")
+        return result
+
+    def lex(self, code, engine='regex', keywords=None):
+        """{'tokens': [[type, text, line], ...], 'symbol_table': {...}} - مثل cli.py lex"""
+        params = {'code': code, 'engine': engine}
+        if keywords is not None:
+            params['keywords'] = sorted(keywords)
+        return self.request('lex', **params)
+
+    def first_follow(self, grammar, start=None, epsilon='ε', eof='$', solver='worklist', ll1=False):
+        """grammar: متن گرامر یا دیکشنری {A: [rule, ...]} - خروجی مثل cli.py first-follow"""
+        return self.request('first_follow', grammar=grammar, start=start, epsilon=epsilon, eof=eof,
+                            solver=solver, ll1=ll1)
+
+    def ping(self):
+        return self.request('ping')
+
+    def stats(self):
+        return self.request('stats')
+
+    def shutdown(self):
+        """توقف سرور بعد از پاسخ به همین درخواست"""
+        return self.request('shutdown')
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncLexClient:
+    """
+    کلاینت asyncio: چند درخواست همزمان روی یک اتصال (pipelining)
+
+        client = await AsyncLexClient.connect('/tmp/lex.sock')
+        results = await asyncio.gather(*(client.lex(code) for code in sources))
+        await client.close()
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting = {}              # id -> future
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    raise ConnectionError("server closed the connection")
+                response = json.loads(line)
+                future = self._waiting.pop(response.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if response.get('ok'):
+                    future.set_result(response.get('result'))
+                else:
+                    future.set_exception(ServerError(response.get('error', 'request failed')))
+        except Exception as e:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(e if isinstance(e, ConnectionError) else ConnectionError(e))
+            self._waiting.clear()
+
+    async def request(self, op, **params):
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = future
+        self._writer.write(encode_request(self._next_id, op, params))
+        await self._writer.drain()
+        return await future
+
+    async def lex(self, code, engine='regex', keywords=None):
+        params = {'code': code, 'engine': engine}
+        if keywords is not None:
+            params['keywords'] = sorted(keywords)
+        return await self.request('lex', **params)
+
+    async def first_follow(self, grammar, start=None, epsilon='ε', eof='$', solver='worklist', ll1=False):
+        return await self.request('first_follow', grammar=grammar, start=start, epsilon=epsilon, eof=eof,
+                                  solver=solver, ll1=ll1)
+
+    async def ping(self):
+        return await self.request('ping')
+
+    async def stats(self):
+        return await self.request('stats')
+
+    async def shutdown(self):
+        return await self.request('shutdown')
+
+    async def close(self):
+        self._receiver.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
@@ -0,0 +1,393 @@
+"""
+سرور محلی ماندگار برای لکس و FIRST/FOLLOW (asyncio) تا ابزارها برای هر درخواست
+یک پروسه ی تازه بالا نیارن و همه چیز را دوباره import نکنن:
+
+    python lex_server.py --unix /tmp/lex.sock
+    python lex_server.py --port 8765 --workers 4
+
+پروتکل (یک خط JSON برای هر درخواست و پاسخ) و کلاینت ها در lex_client.py هستن.
+درخواست های کوچک چند میلی ثانیه جمع میشن و با هم یک کار در process pool میشن؛
+درخواست های بزرگ تنها فرستاده میشن. پروسه های pool ماندگارن پس الگوهای کامپایل
+شده ی Lexer (Lexer._pattern_cache) برای هر پیکربندی گرم میمونن، و نتیجه ی تحلیل
+گرامرها در خود سرور (LRU) نگه داشته میشه
+"""
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from FirstandFollow import SOLVERS
+from lex_client import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE
+from lexer import ENGINES
+
+
+# ---------- کارهایی که در پروسه های pool اجرا میشن ----------
+
+def _warm_worker():
+    # الگوهای پیکربندی پیش فرض همان اول کامپایل میشن، نه در اولین درخواست
+    from lexer import Lexer
+    lexer = Lexer('')
+    lexer._master_pattern()
+    lexer._master_pattern(binary=True)
+
+
+def _lex(code, engine='regex', keywords=None):
+    from lexer import Lexer
+    from token_buffer import TOKEN_LABELS
+
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}")
+    lexer = Lexer(code, engine=engine)
+    if keywords is not None:
+        lexer.keywords = set(keywords)
+    tokens, table = lexer.tokenize()
+    return {
+        'tokens': [[tok_type, display[len(TOKEN_LABELS[tok_type]) + 1:-1], line]
+                   for display, line, tok_type in tokens],
+        'symbol_table': table,
+    }
+
+
+def _first_follow(grammar, start=None, epsilon='ε', eof='$', solver='worklist', ll1=False):
+    from FirstandFollow import GrammarAnalyzer
+    from grammar_loader import parse_grammar
+
+    if isinstance(grammar, str):
+        grammar = parse_grammar(grammar)
+    if not grammar:
+        raise ValueError("no productions found in the grammar")
+    start = start or next(iter(grammar))
+    if start not in grammar:
+        raise ValueError(f"start symbol {start!r} is not a nonterminal")
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}")
+
+    analyzer = GrammarAnalyzer(grammar, start, epsilon, eof, solver=solver)
+    analyzer.compute_follow_sets()
+    document = {
+        'start': start,
+        'first': {nt: sorted(analyzer.first[nt]) for nt in grammar},
+        'follow': {nt: sorted(analyzer.follow[nt]) for nt in grammar},
+    }
+    if ll1:
+        from ll1_table import LL1Table
+        table = LL1Table(analyzer)
+        document['ll1'] = {
+            'is_ll1': table.is_ll1,
+            'table': {nt: dict(zip(table.grammar.terminals[1:], cells)) for nt, cells in table.rows()},
+            'conflicts': table.describe_conflicts(),
+        }
+    return document
+
+
+JOBS = {'lex': _lex, 'first_follow': _first_follow}
+
+
+def _run_batch(jobs):
+    """[(op, params), ...] -> [(ok, نتیجه یا پیام خطا), ...] - خطای یک کار بقیه را خراب نمیکنه"""
+    results = []
+    for op, params in jobs:
+        try:
+            results.append((True, JOBS[op](**params)))
+        except ValueError as e:
+            results.append((False, str(e)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+# ---------- سرور ----------
+
+class LexServer:
+    """
+    workers: تعداد پروسه های pool (None = تعداد CPU ها، 0 = اجرا در thread های همین پروسه).
+    درخواستی که متنش از small_size کوچکتره تا batch_delay ثانیه یا تا batch_size
+    درخواست منتظر میمونه و بعد همه با هم به pool میرن
+    """
+
+    def __init__(self, workers=None, batch_size=64, batch_delay=0.002, small_size=16 * 1024,
+                 cache_size=256):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pool = self._new_pool()
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.small_size = small_size
+        self.cache_size = cache_size
+        self.grammars = OrderedDict()       # کلید درخواست -> نتیجه ی first_follow
+        self.counters = Counter()
+        self._pending = []                  # [(job, future), ...]
+        self._timer = None
+        self._stopped = None
+        self._clients = {}                  # task اتصال -> writer
+
+    # --- زمانبندی کارها ---
+
+    def _new_pool(self):
+        if self.workers == 0:
+            return None
+        return ProcessPoolExecutor(self.workers, initializer=_warm_worker)
+
+    def _replace_pool(self, broken):
+        # pool ی که پروسه ای از آن مرده (مثلا kill یا کمبود حافظه) دیگر کاری قبول نمیکنه
+        if broken is self.pool:
+            self.counters['pool_restarts'] += 1
+            self.pool = self._new_pool()
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, jobs):
+        """
+        future لیست (ok, مقدار) برای jobs که هیچ وقت خطا نمیده: اگر خود pool خراب
+        بشه همه ی کارها پاسخ خطا میگیرن و pool تازه ای ساخته میشه؛ بعد از بسته شدن
+        pool (توقف سرور) هم پاسخ خطا برمیگرده
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        results = loop.create_future()
+        try:
+            try:
+                done = loop.run_in_executor(pool, _run_batch, jobs)
+            except BrokenProcessPool:       # یک پروسه بین دو درخواست مرده بود
+                self._replace_pool(pool)
+                pool = self.pool
+                done = loop.run_in_executor(pool, _run_batch, jobs)
+        except RuntimeError as e:           # pool بسته شده (سرور در حال توقف)
+            results.set_result([(False, f"server is shutting down: {e}")] * len(jobs))
+            return results
+
+        def deliver(done):
+            if results.done():
+                return
+            if done.cancelled():
+                results.set_result([(False, "worker job was cancelled")] * len(jobs))
+            elif done.exception() is not None:
+                error = done.exception()
+                if isinstance(error, BrokenProcessPool):
+                    self._replace_pool(pool)
+                results.set_result([(False, f"worker failed: {type(error).__name__}: {error}")] * len(jobs))
+            else:
+                results.set_result(done.result())
+        done.add_done_callback(deliver)
+        return results
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.counters['batches'] += 1
+        self.counters['batched_requests'] += len(batch)
+        done = self._execute([job for job, _ in batch])
+
+        def deliver(done):
+            for (_, future), result in zip(batch, done.result()):
+                if not future.done():
+                    future.set_result(result)
+        done.add_done_callback(deliver)
+
+    async def _submit(self, op, params, size):
+        loop = asyncio.get_running_loop()
+        if size > self.small_size or self.batch_size == 1:
+            self.counters['single_requests'] += 1
+            ok, value = (await self._execute([(op, params)]))[0]
+        else:
+            future = loop.create_future()
+            self._pending.append(((op, params), future))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.batch_delay, self._flush)
+            ok, value = await future
+        if not ok:
+            raise ValueError(value)
+        return value
+
+    # --- عملیات ---
+
+    async def _op_lex(self, params):
+        code = params.get('code')
+        if not isinstance(code, str):
+            raise ValueError("lex needs a 'code' string")
+        return await self._submit('lex', params, len(code))
+
+    async def _op_first_follow(self, params):
+        grammar = params.get('grammar')
+        if not isinstance(grammar, (str, dict)):
+            raise ValueError("first_follow needs a 'grammar' text or object")
+        key = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        document = self.grammars.get(key)
+        if document is not None:
+            self.counters['grammar_hits'] += 1
+            self.grammars.move_to_end(key)
+            return document
+        self.counters['grammar_misses'] += 1
+        document = await self._submit('first_follow', params, len(key))
+        self.grammars[key] = document
+        if len(self.grammars) > self.cache_size:
+            self.grammars.popitem(last=False)
+        return document
+
+    async def _op_ping(self, params):
+        return 'pong'
+
+    async def _op_stats(self, params):
+        return dict(self.counters, cached_grammars=len(self.grammars), workers=self.workers)
+
+    async def _op_shutdown(self, params):
+        self._stopped.set()
+        return 'bye'
+
+    async def answer(self, request):
+        """dict درخواست -> dict پاسخ"""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            op = request.get('op')
+            handler = getattr(self, f'_op_{op}', None) if isinstance(op, str) else None
+            if handler is None:
+                raise ValueError(f"unknown op {op!r}")
+            params = {k: v for k, v in request.items() if k not in ('id', 'op')}
+            self.counters['requests'] += 1
+            return {'id': request_id, 'ok': True, 'result': await handler(params)}
+        except ValueError as e:
+            self.counters['errors'] += 1
+            return {'id': request_id, 'ok': False, 'error': str(e)}
+        except Exception as e:          # هر درخواستی باید پاسخ بگیره وگرنه کلاینت تا ابد منتظر میمونه
+            self.counters['errors'] += 1
+            return {'id': request_id, 'ok': False, 'error': f"internal error: {type(e).__name__}: {e}"}
+
+    # --- اتصال ها ---
+
+    async def _respond(self, line, writer, lock):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {'id': None, 'ok': False, 'error': f"invalid JSON: {e}"}
+        else:
+            response = await self.answer(request)
+        await self._write(response, writer, lock)
+
+    @staticmethod
+    async def _write(response, writer, lock):
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+        async with lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        # درخواست های یک اتصال همزمان جواب داده میشن؛ ترتیب پاسخ ها با id مشخص میشه
+        lock = asyncio.Lock()
+        tasks = set()
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:      # خط بلندتر از MAX_LINE: پاسخ خطا و بستن اتصال
+                    self.counters['errors'] += 1
+                    try:
+                        await self._write({'id': None, 'ok': False,
+                                           'error': f"request is longer than {MAX_LINE} bytes"}, writer, lock)
+                    except ConnectionError:
+                        pass
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            del self._clients[asyncio.current_task()]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def serve(self, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """تا درخواست shutdown (یا Ctrl+C) اجرا میشه؛ ready(address) بعد از باز شدن سوکت صدا زده میشه"""
+        self._stopped = asyncio.Event()
+        if path is not None:
+            self._remove_socket(path)
+            server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_LINE)
+            address = path
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+            address = '%s:%d' % server.sockets[0].getsockname()[:2]
+        try:
+            async with server:
+                if ready is not None:
+                    ready(address)
+                await self._stopped.wait()
+                # اتصال های باز بسته میشن تا پاسخ های در راه نوشته بشن و handler ها تمام بشن
+                handlers = list(self._clients)
+                for writer in self._clients.values():
+                    writer.transport.close()
+                await asyncio.gather(*handlers, return_exceptions=True)
+        finally:
+            self.close()
+            if path is not None:
+                self._remove_socket(path)
+
+    @staticmethod
+    def _remove_socket(path):
+        # فقط سوکت قبلی پاک میشه؛ اشتباه تایپی در --unix نباید یک فایل معمولی را پاک کنه
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        os.unlink(path)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='lex_server.py', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--unix', metavar='PATH', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port (0 picks a free one)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count, 0: in-process)')
+    parser.add_argument('--batch-size', type=int, default=64, help='small requests per batch (1 disables batching)')
+    parser.add_argument('--batch-delay', type=float, default=2.0, help='milliseconds to wait for a batch to fill')
+    parser.add_argument('--small', type=int, default=16 * 1024,
+                        help='requests up to this many characters are batched')
+    parser.add_argument('--cache-size', type=int, default=256, help='analyzed grammars kept in memory')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = LexServer(args.workers, args.batch_size, args.batch_delay / 1000, args.small, args.cache_size)
+
+    def ready(address):
+        print(f"listening on {address}", flush=True)
+
+    try:
+        asyncio.run(server.serve(args.unix, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"lex_server.py: error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
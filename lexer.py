@@ -1,10 +1,80 @@
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from line_index import LineIndex
+from token_buffer import TOKEN_LABELS, TYPE_CODES, TokenBuffer
+
+
+# موتورهای پیمایش قابل انتخاب:
+#   char  : پیمایش کاراکتر به کاراکتر (پیاده سازی مرجع)
+#   regex : یک الگوی ترکیبی (master pattern) برای همه ی قوانین
+#   numpy : همان قوانین char ولی با پرش از run به run (کلاس کاراکترها با numpy)؛
+#           اگر numpy نصب نباشه همان char اجرا میشه
+ENGINES = ('char', 'regex', 'numpy')
+
+
+def _char_class(chars):
+    # مجموعه ی خالی در regex معنی ندارد - None یعنی این قانون حذف شود
+    if not chars:
+        return None
+    return '[' + ''.join(re.escape(c) for c in sorted(chars)) + ']'
+
+
+def _byte_literal(text):
+    # متن به صورت بایت های utf-8 برای الگوی bytes - خود الگو ASCII میمونه
+    return ''.join(re.escape(c) if c < '\x80' else ''.join(f'\\x{b:02x}' for b in c.encode('utf-8'))
+                   for c in text)
+
+
+def _byte_class(chars):
+    # مثل _char_class برای ورودی bytes: کاراکتر غیر ASCII چند بایت است و شاخه ی جدا میگیره
+    if not chars:
+        return None
+    branches = [_byte_literal(c) for c in sorted(chars) if c >= '\x80']
+    ascii_chars = [c for c in chars if c < '\x80']
+    if ascii_chars:
+        branches.insert(0, _char_class(ascii_chars))
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+
+# خطای لغوی در ورودی bytes: یک کاراکتر کامل utf-8، یا تک بایت نامعتبر
+_BYTE_ERROR = r'[\x00-\x7f]|[\xc2-\xdf][\x80-\xbf]|[\xe0-\xef][\x80-\xbf]{2}|[\xf0-\xf4][\x80-\xbf]{3}|.'
+
+_NEWLINE_BYTES = re.compile(b'\n')
+
+
+def map_file(path):
+    """
+    نگاشت فقط خواندنی فایل (mmap) برای ورودی بدون کپی Lexer.
+    فایل خالی را نمیشه map کرد و برای آن b'' برمیگرده
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 class Lexer:
+
+    # الگوهای کامپایل شده به ازای هر پیکربندی - بین نمونه ها مشترک است
+    _pattern_cache = {}
     
-    def __init__(self, code: str):
-        self.code = code                # متن کامل فایل ورودی
+    def __init__(self, code: str = '', engine: str = 'char'):
+        if engine not in ENGINES:
+            raise ValueError(f"unknown lexer engine {engine!r}, expected one of {ENGINES}")
+        self.engine = engine
+        if isinstance(code, memoryview):
+            code = code.cast('B')
+        # متن کامل فایل ورودی: str، یا bytes/mmap/memoryview (utf-8) برای فایل های خیلی بزرگ.
+        # ورودی bytes همیشه با الگوی ترکیبی پیمایش میشه و مکان توکن ها بر حسب بایت است
+        self.code = code
         self.pos = 0                    # موقعیت فعلی پیمایش در ورودی
         self.len = len(code)            # طول کل کد
-        self.line = 1                   # شماره خط فعلی - استفاده شده در جدول توکن‌ها
+        self.line = 1                   # شماره خط اول متن در حال پیمایش (بعد از آن: خط آخر)
+        self.line_index = None          # شروع خط ها (LineIndex) - شماره خط توکن ها از اینجاست
         self.symbol_table = {}          # جدول شناسه‌ها برای ذخیره متغیرها
 
         
@@ -29,6 +99,17 @@ class Lexer:
         # لیست نهایی توکن‌ها که توسط لکسر پر میشخ
         self._tokens = []
 
+        # تابع گزارش پیشرفت (اختیاری) - با تعداد کاراکترهای پیمایش شده صدا زده میشه
+        self.progress = None
+        self.progress_step = 1 << 16
+
+        # آمار اجرا (اختیاری) - یک instrumentation.LexerStats؛ با None هیچ هزینه ای نداره
+        self.stats = None
+
+    @classmethod
+    def from_file(cls, path, engine='regex'):
+        """لکسر روی نگاشت فایل (map_file) - متن فایل در حافظه کپی نمیشه"""
+        return cls(map_file(path), engine)
 
 
     def _peek(self, offset=0): # offset = فاصله از شروع کاراکتر
@@ -40,15 +121,10 @@ class Lexer:
 
     def _advance(self, n=1):
         """
-        جلو بردن پوینتر 
+        جلو بردن پوینتر - شماره خط اینجا شمرده نمیشه، از line_index به دست میاد
         """
-        for _ in range(n):
-            if self.pos >= self.len:
-                return
-            ch = self.code[self.pos]
-            self.pos += 1
-            if ch == '\n':
-                self.line += 1 # آپدیت شماره خط
+        pos = self.pos + n
+        self.pos = pos if pos < self.len else self.len
 
     def _add_token(self, text, tok_type, line):
         self._tokens.append((text, line, tok_type))
@@ -132,17 +208,307 @@ class Lexer:
 
 
 
+    #----> موتور regex : همه ی قوانین بالا در یک الگوی واحد
+
+    def _config_key(self):
+        return (
+            frozenset(self.keywords), frozenset(self._digits),
+            frozenset(self._ident_start), frozenset(self._ident_part),
+            frozenset(self._whitespace), frozenset(self._single_ops),
+            frozenset(self._assign_op), frozenset(self._delimiters),
+            frozenset(self._relops_two_char), frozenset(self._relops_one_char),
+        )
+
+    def _master_pattern(self, binary=False):
+        """
+        ساخت الگوی ترکیبی از روی مجموعه های همین نمونه.
+        ترتیب شاخه ها دقیقا همان ترتیب بررسی در tokenize است.
+        با binary=True الگو روی bytes (utf-8) کار میکنه
+        """
+        key = self._config_key() + (binary,)
+        pattern = Lexer._pattern_cache.get(key)
+        if pattern is not None:
+            return pattern
+
+        char_class, literal = (_byte_class, _byte_literal) if binary else (_char_class, re.escape)
+        ws = char_class(self._whitespace)
+        ident_start = char_class(self._ident_start)
+        ident_part = char_class(self._ident_part)
+        digit = char_class(self._digits) or '(?!)'
+        relops = [literal(op) for op in sorted(self._relops_two_char)]
+        relops.append(char_class(self._relops_one_char))
+
+        rules = [
+            ('ws', ws and ws + '+'),
+            ('comment', r'//[^\n]*|\#[^\n]*'),
+            ('word', ident_start and ident_start + (ident_part + '*' if ident_part else '')),
+            # اگر بعد از e رقمی نیاید کل متن خطای لغوی است (در _scan_spans بررسی میشه)
+            ('number', rf'(?:{digit}+(?:\.{digit}+)?|\.{digit}+)(?:[eE][+\-]?{digit}*)?'),
+            ('relop', '|'.join(rx for rx in relops if rx)),
+            ('op', char_class(self._assign_op | self._single_ops)),
+            ('delimiter', char_class(self._delimiters)),
+            ('error', _BYTE_ERROR if binary else '.'),
+        ]
+        source = '|'.join(f'(?P<{name}>{rx})' for name, rx in rules if rx)
+        pattern = re.compile(source.encode('ascii') if binary else source, re.DOTALL)
+        Lexer._pattern_cache[key] = pattern
+        return pattern
+
+    def _progress_blocks(self, code):
+        """
+        محدوده های (pos, endpos) برای پیمایش. اگر progress تنظیم شده باشه
+        ورودی در بلوک های هم مرز با '\n' پیمایش میشه و بعد از هر بلوک
+        تعداد کاراکترهای پیمایش شده گزارش میشه؛ وگرنه کل ورودی یک بلوک است
+        """
+        progress = self.progress
+        if progress is None:
+            yield 0, len(code)
+            return
+        if isinstance(code, str):
+            find = code.find
+        else:
+            # memoryview متد find نداره
+            def find(_, pos):
+                m = _NEWLINE_BYTES.search(code, pos)
+                return m.start() if m else -1
+        pos = 0
+        while pos < len(code):
+            endpos = find('\n', pos + self.progress_step) + 1 or len(code)
+            yield pos, endpos
+            pos = endpos
+            progress(pos)
+
+    def _scan_spans(self, code, line=1, index=None):
+        """
+        پیمایش code با الگوی ترکیبی.
+        خروجی: (نوع, شروع, پایان, شماره خط) برای هر توکن - جدول شناسه ها هم همینجا پر میشه.
+        شماره خط با جستجوی دودویی در index (شروع خط های code از خط line) پیدا میشه
+        """
+        if index is None:
+            index = LineIndex(code, line)
+        # توکن ها به ترتیب اند: فقط وقتی توکن به خط بعدی رسید جستجو لازمه
+        line_starts, base = index.starts, index.first_line - 1
+        k = 1
+        next_start = line_starts[1] if len(line_starts) > 1 else len(code) + 1
+        keywords = self.keywords
+        symbol_table = self.symbol_table
+        binary = not isinstance(code, str)
+        if binary:
+            # مقایسه ها روی bytes؛ جدول شناسه ها در پایان به str برمیگرده
+            keywords = {word.encode('utf-8') for word in keywords}
+            symbol_table = {name.encode('utf-8'): index for name, index in symbol_table.items()}
+            exponent = b'eE+-'
+        else:
+            exponent = 'eE+-'
+        finditer = self._master_pattern(binary).finditer
+        if self.stats is not None:
+            finditer = self.stats.matches(finditer)
+        for pos, endpos in self._progress_blocks(code):
+            for m in finditer(code, pos, endpos):
+                kind = m.lastgroup
+                if kind == 'ws':
+                    continue
+                start, end = m.span()
+                if kind == 'word':
+                    value = m.group()
+                    if value in keywords:
+                        kind = 'keyword'
+                    else:
+                        kind = 'id'
+                        if value not in symbol_table:
+                            symbol_table[value] = len(symbol_table) + 1
+                elif kind == 'number':
+                    if code[end - 1] in exponent:
+                        kind = 'error'
+                if start >= next_start:
+                    k = bisect_right(line_starts, start, k)
+                    next_start = line_starts[k] if k < len(line_starts) else len(code) + 1
+                yield kind, start, end, base + k
+        self.line = index.last_line
+        if binary:
+            self.symbol_table = {str(name, 'utf-8'): i for name, i in symbol_table.items()}
+
+    def _tokenize_regex(self):
+        code = self.code
+        append = self._tokens.append
+        spans = self._scan_spans(code, self.line, self.line_index)
+        if isinstance(code, str):
+            for kind, start, end, line in spans:
+                append((f"{TOKEN_LABELS[kind]}({code[start:end]})", line, kind))
+        else:
+            for kind, start, end, line in spans:
+                append((f"{TOKEN_LABELS[kind]}({str(code[start:end], 'utf-8', 'replace')})", line, kind))
+        self.pos = self.len
+
+
+    def _scan_columns(self, code, line=1, base=0, index=None):
+        # ستون های TokenBuffer برای code - مکان ها با base جابجا میشن.
+        # مکان ها uint32 هستن مگر برای ورودی های بزرگتر از 4GB
+        offset = 'I' if base + len(code) < 1 << 32 else 'Q'
+        types, starts, ends, lines = array('B'), array(offset), array(offset), array('I')
+        add_type, add_start = types.append, starts.append
+        add_end, add_line = ends.append, lines.append
+        for kind, start, end, tok_line in self._scan_spans(code, line, index):
+            add_type(TYPE_CODES[kind])
+            add_start(start + base)
+            add_end(end + base)
+            add_line(tok_line)
+        return types, starts, ends, lines
+
+    def tokenize_buffer(self):
+        """
+        مثل tokenize ولی خروجی یک TokenBuffer فشرده است (متن توکن ها ساخته نمیشه).
+        چون مکان شروع و پایان هر توکن لازمه، همیشه از الگوی ترکیبی استفاده میشه
+        """
+        self.pos = 0
+        self.line = 1
+        self.symbol_table = {}
+
+        self.line_index = LineIndex(self.code)
+        buffer = TokenBuffer(self.code)
+        if self.stats is None:
+            buffer.types, buffer.starts, buffer.ends, buffer.lines = self._scan_columns(
+                self.code, index=self.line_index)
+        else:
+            self.stats.start(self)
+            try:
+                buffer.types, buffer.starts, buffer.ends, buffer.lines = self._scan_columns(
+                    self.code, index=self.line_index)
+            finally:
+                self.stats.stop(self, buffer)
+        buffer.line_index = self.line_index
+        self.pos = self.len
+        return buffer, self.symbol_table
+
+    def iter_spans(self):
+        """
+        توکن ها به صورت (نوع, شروع, پایان, شماره خط) بدون ساختن متن یا ستون ها.
+        برای ورودی های خیلی بزرگ (مثلا Lexer.from_file) که حتی ستون های TokenBuffer
+        چند برابر خود فایل میشن؛ متن هر توکن را میشه بعدا از self.code برید
+        """
+        self.pos = 0
+        self.line = 1
+        self.symbol_table = {}
+        self.line_index = LineIndex(self.code)
+        yield from self._scan_spans(self.code, index=self.line_index)
+        self.pos = self.len
+
+    def relex(self, buffer, offset, deleted, inserted):
+        """
+        به روزرسانی افزایشی buffer (خروجی tokenize_buffer) بعد از یک ویرایش:
+        deleted کاراکتر از offset حذف و inserted به جایش درج شده.
+
+        چون هیچ توکنی از '\n' عبور نمیکنه فقط خط های ویرایش شده دوباره پیمایش میشن،
+        بقیه ی توکن ها فقط مکان و شماره خطشون جابجا میشه.
+        خروجی: (first, removed, added, line_delta) یعنی توکن های first تا first+removed
+        با added توکن جدید جایگزین شدن و شماره خط توکن های بعدی line_delta تغییر کرده
+        """
+        old = buffer.source
+        new = old[:offset] + inserted + old[offset + deleted:]
+        delta = len(inserted) - deleted
+        line_delta = inserted.count('\n') - old.count('\n', offset, offset + deleted)
+
+        # محدوده ی امن: از ابتدای خط شروع ویرایش تا انتهای خط پایان آن
+        region_start = old.rfind('\n', 0, offset) + 1
+        region_end = old.find('\n', offset + deleted)
+        if region_end == -1:
+            region_end = len(old)
+
+        starts, ends, types = buffer.starts, buffer.ends, buffer.types
+        first = bisect_left(starts, region_start)
+        stop = bisect_left(starts, region_end)
+        if first:
+            line = buffer.lines[first - 1] + old.count('\n', ends[first - 1], region_start)
+        else:
+            line = old.count('\n', 0, region_start) + 1
+
+        id_code = TYPE_CODES['id']
+        old_ids = [old[starts[k]:ends[k]] for k in range(first, stop) if types[k] == id_code]
+
+        symbol_table = self.symbol_table
+        self.symbol_table = {}
+        new_types, new_starts, new_ends, new_lines = self._scan_columns(
+            new[region_start:region_end + delta], line, region_start)
+        self.symbol_table = symbol_table
+
+        # جایگزینی توکن های محدوده و جابجایی توکن های بعد از آن
+        if delta:
+            new_starts.extend([start + delta for start in starts[stop:]])
+            new_ends.extend([end + delta for end in ends[stop:]])
+        else:
+            new_starts.extend(starts[stop:])
+            new_ends.extend(ends[stop:])
+        if line_delta:
+            new_lines.extend([line + line_delta for line in buffer.lines[stop:]])
+        else:
+            new_lines.extend(buffer.lines[stop:])
+        types[first:stop] = new_types
+        starts[first:] = new_starts
+        ends[first:] = new_ends
+        buffer.lines[first:] = new_lines
+        index = buffer._line_index
+        if index is not None and index.source is old:
+            index.edit(new, region_start, region_end, region_end + delta)
+        buffer.source = new
+        self.line_index = index
+
+        self.code = new
+        self.len = self.pos = len(new)
+
+        # جدول شناسه ها فقط وقتی عوض میشه که شناسه های محدوده تغییر کرده باشن
+        new_ids = [new[new_starts[k]:new_ends[k]] for k in range(len(new_types)) if new_types[k] == id_code]
+        if new_ids != old_ids:
+            self.symbol_table = buffer.symbol_table()
+        return first, stop - first, len(new_types), line_delta
+
+
     #----> بدنه اصلی کلاس برای پیمایش کل فایل
     
-    def tokenize(self):
+    def tokenize(self, first_line=1):
         
         # ریست کردن وضعیت اولیه برای استفاده های مجدد
+        # first_line: شماره خط اول متن (مثلا وقتی code تکه ای از یک فایل بزرگتر است)
         self._tokens = []
         self.pos = 0
-        self.line = 1
+        self.line = first_line
         self.symbol_table = {}
 
+        self._run_engine()
+        return self._tokens, self.symbol_table
+
+    def _run_engine(self):
+        # پیمایش self.code از ابتدا؛ self.line شماره ی خط اول آن است
+        self.line_index = LineIndex(self.code, self.line)
+        if self.stats is None:
+            self._scan_engine()
+            return
+        self.stats.start(self)
+        try:
+            self._scan_engine()
+        finally:
+            self.stats.stop(self)
+
+    def _scan_engine(self):
+        if self.engine == 'regex' or not isinstance(self.code, str):
+            self._tokenize_regex()
+        else:
+            if self.engine == 'numpy':
+                self._tokenize_numpy()
+            else:
+                self._tokenize_char()
+            self.line = self.line_index.last_line
+
+    def _tokenize_char(self):
+        line_starts = self.line_index.starts
+        line, k = self.line, 1
+        next_start = line_starts[1] if len(line_starts) > 1 else self.len + 1
+        progress = self.progress
+        next_report = self.pos + self.progress_step
         while not self._is_at_end():
+            if progress is not None and self.pos >= next_report:
+                progress(self.pos)
+                next_report = self.pos + self.progress_step
+
             ch = self._peek()
 
             # فضاهای خالی و خطوط جدید را رد می‌کنیم
@@ -153,7 +519,10 @@ class Lexer:
             """ اگر کاراکتر، فضای خالی نبود، قطعا شروع یک توکن است
             در نتیجه شماره خط فعلی را برای توکن جدید ذخیره می‌کنیم
             """
-            line = self.line 
+            if self.pos >= next_start:
+                k = bisect_right(line_starts, self.pos, k)
+                next_start = line_starts[k] if k < len(line_starts) else self.len + 1
+                line = self.line + k - 1
 
             # بررسی کامنت //
             if ch == '/' and self._peek(1) == '/':
@@ -212,9 +581,195 @@ class Lexer:
 
             # خطای لغوی
             self._add_token(f"lexical error({ch})", 'error', line)
-            self._advance() 
+            self._advance()
+
+
 
+    #----> موتور numpy : کلاس کاراکترها یکجا حساب میشه و پیمایش از run به run میپره
 
+    def _run_ends(self):
+        """
+        برای هر مکان، پایان run ی که در آن است (array) - یا None اگر numpy نصب نباشه.
+        run یعنی کاراکترهای پشت سر همی که عضویتشان در whitespace، ارقام، شروع و
+        ادامه ی شناسه یکی است؛ بقیه ی کاراکترها (عملگرها، خطاها، ...) هر کدام یک run اند
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        sets = (self._whitespace, self._digits, self._ident_start, self._ident_part)
+        if any(c >= '\x80' for chars in sets for c in chars):
+            return None                 # جدول فقط ASCII است - پیکربندی غیر ASCII با char
+
+        # جدول کلاس ها: 0 برای کاراکترهایی که در هیچ مجموعه ای نیستن (و همه ی غیر ASCII ها)
+        table = np.zeros(129, np.uint8)
+        classes = {}
+        for c in range(128):
+            key = tuple(chr(c) in chars for chars in sets)
+            if any(key):
+                table[c] = classes.setdefault(key, len(classes) + 1)
+
+        code = self.code
+        if code.isascii():
+            codes = np.frombuffer(code.encode('ascii'), np.uint8)
+        else:
+            # surrogatepass: surrogate تنها (مثلا از کلیپبورد خراب) مثل موتور char یک کاراکتر خطاست
+            codes = np.minimum(np.frombuffer(code.encode('utf-32-le', 'surrogatepass'), np.uint32), 128)
+        kinds = table[codes]
+
+        # مرز run ها: عوض شدن کلاس یا بعد از هر کاراکتر کلاس 0
+        change = (kinds[1:] != kinds[:-1]) | (kinds[:-1] == 0)
+        bounds = np.append(np.flatnonzero(change) + 1, len(code))
+        ends = np.repeat(bounds, np.diff(bounds, prepend=0))
+        typecode = 'I' if len(code) < 1 << 32 else 'Q'
+        run_ends = array(typecode)
+        run_ends.frombytes(ends.astype(np.dtype(typecode)).tobytes())
+        return run_ends
+
+    def _tokenize_numpy(self):
+        run_end = self._run_ends()
+        if run_end is None:
+            self._tokenize_char()
+            return
+
+        code, n = self.code, self.len
+        append = self._tokens.append
+        whitespace, digits = self._whitespace, self._digits
+        ident_start, ident_part = self._ident_start, self._ident_part
+        keywords, symbol_table = self.keywords, self.symbol_table
+        relops_two, relops_one = self._relops_two_char, self._relops_one_char
+        assign_op, single_ops, delimiters = self._assign_op, self._single_ops, self._delimiters
+
+        line_starts = self.line_index.starts
+        line, k = self.line, 1
+        next_start = line_starts[1] if len(line_starts) > 1 else n + 1
+        progress = self.progress
+        pos = self.pos
+        next_report = pos + self.progress_step
+        while pos < n:
+            if progress is not None and pos >= next_report:
+                progress(pos)
+                next_report = pos + self.progress_step
+
+            ch = code[pos]
+            if ch in whitespace:
+                pos = run_end[pos]
+                continue
+
+            if pos >= next_start:
+                k = bisect_right(line_starts, pos, k)
+                next_start = line_starts[k] if k < len(line_starts) else n + 1
+                line = self.line + k - 1
+
+            # کامنت ها تا '\n' (یا پایان متن)
+            if ch == '#' or (ch == '/' and code.startswith('/', pos + 1)):
+                end = code.find('\n', pos)
+                if end < 0:
+                    end = n
+                append((f"comment({code[pos:end]})", line, 'comment'))
+                pos = end
+                continue
+
+            if ch in ident_start:
+                end = pos + 1
+                while end < n and code[end] in ident_part:
+                    end = run_end[end]
+                value = code[pos:end]
+                if value in keywords:
+                    append((f"keyword({value})", line, 'keyword'))
+                else:
+                    if value not in symbol_table:
+                        symbol_table[value] = len(symbol_table) + 1
+                    append((f"id({value})", line, 'id'))
+                pos = end
+                continue
+
+            if ch in digits or (ch == '.' and pos + 1 < n and code[pos + 1] in digits):
+                # همان مراحل _consume_number: صحیح، اعشاری، نمایی
+                end = pos
+                while end < n and code[end] in digits:
+                    end = run_end[end]
+                if end + 1 < n and code[end] == '.' and code[end + 1] in digits:
+                    end += 1
+                    while end < n and code[end] in digits:
+                        end = run_end[end]
+                if end < n and code[end] in ('e', 'E'):
+                    end += 1
+                    if end < n and code[end] in ('+', '-'):
+                        end += 1
+                    if end >= n or code[end] not in digits:
+                        append((f"lexical error({code[pos:end]})", line, 'error'))
+                        pos = end
+                        continue
+                    while end < n and code[end] in digits:
+                        end = run_end[end]
+                append((f"num({code[pos:end]})", line, 'number'))
+                pos = end
+                continue
 
+            two_char = code[pos:pos + 2]
+            if two_char in relops_two:
+                append((f"relop({two_char})", line, 'relop'))
+                pos += 2
+            elif ch in relops_one:
+                append((f"relop({ch})", line, 'relop'))
+                pos += 1
+            elif ch in assign_op or ch in single_ops:
+                append((f"op({ch})", line, 'op'))
+                pos += 1
+            elif ch in delimiters:
+                append((f"delimiter({ch})", line, 'delimiter'))
+                pos += 1
+            else:
+                append((f"lexical error({ch})", line, 'error'))
+                pos += 1
+        self.pos = pos
+
+
+
+    #----> حالت جریانی (streaming) برای فایل های خیلی بزرگ
+
+    @staticmethod
+    def _iter_blocks(stream, chunk_size):
+        """
+        تقسیم ورودی به بلوک هایی که همیشه روی '\n' تمام میشن.
+        هیچ توکنی از '\n' عبور نمیکنه (کامنت ها قبل از آن تمام میشن و
+        اعداد و شناسه ها شاملش نیستن) پس هر بلوک مستقل قابل پیمایش است
+        """
+        if isinstance(stream, str):
+            chunks = (stream,)
+        elif hasattr(stream, 'read'):
+            chunks = iter(lambda: stream.read(chunk_size), '')
+        else:
+            chunks = iter(stream)
+
+        parts = []
+        for chunk in chunks:
+            cut = chunk.rfind('\n') + 1
+            if not cut:
+                parts.append(chunk)     # خط هنوز تمام نشده
+                continue
+            parts.append(chunk[:cut])
+            yield ''.join(parts)
+            parts = [chunk[cut:]]
+        rest = ''.join(parts)
+        if rest:
+            yield rest
+
+    def iter_tokens(self, stream, chunk_size=1 << 16):
+        """
+        نسخه ی تنبل (lazy) از tokenize:
+        stream میتونه فایل متنی باز شده یا هر iterable از رشته ها باشه.
+        توکن ها یکی یکی تولید میشن و شماره خط و جدول شناسه ها دقیقا مثل tokenize است
+        """
+        self.line = 1
+        self.symbol_table = {}
 
-        return self._tokens, self.symbol_table
\ No newline at end of file
+        for block in self._iter_blocks(stream, chunk_size):
+            self.code = block
+            self.len = len(block)
+            self.pos = 0
+            self._tokens = []
+            self._run_engine()
+            yield from self._tokens
+        self._tokens = []
@@ -37,7 +37,13 @@ except ImportError:
 
 
 
+from background import BackgroundJob
+from instrumentation import LexerStats
 from lexer import Lexer 
+from token_buffer import TOKEN_TYPES
+from token_cache import TokenCache
+from token_export import export_tokens
+from token_view import VirtualTable, first_row_at_line, rows_of_type, token_row
 
 TOKEN_COLORS = {
     'number': "#15b1c9",    
@@ -51,6 +57,37 @@ TOKEN_COLORS = {
     'error': "#e50000"       
 }
 
+# edits touching more characters than this (e.g. select all + paste) are
+# re-lexed in full on a background job instead of relexed on the UI thread
+RELEX_LIMIT = 1 << 16
+
+
+def _edit_between(old, new):
+    """
+    Single edit (offset, deleted, inserted) that turns old into new,
+    found by bisecting the common prefix and suffix.
+    """
+    limit = min(len(old), len(new))
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+
+    lo, hi = 0, limit - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    suffix = lo
+    return prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix]
+
+
 class LexerGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -61,6 +98,13 @@ class LexerGUI(ctk.CTk):
 
         self.tokens = []
         self.symbol_table = {}
+        self.symbols = []
+        self.lexer = None
+        self.job = None
+        try:
+            self.token_cache = TokenCache()     # unchanged files are loaded instead of re-lexed
+        except OSError:
+            self.token_cache = None
 
         # ---------- Input Text ----------
         self.code_text = ctk.CTkTextbox(self, height=220)
@@ -80,6 +124,22 @@ class LexerGUI(ctk.CTk):
         self.download_btn = ctk.CTkButton(btn_frame, text="Download Output", command=self.download_output)
         self.download_btn.pack(side="left", padx=5)
 
+        self.stats_btn = ctk.CTkButton(btn_frame, text="Stats", width=60, command=self.show_stats)
+        self.stats_btn.pack(side="left", padx=5)
+
+        self.status_label = ctk.CTkLabel(btn_frame, text="")
+        self.status_label.pack(side="left", padx=5)
+
+        self.goto_btn = ctk.CTkButton(btn_frame, text="Go", width=40, command=self.goto_line)
+        self.goto_btn.pack(side="right", padx=5)
+        self.line_entry = ctk.CTkEntry(btn_frame, width=70, placeholder_text="Line")
+        self.line_entry.pack(side="right", padx=5)
+        self.line_entry.bind("<Return>", lambda e: self.goto_line())
+
+        self.filter_menu = ctk.CTkOptionMenu(btn_frame, width=110, values=["all", *TOKEN_TYPES],
+                                             command=self.filter_tokens)
+        self.filter_menu.pack(side="right", padx=5)
+
         # ---------- Tokens Table ----------
         style = ttk.Style()
         style.theme_use('default')
@@ -90,22 +150,26 @@ class LexerGUI(ctk.CTk):
                         fieldbackground="#1f2937")
         style.configure("Treeview.Heading", font=("Consolas", 13, "bold"))
 
-        self.token_table = ttk.Treeview(self, columns=("No", "Token", "Line"), show='headings', height=14)
+        self.token_view = VirtualTable(self, columns=("No", "Token", "Line", "Col"), height=14)
+        self.token_table = self.token_view.tree
         self.token_table.heading("No", text="#")
         self.token_table.heading("Token", text="Token")
         self.token_table.heading("Line", text="Line")
-        self.token_table.column("No", width=50, anchor="center")
-        self.token_table.column("Token", width=420)    
+        self.token_table.heading("Col", text="Col")
+        self.token_table.column("No", width=70, anchor="center")
+        self.token_table.column("Token", width=400)    
         self.token_table.column("Line", width=80, anchor="center")
-        self.token_table.pack(fill="both", padx=10, pady=5, expand=True)
+        self.token_table.column("Col", width=60, anchor="center")
+        self.token_view.pack(fill="both", padx=10, pady=5, expand=True)
 
         # ---------- Symbol Table ----------
-        self.sym_table = ttk.Treeview(self, columns=("Identifier", "Index"), show='headings', height=6)
+        self.sym_view = VirtualTable(self, columns=("Identifier", "Index"), height=6)
+        self.sym_table = self.sym_view.tree
         self.sym_table.heading("Identifier", text="Identifier")
         self.sym_table.heading("Index", text="Index")
         self.sym_table.column("Identifier", width=300)
         self.sym_table.column("Index", width=80, anchor="center")
-        self.sym_table.pack(fill="x", padx=10, pady=(0,10))
+        self.sym_view.pack(fill="x", padx=10, pady=(0,10))
 
         for ttype, color in TOKEN_COLORS.items():
             if ttype == 'error':
@@ -117,6 +181,8 @@ class LexerGUI(ctk.CTk):
     def upload_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("Python Files", "*.py"), ("Text Files", "*.txt")])
         if file_path:
+            if self.job is not None:
+                self.job.cancel()
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     code = f.read()
@@ -124,50 +190,160 @@ class LexerGUI(ctk.CTk):
                     self.code_text.insert("0.0", code)
                     self.tokens.clear()
                     self.symbol_table.clear()
+                    self.lexer = None
                     self.clear_tables()
             except Exception as e:
                 messagebox.showerror("Error", f"Could not read file: {e}")
 
     def clear_tables(self):
-        for row in self.token_table.get_children():
-            self.token_table.delete(row)
-        for row in self.sym_table.get_children():
-            self.sym_table.delete(row)
+        self.token_view.clear()
+        self.sym_view.clear()
 
     def analyze_code(self):
+        if self.job is not None:
+            self.job.cancel()       # the button reads "Cancel" while a job runs
+            return
         code = self.code_text.get("0.0", "end-1c")
         if not code.strip():
             messagebox.showwarning("Warning", "Please enter or upload code")
             return
 
-        lexer = Lexer(code)
-        self.tokens, self.symbol_table = lexer.tokenize()
-        self.clear_tables()
+        if self.lexer is not None and self.tokens:
+            if code == self.tokens.source:
+                return
+            offset, deleted, inserted = _edit_between(self.tokens.source, code)
+            if deleted + len(inserted) <= RELEX_LIMIT:
+                self.relex_code(offset, deleted, inserted)
+                return
+
+        def work(progress):
+            lexer = Lexer(code)
+            lexer.progress = progress
+            lexer.stats = LexerStats()
+            if self.token_cache is not None:
+                # copy=True: relex edits the buffer in place, so it needs real arrays
+                tokens, symbol_table = self.token_cache.tokenize(lexer, copy=True)
+            else:
+                tokens, symbol_table = lexer.tokenize_buffer()
+            lexer.progress = None
+            return lexer, tokens, symbol_table, list(symbol_table.items())
+
+        def show_progress(scanned):
+            self.status_label.configure(text=f"{scanned * 100 // len(code)}%  ({scanned:,} chars)")
+
+        self.analyze_btn.configure(text="Cancel")
+        self.job = BackgroundJob(self, work, self.analysis_done, on_progress=show_progress,
+                                 on_error=self.analysis_failed, on_cancel=self.analysis_cancelled).start()
 
-        for idx, (token, line, ttype) in enumerate(self.tokens, 1):
-            self.token_table.insert("", "end", values=(idx, token, line), tags=(ttype,))
+    def _job_finished(self, status=""):
+        self.job = None
+        self.analyze_btn.configure(text="Analyze Code")
+        self.status_label.configure(text=status)
 
-        for name, idx in self.symbol_table.items():
-            self.sym_table.insert("", "end", values=(name, idx))
+    def analysis_done(self, result):
+        self.lexer, self.tokens, self.symbol_table, self.symbols = result
+        status = f"{len(self.tokens):,} tokens"
+        if self.token_cache is not None:
+            stats = self.token_cache.stats()
+            status += f"  (cache: {stats['hits']} hits / {stats['misses']} misses)"
+        self._job_finished(status)
+        self.show_tokens()
+        self.show_symbols()
 
+    def analysis_failed(self, error):
+        self._job_finished()
+        messagebox.showerror("Error", f"Could not analyze code: {error}")
+
+    def analysis_cancelled(self):
+        self._job_finished("Cancelled")
+
+    def relex_code(self, offset, deleted, inserted):
+        # only the edited lines are re-scanned, the view just repaints its rows
+        self.lexer.relex(self.tokens, offset, deleted, inserted)
+        self.show_tokens(keep_position=True)
+
+        if self.lexer.symbol_table is not self.symbol_table:
+            self.symbol_table = self.lexer.symbol_table
+            self.symbols = list(self.symbol_table.items())
+            self.show_symbols()
+
+    def show_tokens(self, keep_position=False):
+        top = self.token_view.top
+        self.token_view.set_rows(len(self.tokens), token_row(self.tokens))
+        ttype = self.filter_menu.get()
+        if ttype != "all":
+            self.token_view.set_filter(rows_of_type(self.tokens, ttype))
+        if keep_position:
+            self.token_view.scroll_to(top)
+
+    def show_symbols(self):
+        symbols = self.symbols
+        self.sym_view.set_rows(len(symbols), lambda i: (symbols[i], ()))
+
+    def filter_tokens(self, ttype):
+        if self.tokens:
+            self.show_tokens()
+
+    def goto_line(self):
+        try:
+            line = int(self.line_entry.get())
+        except ValueError:
+            messagebox.showwarning("Warning", "Please enter a line number")
+            return
+        if self.tokens:
+            # the analysed text's line index, not a scan of the text widget
+            last = self.tokens.line_index.last_line
+            if not 1 <= line <= last:
+                messagebox.showwarning("Warning", f"Line must be between 1 and {last}")
+                return
+        self.code_text.see(f"{line}.0")
+        self.code_text.mark_set("insert", f"{line}.0")
+        if self.tokens:
+            self.token_view.show(first_row_at_line(self.tokens, line, self.token_view.rows))
 
     def download_output(self):
         if not self.tokens:
             messagebox.showwarning("Warning", "No tokens to save")
             return
 
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[
+            ("Text Files", "*.txt"), ("CSV Files", "*.csv"),
+            ("JSON Lines", "*.jsonl"), ("Binary Token Files", "*.tok")])
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    
-                    for idx, (token, line, ttype) in enumerate(self.tokens, 1):
-                        f.write(f"{token} [line:{line}]\n")
-                        
+                # the format follows the extension; the symbol table is written after the tokens
+                export_tokens(file_path, self.tokens, self.symbol_table)
                 messagebox.showinfo("Saved", f"Output saved to {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file: {e}")
 
+    def show_stats(self):
+        if self.lexer is None or self.lexer.stats is None:
+            messagebox.showwarning("Warning", "Analyze some code first")
+            return
+        stats = self.lexer.stats
+
+        window = ctk.CTkToplevel(self)
+        window.title("Lexer Statistics")
+        window.geometry("560x460")
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=".json",
+                                                filetypes=[("JSON Files", "*.json")])
+            if path:
+                try:
+                    stats.write_json(path)
+                except OSError as e:
+                    messagebox.showerror("Error", f"Could not save file: {e}", parent=window)
+
+        ctk.CTkButton(window, text="Export JSON", command=export).pack(fill="x", padx=10, pady=(10, 5))
+        report = ctk.CTkTextbox(window, font=("Consolas", 13))
+        report.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+        # a token cache hit loads the buffer without running the lexer
+        text = stats.format() if stats.runs else "Tokens were loaded from the token cache: nothing was lexed."
+        report.insert("0.0", text)
+        report.configure(state="disabled")
+
 # ---------- Run Application ----------
 if __name__ == "__main__":
     app = LexerGUI()
@@ -0,0 +1,98 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+_NEWLINE_BYTES = re.compile(b'\n')
+
+
+def line_starts(source):
+    """
+    مکان شروع همه ی خط ها در یک پیمایش (str، bytes، mmap یا memoryview).
+    به جای بررسی تک تک کاراکترها فقط '\\n' ها با find پیدا میشن
+    """
+    starts = array('I' if len(source) < 1 << 32 else 'Q', [0])
+    add = starts.append
+    if isinstance(source, memoryview):
+        # memoryview متد find نداره
+        for m in _NEWLINE_BYTES.finditer(source):
+            add(m.end())
+        return starts
+    find = source.find
+    newline = '\n' if isinstance(source, str) else b'\n'
+    i = find(newline)
+    while i != -1:
+        i += 1
+        add(i)
+        i = find(newline, i)
+    return starts
+
+
+class LineIndex:
+    """
+    فهرست شروع خط ها: مکان (offset) با جستجوی دودویی به (خط, ستون) تبدیل میشه.
+    یک بار برای هر متن ساخته میشه و لکسر، جدول توکن ها (پرش به خط) و گزارش خطا
+    همه از همین استفاده میکنن.
+
+    شماره ی خط و ستون از 1 شروع میشن؛ first_line شماره ی خط اول source است
+    (مثلا برای بلوک های حالت جریانی). برای ورودی bytes ستون بر حسب بایت است
+    """
+
+    def __init__(self, source, first_line=1):
+        self.source = source
+        self.first_line = first_line
+        self.starts = line_starts(source)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def last_line(self):
+        return self.first_line + len(self.starts) - 1
+
+    def line_of(self, offset):
+        return self.first_line + bisect_right(self.starts, offset) - 1
+
+    def position(self, offset):
+        """(خط, ستون) برای یک مکان"""
+        i = bisect_right(self.starts, offset) - 1
+        return self.first_line + i, offset - self.starts[i] + 1
+
+    def line_start(self, line):
+        """مکان شروع یک خط - خط خارج از محدوده IndexError میده"""
+        i = line - self.first_line
+        if not 0 <= i < len(self.starts):
+            raise IndexError(f"line {line} out of range {self.first_line}..{self.last_line}")
+        return self.starts[i]
+
+    def line_span(self, line):
+        """(شروع, پایان) یک خط بدون خود '\\n'"""
+        start = self.line_start(line)
+        i = line - self.first_line + 1
+        end = self.starts[i] - 1 if i < len(self.starts) else len(self.source)
+        return start, end
+
+    def edit(self, source, start, old_end, new_end):
+        """
+        به روزرسانی بعد از ویرایش: متن بین start و old_end با متنی که در source جدید
+        بین start و new_end است جایگزین شده. فقط همین محدوده دوباره پیمایش میشه و
+        شروع خط های بعدی جابجا میشن (مثل ستون های TokenBuffer در Lexer.relex)
+        """
+        starts = self.starts
+        first = bisect_right(starts, start)
+        stop = bisect_right(starts, old_end)
+        middle = array(starts.typecode, [start + s for s in line_starts(source[start:new_end])[1:]])
+        delta = new_end - old_end
+        if delta:
+            middle.extend([s + delta for s in starts[stop:]])
+        else:
+            middle.extend(starts[stop:])
+        starts[first:] = middle
+        self.source = source
+
+    def first_at_or_after(self, offsets, line, key=None):
+        """جایگاه اولین مکان (در فهرست مرتب offsets) که در خط line یا بعد از آن است"""
+        if line <= self.first_line:
+            return 0
+        if line > self.last_line:
+            return len(offsets)
+        return bisect_left(offsets, self.starts[line - self.first_line], key=key)
@@ -0,0 +1,151 @@
+from ll1_table import LL1Table
+from token_buffer import TOKEN_LABELS, TokenBuffer
+
+
+class ParseError(Exception):
+    def __init__(self, message, line=None, column=None):
+        if line is not None and column is not None:
+            message = f"line {line}, column {column}: {message}"
+        elif line is not None:
+            message = f"line {line}: {message}"
+        super().__init__(message)
+        self.line = line
+        self.column = column
+
+
+class ParseNode:
+    """گره ی درخت تجزیه - برگ ها متن و شماره خط توکن را دارند"""
+
+    __slots__ = ('symbol', 'children', 'text', 'line')
+
+    def __init__(self, symbol, text=None, line=None):
+        self.symbol = symbol
+        self.children = []
+        self.text = text
+        self.line = line
+
+    def walk(self):
+        """پیمایش پیش ترتیب بدون بازگشت: (عمق, گره)"""
+        stack = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
+            yield depth, node
+            for child in reversed(node.children):
+                stack.append((depth + 1, child))
+
+    def pretty(self):
+        lines = []
+        for depth, node in self.walk():
+            label = node.symbol if node.text is None else f"{node.symbol}({node.text})"
+            lines.append('  ' * depth + label)
+        return '\n'.join(lines)
+
+
+def token_terminal(text, tok_type):
+    """
+    نگاشت پیش فرض توکن لکسر به ترمینال گرامر:
+    شناسه -> id ، عدد -> num ، کلمه ی کلیدی و عملگر و جداکننده -> خود متن.
+    کامنت ها None برمیگردونن یعنی نادیده گرفته میشن
+    """
+    if tok_type == 'id':
+        return 'id'
+    if tok_type == 'number':
+        return 'num'
+    if tok_type == 'comment':
+        return None
+    return text
+
+
+def error_position(tokens, i, line):
+    """
+    (خط, ستون) توکن i برای پیام خطا. ستون فقط برای TokenBuffer معلومه
+    (از روی line_index آن) و برای بقیه ی ورودی ها None است
+    """
+    if isinstance(tokens, TokenBuffer) and i < len(tokens):
+        return tokens.position(i)
+    return line, None
+
+
+def terminal_stream(tokens, grammar, terminal_for=token_terminal):
+    """
+    (شماره ی ترمینال, متن, خط, شماره ی توکن) برای هر توکن و در پایان eof.
+    مشترک بین پارسرهای LL و LR
+    """
+    t_ids = grammar.t_ids
+    line = None
+    i = -1
+    for i, (display, line, tok_type) in enumerate(tokens):
+        text = display[len(TOKEN_LABELS[tok_type]) + 1:-1]
+        if tok_type == 'error':
+            raise ParseError(f"lexical error {text!r}", *error_position(tokens, i, line))
+        terminal = terminal_for(text, tok_type)
+        if terminal is None:
+            continue
+        t = t_ids.get(terminal)
+        if t is None or t < 2:      # ε و eof از ورودی قابل قبول نیستن
+            raise ParseError(f"unexpected token {text!r}", *error_position(tokens, i, line))
+        yield t, text, line, i
+    yield 1, grammar.eof, line, i + 1
+
+
+class LL1Parser:
+    """
+    پارسر پیش بینی غیربازگشتی با پشته ی صریح روی جدول LL(1).
+    توکن ها به صورت تنبل از هر iterable از (text, line, type) خوانده میشن -
+    مثلا Lexer.iter_tokens یا TokenBuffer - پس عمق درخت یا طول ورودی محدودیتی نداره
+    """
+
+    def __init__(self, table, terminal_for=token_terminal):
+        if not isinstance(table, LL1Table):
+            table = LL1Table(table)     # GrammarAnalyzer
+        self.table = table
+        self.grammar = table.grammar
+        self.terminal_for = terminal_for
+
+    def parse(self, tokens, build_tree=True):
+        """
+        تجزیه ی کامل ورودی. با build_tree=False فقط درستی بررسی میشه و
+        حافظه ی مصرفی به اندازه ی پشته است. خروجی: ریشه ی درخت یا تعداد توکن ها
+        """
+        g = self.grammar
+        table, width = self.table.table, self.table.width
+        rhs, names = g.rhs, g.nonterminals
+        start = self.table.start
+
+        stream = terminal_stream(tokens, g, self.terminal_for)
+        t, text, line, i = next(stream)
+        consumed = 0
+
+        root = ParseNode(names[start]) if build_tree else None
+        stack = [(~1, None), (start, root)]
+        while stack:
+            symbol, node = stack.pop()
+            if symbol < 0:
+                if ~symbol != t:
+                    raise ParseError(f"expected {g.terminals[~symbol]!r}, got {text!r}",
+                                     *error_position(tokens, i, line))
+                if node is not None:
+                    node.text, node.line = text, line
+                if t == 1:
+                    break
+                consumed += 1
+                t, text, line, i = next(stream)
+                continue
+
+            p = table[symbol * width + t]
+            if p < 0:
+                raise ParseError(f"unexpected {text!r} while parsing {names[symbol]}",
+                                 *error_position(tokens, i, line))
+            production = rhs[p]
+            if node is None:
+                for child in reversed(production):
+                    if child != ~0:
+                        stack.append((child, None))
+                continue
+            children = [ParseNode(g.name(child)) for child in production]
+            node.children = children
+            for child, child_node in zip(reversed(production), reversed(children)):
+                if child != ~0:
+                    stack.append((child, child_node))
+
+        return root if build_tree else consumed
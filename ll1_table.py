@@ -0,0 +1,92 @@
+from array import array
+
+
+class LL1Table:
+    """
+    جدول پیش بینی LL(1) روی خروجی GrammarAnalyzer.
+
+    جدول یک آرایه ی تخت array('i') است:
+        table[A * width + t] = شماره ی قانون (در CompiledGrammar) یا -1
+    که A شماره ی نان ترمینال و t شماره ی ترمینال است؛ پس هر قدم پارسر یک دسترسی O(1) است.
+    همه ی تداخل ها (FIRST/FIRST و FIRST/FOLLOW) در همان یک دور ساخت جمع میشن
+    """
+
+    EMPTY = -1
+
+    def __init__(self, analyzer):
+        if not hasattr(analyzer, 'suffix_first') or not hasattr(analyzer, '_follow'):
+            analyzer.compute_follow_sets()
+
+        g = analyzer.compiled
+        self.grammar = g
+        self.start = g.nt_ids[analyzer.start]
+        self.width = len(g.terminals)
+        self.table = array('i', [self.EMPTY]) * (len(g.nonterminals) * self.width)
+        self.conflicts = []     # (نوع, نان ترمینال, ترمینال, قانون موجود, قانون جدید)
+
+        table, width = self.table, self.width
+        firsts = [set(analyzer.terminal_ids(suffix[0])) for suffix in analyzer.suffix_first]
+        for p, first_p in enumerate(firsts):
+            A = g.lhs[p]
+            lookaheads = first_p - {0}
+            if 0 in first_p:    # قانون تهی‌پذیر: FOLLOW(A) هم پیش بینی میکنه
+                lookaheads.update(analyzer.terminal_ids(analyzer._follow[A]))
+
+            for t in sorted(lookaheads):
+                cell = A * width + t
+                q = table[cell]
+                if q == self.EMPTY:
+                    table[cell] = p
+                elif q != p:
+                    kind = 'FIRST/FIRST' if t in firsts[q] and t in first_p else 'FIRST/FOLLOW'
+                    self.conflicts.append((kind, g.nonterminals[A], g.terminals[t], q, p))
+
+    @classmethod
+    def restore(cls, analyzer, table, conflicts):
+        """جدول ذخیره شده (bytes جدول و فهرست تداخل ها) بدون ساخت دوباره"""
+        self = cls.__new__(cls)
+        g = analyzer.compiled
+        self.grammar = g
+        self.start = g.nt_ids[analyzer.start]
+        self.width = len(g.terminals)
+        self.table = array('i')
+        self.table.frombytes(table)
+        self.conflicts = [tuple(conflict) for conflict in conflicts]
+        return self
+
+    @property
+    def is_ll1(self):
+        return not self.conflicts
+
+    @property
+    def nbytes(self):
+        return self.table.itemsize * len(self.table)
+
+    def predict(self, A, t):
+        """قانون پیش بینی شده برای نان ترمینال A و ترمینال t (هر دو شماره) یا -1"""
+        return self.table[A * self.width + t]
+
+    def entry(self, nonterminal, terminal):
+        """مثل predict ولی با نام نمادها"""
+        g = self.grammar
+        t = g.t_ids.get(terminal)
+        if t is None:
+            return self.EMPTY
+        return self.predict(g.nt_ids[nonterminal], t)
+
+    def rows(self):
+        """
+        برای نمایش: (نان ترمینال, [متن قانون یا '' برای هر ترمینال به جز ε])
+        """
+        g = self.grammar
+        for A, nonterminal in enumerate(g.nonterminals):
+            cells = []
+            for t in range(1, self.width):
+                p = self.predict(A, t)
+                cells.append('' if p == self.EMPTY else g.rule_text(p))
+            yield nonterminal, cells
+
+    def describe_conflicts(self):
+        g = self.grammar
+        return [f"{kind} conflict at [{A}, {t}]: {g.rule_text(q)}  |  {g.rule_text(p)}"
+                for kind, A, t, q, p in self.conflicts]
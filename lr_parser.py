@@ -0,0 +1,63 @@
+from ll1_parser import ParseError, ParseNode, error_position, terminal_stream, token_terminal
+from lr_table import LRTable
+
+
+class LRParser:
+    """
+    پارسر shift-reduce جدول محور روی جدول های فشرده ی LRTable.
+    مثل LL1Parser توکن ها به صورت تنبل از هر iterable از (text, line, type)
+    خوانده میشن و با build_tree=False فقط درستی ورودی بررسی میشه
+    """
+
+    def __init__(self, table, terminal_for=token_terminal):
+        if not isinstance(table, LRTable):
+            table = LRTable(table)      # GrammarAnalyzer
+        self.table = table
+        self.grammar = table.grammar
+        self.terminal_for = terminal_for
+
+    def parse(self, tokens, build_tree=True):
+        """خروجی: ریشه ی درخت (نان ترمینال شروع) یا تعداد توکن ها"""
+        g, lr = self.grammar, self.table
+        a_base, a_check, a_value = lr.action_base, lr.action_check, lr.action_value
+        g_base, g_value = lr.goto_base, lr.goto_value
+        default, lengths, lhs = lr.default, lr.lengths, lr.lhs
+        accept = -(lr.automaton.accept + 1)
+        names = g.nonterminals
+
+        stream = terminal_stream(tokens, g, self.terminal_for)
+        t, text, line, k = next(stream)
+        consumed = 0
+
+        states = [0]
+        nodes = []
+        while True:
+            s = states[-1]
+            i = a_base[s] + t
+            action = a_value[i] if a_check[i] == t else default[s]
+
+            if action > 0:
+                states.append(action - 1)
+                if build_tree:
+                    nodes.append(ParseNode(g.terminals[t], text, line))
+                consumed += 1
+                t, text, line, k = next(stream)
+            elif action < 0:
+                if action == accept:
+                    return nodes[0] if build_tree else consumed
+                p = -action - 1
+                n = lengths[p]
+                if n:
+                    del states[-n:]
+                A = lhs[p]
+                if build_tree:
+                    node = ParseNode(names[A])
+                    if n:
+                        node.children = nodes[-n:]
+                        del nodes[-n:]
+                    else:
+                        node.children = [ParseNode(g.epsilon)]
+                    nodes.append(node)
+                states.append(g_value[g_base[states[-1]] + A])
+            else:
+                raise ParseError(f"unexpected {text!r}", *error_position(tokens, k, line))
@@ -0,0 +1,371 @@
+from array import array
+
+from FirstandFollow import _strongly_connected_components
+
+
+# روش های محاسبه ی lookahead:
+#   slr  : FOLLOW نان ترمینال سمت چپ (همان GrammarAnalyzer.follow)
+#   lalr : روش DeRemer–Pennello روی خود اتوماتای LR(0) (بدون ساخت LR(1) کامل)
+METHODS = ('slr', 'lalr')
+
+
+def _bits(value):
+    # شماره ی بیت های یک عدد صحیح
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def _digraph(relation, initial):
+    """
+    F(x) = initial(x) ∪ F(y)  برای همه ی  x R y
+    مولفه های قویا همبند به ترتیبی برمیگردن که هر مولفه بعد از مقصدهایش است،
+    پس هر مولفه فقط یک بار و با مقدار نهایی همسایه هایش حساب میشه
+    """
+    F = list(initial)
+    for component in _strongly_connected_components(range(len(F)), relation):
+        value = 0
+        for x in component:
+            value |= F[x]
+            for y in relation[x]:
+                value |= F[y]
+        for x in component:
+            F[x] = value
+    return F
+
+
+_PACK_ATTEMPTS = 256
+
+
+def _pack(rows, width):
+    """
+    فشرده سازی جدول خلوت به روش row displacement:
+        مقدار سطر s و ستون c در value[base[s] + c] است اگر check[base[s] + c] == c
+    چون check ستون را نگه میداره، سطرهای یکسان یک base مشترک میگیرن و سطرهای
+    متفاوت فقط باید base متفاوت داشته باشن. سطرهای پرتر اول جا میگیرن (first fit)
+    """
+    base = array('i', [0]) * len(rows)
+    check = array('i')
+    value = array('i')
+    occupied = bytearray()
+    used = set()
+    placed = {}
+    first_free = 0
+    for s in sorted(range(len(rows)), key=lambda s: -len(rows[s])):
+        key = tuple(sorted(rows[s].items()))
+        b = placed.get(key)
+        if b is None:
+            if not key:
+                b = 0
+                while b in used:
+                    b += 1
+            else:
+                lo, hi = key[0][0], key[-1][0]
+                pattern = bytearray(hi - lo + 1)
+                for c, _ in key:
+                    pattern[c - lo] = 1
+                mask = int.from_bytes(pattern, 'little')
+
+                # خانه ی آزاد بعدی برای اولین ستون، بعد بررسی کل سطر با یک AND؛
+                # بعد از _PACK_ATTEMPTS تلاش ناموفق سطر به انتهای جدول اضافه میشه
+                f = max(first_free, lo)
+                attempts = 0
+                while True:
+                    attempts += 1
+                    if attempts > _PACK_ATTEMPTS:
+                        f = max(f, len(occupied))
+                    elif f < len(occupied):
+                        f = occupied.find(0, f)
+                        if f < 0:
+                            f = len(occupied)
+                    b = f - lo
+                    if b not in used and not int.from_bytes(
+                            occupied[f:f + len(pattern)], 'little') & mask:
+                        break
+                    f += 1
+
+                end = b + hi + 1
+                if end > len(check):
+                    grow = end - len(check)
+                    check.extend([-1] * grow)
+                    value.extend([0] * grow)
+                    occupied.extend(bytes(grow))
+                for c, a in key:
+                    check[b + c] = c
+                    value[b + c] = a
+                    occupied[b + c] = 1
+                first_free = occupied.find(0, first_free)
+                if first_free < 0:
+                    first_free = len(occupied)
+            used.add(b)
+            placed[key] = b
+        base[s] = b
+
+    # تا آخرین ستون هر سطر جا باشه و جستجو هیچ وقت از آرایه بیرون نزنه
+    pad = max(base, default=0) + width - len(check)
+    if pad > 0:
+        check.extend([-1] * pad)
+        value.extend([0] * pad)
+    return base, check, value
+
+
+class LR0Automaton:
+    """
+    مجموعه آیتم های LR(0) گرامر افزوده  S' -> S
+
+    هر آیتم یک عدد است: item_base[p] + مکان نقطه.
+    states[s] هسته ی (kernel) حالت s است، transitions[s] = {کد نماد: حالت مقصد}
+    و reductions[s] قوانینی که آیتم کاملشان در حالت s است
+    """
+
+    def __init__(self, grammar, start):
+        self.grammar = grammar
+        n_nt = len(grammar.nonterminals)
+        # قانون افزوده آخرین قانون است؛ ε ها از سمت راست حذف میشن
+        self.accept = len(grammar.rhs)
+        self.lhs = list(grammar.lhs) + [n_nt]
+        self.rhs = [tuple(s for s in codes if s != ~0) for codes in grammar.rhs] + [(start,)]
+        self.start = start
+
+        item_base, item_next, item_prod = [], [], []
+        for p, codes in enumerate(self.rhs):
+            item_base.append(len(item_next))
+            item_next.extend(codes)
+            item_next.append(None)      # نقطه در انتهای قانون
+            item_prod.extend([p] * (len(codes) + 1))
+        self.item_base = item_base
+
+        # closure هر نان ترمینال: آیتم های ابتدای قوانین همه ی نان ترمینال هایی
+        # که از سمت چپ قوانینش قابل رسیدن اند
+        by_lhs = grammar.by_lhs
+        left = [{self.rhs[q][0] for q in by_lhs[A] if self.rhs[q] and self.rhs[q][0] >= 0}
+                for A in range(n_nt)]
+        closure = []
+        for A in range(n_nt):
+            seen = {A}
+            work = [A]
+            while work:
+                for C in left[work.pop()]:
+                    if C not in seen:
+                        seen.add(C)
+                        work.append(C)
+            closure.append(frozenset(item_base[q] for C in seen for q in by_lhs[C]))
+
+        self.states = [(item_base[self.accept],)]
+        self.transitions = []
+        self.reductions = []
+        index = {self.states[0]: 0}
+        s = 0
+        while s < len(self.states):
+            items = set(self.states[s])
+            for i in self.states[s]:
+                X = item_next[i]
+                if X is not None and X >= 0:
+                    items |= closure[X]
+
+            groups = {}
+            reductions = []
+            for i in sorted(items):
+                X = item_next[i]
+                if X is None:
+                    reductions.append(item_prod[i])
+                else:
+                    groups.setdefault(X, []).append(i + 1)
+
+            transitions = {}
+            for X, kernel in groups.items():
+                kernel = tuple(kernel)
+                target = index.get(kernel)
+                if target is None:
+                    target = index[kernel] = len(self.states)
+                    self.states.append(kernel)
+                transitions[X] = target
+            self.transitions.append(transitions)
+            self.reductions.append(reductions)
+            s += 1
+
+    def __len__(self):
+        return len(self.states)
+
+
+class LRTable:
+    """
+    جدول های ACTION/GOTO برای SLR(1) یا LALR(1) روی خروجی GrammarAnalyzer.
+
+    کد هر action:
+        0       خطا
+        s + 1   shift به حالت s
+        -(p+1)  reduce با قانون p  (قانون automaton.accept یعنی پذیرش)
+    حالت هایی که فقط یک قانون برای reduce دارن آن را به عنوان reduce پیش فرض
+    میگیرن و سطرشان فقط shift ها را نگه میداره؛ بعد سطرها با row displacement
+    در سه آرایه ی تخت فشرده میشن
+    """
+
+    def __init__(self, analyzer, method='lalr'):
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+        if not hasattr(analyzer, '_follow'):
+            analyzer.compute_follow_sets()
+
+        g = analyzer.compiled
+        self.method = method
+        self.grammar = g
+        self.automaton = lr0 = LR0Automaton(g, g.nt_ids[analyzer.start])
+        self.width = len(g.terminals)
+        self.conflicts = []     # (نوع, حالت, ترمینال, action موجود, action جدید)
+
+        eps = analyzer._eps
+        self._nullable = [bool(first & eps) for first in analyzer._first]
+        if method == 'slr':
+            lookaheads = self._slr_lookaheads(analyzer)
+        else:
+            lookaheads = self._lalr_lookaheads()
+
+        rows = []
+        self.default = array('i', [0]) * len(lr0)
+        for s, transitions in enumerate(lr0.transitions):
+            row = {~X: target + 1 for X, target in transitions.items() if X < 0}
+            reduced = set()
+            for p in lr0.reductions[s]:
+                code = -(p + 1)
+                for t in _bits(lookaheads(s, p)):
+                    current = row.get(t)
+                    if current is None:
+                        row[t] = code
+                        reduced.add(code)
+                    elif current != code:
+                        if current > 0:
+                            kind = 'shift/reduce'     # مثل yacc: shift ترجیح داده میشه
+                        else:
+                            kind = 'reduce/reduce'    # قانون اول ترجیح داده میشه
+                            row[t] = max(current, code)
+                        self.conflicts.append((kind, s, g.terminals[t], current, code))
+            if len(reduced) == 1 and -(lr0.accept + 1) not in reduced:
+                code = reduced.pop()
+                if code in row.values():
+                    self.default[s] = code
+                    row = {t: a for t, a in row.items() if a != code}
+            rows.append(row)
+
+        self.action_base, self.action_check, self.action_value = _pack(rows, self.width)
+        goto_rows = [{X: target for X, target in transitions.items() if X >= 0}
+                     for transitions in lr0.transitions]
+        self.goto_base, self.goto_check, self.goto_value = _pack(
+            goto_rows, len(g.nonterminals))
+
+        self.lengths = array('i', [len(codes) for codes in lr0.rhs])
+        self.lhs = array('i', lr0.lhs)
+
+    # ---------------------------------------------------------
+    # ---------------------- lookahead ها -------------
+    # -------------------------------------------
+
+    def _slr_lookaheads(self, analyzer):
+        follow = [sum(1 << t for t in analyzer.terminal_ids(value)) for value in analyzer._follow]
+        accept, lhs = self.automaton.accept, self.automaton.lhs
+
+        def lookaheads(s, p):
+            return 1 << 1 if p == accept else follow[lhs[p]]
+        return lookaheads
+
+    def _lalr_lookaheads(self):
+        """
+        DeRemer & Pennello (1982):
+            DR(p,A)     ترمینال هایی که بعد از گذر A از p مستقیم shift میشن
+            Read        = digraph(reads, DR)       reads: گذر از نان ترمینال تهی‌پذیر
+            Follow      = digraph(includes, Read)  includes: B -> β A γ  با γ تهی‌پذیر
+            LA(q, A->ω) = ∪ Follow(p,A)  برای همه ی p که  p --ω--> q
+        همه ی مجموعه ها عدد صحیح (بیت t یعنی ترمینال t) هستن
+        """
+        lr0, nullable = self.automaton, self._nullable
+        transitions = lr0.transitions
+
+        nt_transitions = []
+        ids = {}
+        for s, trans in enumerate(transitions):
+            for X in trans:
+                if X >= 0:
+                    ids[s, X] = len(nt_transitions)
+                    nt_transitions.append((s, X))
+
+        direct = []
+        reads = []
+        for s, A in nt_transitions:
+            r = transitions[s][A]
+            direct.append(sum(1 << ~Y for Y in transitions[r] if Y < 0))
+            reads.append([ids[r, C] for C in transitions[r] if C >= 0 and nullable[C]])
+        direct[ids[0, lr0.start]] |= 1 << 1        # S' -> S .  با eof پذیرفته میشه
+        read = _digraph(reads, direct)
+
+        includes = [[] for _ in nt_transitions]
+        lookback = {}
+        by_lhs = self.grammar.by_lhs
+        for x, (s, B) in enumerate(nt_transitions):
+            for p in by_lhs[B]:
+                codes = lr0.rhs[p]
+                # nullable_suffix[i] یعنی codes[i:] تهی‌پذیر است
+                nullable_suffix = [True] * (len(codes) + 1)
+                for i in range(len(codes) - 1, -1, -1):
+                    Y = codes[i]
+                    nullable_suffix[i] = nullable_suffix[i + 1] and Y >= 0 and nullable[Y]
+                state = s
+                for i, Y in enumerate(codes):
+                    if Y >= 0 and nullable_suffix[i + 1]:
+                        includes[ids[state, Y]].append(x)
+                    state = transitions[state][Y]
+                lookback.setdefault((state, p), []).append(x)
+        follow = _digraph(includes, read)
+
+        accept = lr0.accept
+
+        def lookaheads(s, p):
+            if p == accept:
+                return 1 << 1
+            value = 0
+            for x in lookback.get((s, p), ()):
+                value |= follow[x]
+            return value
+        return lookaheads
+
+    # ---------------------------------------------------------
+    # ---------------------- دسترسی به جدول -------------
+    # -------------------------------------------
+
+    def action(self, s, t):
+        i = self.action_base[s] + t
+        if self.action_check[i] == t:
+            return self.action_value[i]
+        return self.default[s]
+
+    def goto(self, s, A):
+        return self.goto_value[self.goto_base[s] + A]
+
+    @property
+    def is_deterministic(self):
+        return not self.conflicts
+
+    @property
+    def nbytes(self):
+        arrays = (self.action_base, self.action_check, self.action_value, self.default,
+                  self.goto_base, self.goto_check, self.goto_value, self.lengths, self.lhs)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    @property
+    def dense_nbytes(self):
+        """اندازه ی همین جدول ها بدون فشرده سازی (برای مقایسه)"""
+        return 4 * len(self.automaton) * (self.width + len(self.grammar.nonterminals))
+
+    def describe_action(self, code):
+        if code > 0:
+            return f"shift {code - 1}"
+        if code == -(self.automaton.accept + 1):
+            return "accept"
+        if code < 0:
+            return f"reduce {self.grammar.rule_text(-code - 1)}"
+        return "error"
+
+    def describe_conflicts(self):
+        return [f"{kind} conflict in state {s} on {t}: "
+                f"{self.describe_action(a)}  |  {self.describe_action(b)}"
+                for kind, s, t, a, b in self.conflicts]
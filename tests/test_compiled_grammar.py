@@ -0,0 +1,80 @@
+"""
+CompiledGrammar: کد نمادها، قوانین و فهرست رخدادها باید همان چیزی باشه که از
+split کردن متن قوانین (روش قبل از CompiledGrammar) به دست میاد
+
+    python -m unittest tests.test_compiled_grammar
+"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from compiled_grammar import CompiledGrammar
+from synth import STATEMENT_GRAMMAR, generate_grammar
+
+
+def grammars():
+    yield 'statement', STATEMENT_GRAMMAR
+    for seed in range(10):
+        yield f"seed {seed}", generate_grammar(12, rules_per_nt=4, n_terminals=6, seed=seed)
+
+
+class CompiledGrammarTests(unittest.TestCase):
+
+    def test_rules_decode_to_split_text(self):
+        for name, grammar in grammars():
+            g = CompiledGrammar(grammar)
+            with self.subTest(grammar=name):
+                self.assertEqual(g.nonterminals, list(grammar))
+                self.assertEqual(g.terminals[:2], ['ε', '$'])
+                expected = [(A, rule.split()) for A, rules in grammar.items() for rule in rules]
+                self.assertEqual([(g.nonterminals[g.lhs[p]], [g.name(s) for s in g.rhs[p]])
+                                  for p in range(len(g))], expected)
+                self.assertEqual([p for rules in g.by_lhs for p in rules], list(range(len(g))))
+                for p in range(len(g)):
+                    A, symbols = expected[p]
+                    self.assertEqual(g.rule_text(p), f"{A} -> {' '.join(symbols)}")
+
+    def test_symbol_codes(self):
+        g = CompiledGrammar(STATEMENT_GRAMMAR)
+        for A, a in g.nt_ids.items():
+            self.assertEqual((g.code(A), g.name(a)), (a, A))
+        for t, i in g.t_ids.items():
+            self.assertEqual((g.code(t), g.name(~i)), (~i, t))
+        # ترمینال ها به ترتیب اولین رخداد شماره میگیرن
+        seen = ['ε', '$']
+        for rules in STATEMENT_GRAMMAR.values():
+            for rule in rules:
+                for X in rule.split():
+                    if X not in STATEMENT_GRAMMAR and X not in seen:
+                        seen.append(X)
+        self.assertEqual(g.terminals, seen)
+
+    def test_occurrences(self):
+        for name, grammar in grammars():
+            g = CompiledGrammar(grammar)
+            expected = {A: [] for A in grammar}
+            for p, rule in enumerate([rule for rules in grammar.values() for rule in rules]):
+                for pos, X in enumerate(rule.split()):
+                    if X in grammar:
+                        expected[X].append((p, pos))
+            with self.subTest(grammar=name):
+                self.assertEqual({A: g.occurrences[i] for A, i in g.nt_ids.items()}, expected)
+                self.assertEqual({A: g.users[i] for A, i in g.nt_ids.items()},
+                                 {A: sorted({p for p, _ in places}) for A, places in expected.items()})
+
+    def test_tuple_rules(self):
+        # grammar_loader سمت راست ها را tuple میده؛ نتیجه باید مثل متن باشه
+        for name, grammar in grammars():
+            split = {A: [tuple(rule.split()) for rule in rules] for A, rules in grammar.items()}
+            text, tuples = CompiledGrammar(grammar), CompiledGrammar(split)
+            with self.subTest(grammar=name):
+                self.assertEqual((tuples.lhs, tuples.rhs, tuples.terminals),
+                                 (text.lhs, text.rhs, text.terminals))
+
+
+if __name__ == '__main__':
+    unittest.main()
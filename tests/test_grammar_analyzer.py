@@ -0,0 +1,118 @@
+"""
+FIRST/FOLLOW: همه ی حل کننده ها (fixpoint و worklist) با و بدون bitsets باید همان
+مجموعه های الگوریتم نقطه ثابت ساده روی رشته ها (نسخه ی اولیه ی GrammarAnalyzer) را بدن
+
+    python -m unittest tests.test_grammar_analyzer
+"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from synth import STATEMENT_GRAMMAR, generate_grammar
+
+EXPRESSION_GRAMMAR = {
+    'E': ["T E'"],
+    "E'": ["+ T E'", 'ε'],
+    'T': ["F T'"],
+    "T'": ["* F T'", 'ε'],
+    'F': ['( E )', 'id'],
+}
+
+
+def reference_sets(grammar, start, epsilon='ε', eof='$'):
+    """FIRST و FOLLOW با تکرار روی همه ی قوانین تا وقتی چیزی تغییر نکنه"""
+    first = {A: set() for A in grammar}
+    follow = {A: set() for A in grammar}
+    follow[start].add(eof)
+
+    def first_of(symbols):
+        result = set()
+        for X in symbols:
+            fx = first[X] if X in grammar else {X}
+            result |= fx - {epsilon}
+            if epsilon not in fx:
+                return result
+        return result | {epsilon}
+
+    changed = True
+    while changed:
+        changed = False
+        for A, rules in grammar.items():
+            for rule in rules:
+                new = first_of([X for X in rule.split() if X != epsilon])
+                if not new <= first[A]:
+                    first[A] |= new
+                    changed = True
+
+    changed = True
+    while changed:
+        changed = False
+        for A, rules in grammar.items():
+            for rule in rules:
+                symbols = rule.split()
+                for i, B in enumerate(symbols):
+                    if B not in grammar:
+                        continue
+                    rest = first_of([X for X in symbols[i + 1:] if X != epsilon])
+                    new = rest - {epsilon}
+                    if epsilon in rest:
+                        new |= follow[A]
+                    if not new <= follow[B]:
+                        follow[B] |= new
+                        changed = True
+    return first, follow
+
+
+def random_grammars():
+    for seed in range(40):
+        yield f"seed {seed}", generate_grammar(6 + seed % 15, rules_per_nt=1 + seed % 4,
+                                               n_terminals=3 + seed % 8,
+                                               epsilon_rate=0.1 * (seed % 5), seed=seed), 'N0'
+
+
+class GrammarAnalyzerTests(unittest.TestCase):
+
+    def assert_matches_reference(self, grammar, start):
+        expected = reference_sets(grammar, start)
+        for solver in SOLVERS:
+            for bitsets in (False, True):
+                analyzer = GrammarAnalyzer(grammar, start, solver=solver, bitsets=bitsets)
+                analyzer.compute_follow_sets()
+                with self.subTest(solver=solver, bitsets=bitsets):
+                    self.assertEqual((analyzer.first, analyzer.follow), expected)
+
+    def test_expression_grammar(self):
+        analyzer = GrammarAnalyzer(EXPRESSION_GRAMMAR, 'E', solver='worklist', bitsets=True)
+        analyzer.compute_follow_sets()
+        self.assertEqual(analyzer.first, {'E': {'(', 'id'}, "E'": {'+', 'ε'}, 'T': {'(', 'id'},
+                                          "T'": {'*', 'ε'}, 'F': {'(', 'id'}})
+        self.assertEqual(analyzer.follow, {'E': {')', '$'}, "E'": {')', '$'}, 'T': {'+', ')', '$'},
+                                           "T'": {'+', ')', '$'}, 'F': {'*', '+', ')', '$'}})
+        self.assert_matches_reference(EXPRESSION_GRAMMAR, 'E')
+
+    def test_statement_grammar(self):
+        self.assert_matches_reference(STATEMENT_GRAMMAR, 'P')
+
+    def test_random_grammars(self):
+        for name, grammar, start in random_grammars():
+            with self.subTest(grammar=name):
+                self.assert_matches_reference(grammar, start)
+
+    def test_cycles_and_left_recursion(self):
+        # FOLLOW ها در یک چرخه (SCC) به هم وابسته اند و قوانین چپ گرد FIRST را تکرار میکنن
+        grammar = {'S': ['A a', 'B'], 'A': ['B b', 'A c', 'ε'], 'B': ['A', 'C d', 'ε'],
+                   'C': ['S', 'c C', 'ε']}
+        self.assert_matches_reference(grammar, 'S')
+
+    def test_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            GrammarAnalyzer(EXPRESSION_GRAMMAR, 'E', solver='magic')
+
+
+if __name__ == '__main__':
+    unittest.main()
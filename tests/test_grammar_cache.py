@@ -0,0 +1,132 @@
+"""
+کش تحلیل گرامر و DiskCache: نتیجه ی خوانده شده از کش همان تحلیل تازه است،
+شمارنده ها درست اند، ورودی خراب فقط یک miss است و حجم کش محدود میمونه
+
+    python -m unittest tests.test_grammar_cache
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from disk_cache import DiskCache, content_key
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from grammar_cache import GrammarCache, grammar_key
+from ll1_table import LL1Table
+from synth import STATEMENT_GRAMMAR, generate_grammar
+
+
+def fresh(grammar, start):
+    analyzer = GrammarAnalyzer(grammar, start)
+    table = LL1Table(analyzer)
+    return analyzer.first, analyzer.follow, table.table, table.conflicts
+
+
+class GrammarCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cached(self, grammar, start, **options):
+        cache = GrammarCache(self.tmp.name)
+        analyzer = cache.analyze(grammar, start, **options)
+        table = cache.ll1_table(analyzer)
+        return cache, (analyzer.first, analyzer.follow, table.table, table.conflicts)
+
+    def test_cached_matches_fresh(self):
+        grammars = [(STATEMENT_GRAMMAR, 'P'), ({'E': ['E + T', 'T'], 'T': ['id']}, 'E')]
+        grammars += [(generate_grammar(30, epsilon_rate=0.2, seed=seed), 'N0') for seed in range(5)]
+        for grammar, start in grammars:
+            expected = fresh(grammar, start)
+            for solver in SOLVERS:
+                with self.subTest(start=start, solver=solver):
+                    self.assertEqual(self.cached(grammar, start, solver=solver)[1], expected)
+
+    def test_counters(self):
+        cold, _ = self.cached(STATEMENT_GRAMMAR, 'P')
+        warm, _ = self.cached(STATEMENT_GRAMMAR, 'P')
+        self.assertEqual((cold.stats()['hits'], cold.stats()['misses']), (0, 1))
+        self.assertEqual((warm.stats()['hits'], warm.stats()['misses']), (1, 0))
+
+        # ورودی بدون جدول LL(1): FIRST/FOLLOW از کش (یک hit) و جدول ساخته و به ورودی اضافه میشه
+        grammar = generate_grammar(10, seed=1)
+        GrammarCache(self.tmp.name).analyze(grammar, 'N0')
+        cache, result = self.cached(grammar, 'N0')
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 0))
+        self.assertEqual(result, fresh(grammar, 'N0'))
+
+    def test_key(self):
+        spaced = {A: ['  '.join(rule.split()) + ' ' for rule in rules]
+                  for A, rules in STATEMENT_GRAMMAR.items()}
+        self.assertEqual(grammar_key(spaced, 'P'), grammar_key(STATEMENT_GRAMMAR, 'P'))
+        self.assertNotEqual(grammar_key(STATEMENT_GRAMMAR, 'E'), grammar_key(STATEMENT_GRAMMAR, 'P'))
+        reordered = dict(STATEMENT_GRAMMAR, R=list(reversed(STATEMENT_GRAMMAR['R'])))
+        self.assertNotEqual(grammar_key(reordered, 'P'), grammar_key(STATEMENT_GRAMMAR, 'P'))
+
+    def test_corrupt_entry_is_a_miss(self):
+        expected = fresh(STATEMENT_GRAMMAR, 'P')
+        self.cached(STATEMENT_GRAMMAR, 'P')
+        [(_, _, path)] = GrammarCache(self.tmp.name).cache.entries()
+        with open(path, 'rb') as f:
+            data = f.read()
+        for damaged in (data[:len(data) // 2], data[:10], b'GRC2' + bytes(8), b'\x80\x04garbage'):
+            with self.subTest(damaged=damaged[:12]):
+                with open(path, 'wb') as f:
+                    f.write(damaged)
+                cache, result = self.cached(STATEMENT_GRAMMAR, 'P')
+                self.assertEqual(result, expected)
+                self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (0, 1))
+
+
+class DiskCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.tmp.name, max_bytes=10_000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_put_open(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', b'value')
+        self.assertEqual(self.cache.get('a'), b'value')
+        data = self.cache.open('a')
+        self.assertEqual(data[:], b'value')
+        data.close()
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_eviction_keeps_recent_entries(self):
+        for i in range(30):
+            self.cache.put(str(i), bytes(1000))
+            os.utime(self.cache.path(str(i)), (i, i))      # ترتیب LRU بدون وابستگی به دقت ساعت
+        self.assertLessEqual(self.cache.size, 10_000)
+        self.assertEqual(self.cache.evictions, 20)
+        self.assertIsNotNone(self.cache.get('29'))
+        self.assertIsNone(self.cache.get('0'))
+
+    def test_discard_and_empty_files(self):
+        self.cache.put('a', b'value')
+        self.cache.get('a')
+        self.cache.discard('a')
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        self.assertFalse(os.path.exists(self.cache.path('a')))
+
+        open(self.cache.path('b'), 'wb').close()
+        self.assertIsNone(self.cache.open('b'))
+        self.assertFalse(os.path.exists(self.cache.path('b')))
+
+    def test_content_key(self):
+        self.assertEqual(content_key('ab', b'c'), content_key(b'ab', 'c'))
+        self.assertNotEqual(content_key('ab', 'c'), content_key('a', 'bc'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+grammar_loader: برای متن های درست خروجی همان parse_grammar قبلی رابط گرافیکی
+(str.replace برای هر ترمینال تک حرفی و بعد split) است و خط های نادرست با شماره خط
+گزارش میشن
+
+    python -m unittest tests.test_grammar_loader
+"""
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from compiled_grammar import CompiledGrammar
+from grammar_loader import (TERMINAL_SYMBOLS, GrammarError, load_grammar, parse_grammar,
+                            tokenize_production)
+from synth import generate_grammar
+
+
+def legacy_parse(text):
+    # نسخه ی قبلی parse_grammar در FirstandFollow GUI.py
+    def tokenize(production_str):
+        for symbol in TERMINAL_SYMBOLS:
+            production_str = production_str.replace(symbol, f' {symbol} ')
+        return ' '.join(production_str.split())
+
+    grammar = {}
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line or ":" not in line or line.startswith(":"):
+            continue
+        left, right = line.split(":", 1)
+        left = left.strip()
+        if not right.strip():
+            continue
+        productions = [p.strip() for p in tokenize(right).split("|")]
+        grammar[left] = [p for p in productions if p]
+    return grammar
+
+
+def as_text(grammar):
+    return {A: [' '.join(rule) for rule in rules] for A, rules in grammar.items()}
+
+
+def random_text(seed):
+    rng = random.Random(seed)
+    grammar = generate_grammar(15, rules_per_nt=4, n_terminals=6, epsilon_rate=0.1, seed=seed)
+    lines = []
+    for A, rules in grammar.items():
+        glue = [rng.choice(('(', ')', '+', '*', '-', '/', '^', '=', ' ', '  ', '\t')) for _ in rules]
+        rules = [rule.replace(' ', g, 1) for rule, g in zip(rules, glue)]
+        colon = rng.choice((':', ' :', ': ', ' : '))
+        lines.append(A + colon + rng.choice((' | ', '|')).join(rules))
+    return '\n'.join(lines) + rng.choice(('', '\n', '\n\n'))
+
+
+class GrammarLoaderTests(unittest.TestCase):
+
+    def test_matches_legacy_parser(self):
+        texts = ["E: T E'\nE': + T E' | ε\nF: (E) | id\nG:a*b^c|d=e/f-g\nH : a :b | | c\n\n",
+                 "S : x\nS : y | z\n", "A : ( ) + * - / ^ =\n"]
+        texts += [random_text(seed) for seed in range(30)]
+        for text in texts:
+            with self.subTest(text=text[:30]):
+                self.assertEqual(as_text(parse_grammar(text)), legacy_parse(text))
+
+    def test_load_grammar_streams_the_file(self):
+        text = random_text(99)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grammar.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.assertEqual(load_grammar(path), parse_grammar(text))
+
+    def test_compiles_like_text_rules(self):
+        text = random_text(5)
+        loaded, legacy = CompiledGrammar(parse_grammar(text)), CompiledGrammar(legacy_parse(text))
+        self.assertEqual((loaded.rhs, loaded.terminals), (legacy.rhs, legacy.terminals))
+
+    def test_tokenize_production(self):
+        self.assertEqual(tokenize_production('(E)|a*b'), '( E ) | a * b')
+
+    def test_errors(self):
+        errors = []
+        grammar = parse_grammar("A : x\nbad\n: y\nA B : z\nC : |\nD : d", errors)
+        self.assertEqual(list(grammar), ['A', 'D'])
+        self.assertEqual([e.line for e in errors], [2, 3, 4, 5])
+        with self.assertRaises(GrammarError) as raised:
+            parse_grammar("A : x\nB")
+        self.assertEqual(raised.exception.line, 2)
+        self.assertTrue(str(raised.exception).startswith("line 2:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
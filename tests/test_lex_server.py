@@ -0,0 +1,120 @@
+"""
+سرور لکس: پاسخ ها همان خروجی Lexer و GrammarAnalyzer مستقیم اند و هر درخواست
+(حتی بعد از بسته شدن pool) پاسخ میگیره
+
+    python -m unittest tests.test_lex_server
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirstandFollow import GrammarAnalyzer
+from grammar_loader import parse_grammar
+from lex_client import AsyncLexClient, ServerError
+from lex_server import LexServer
+from lexer import Lexer
+from token_buffer import TOKEN_LABELS
+
+CODE = 'total = price * 1.5e3 + tax; // sum\nfor i in items:\n    print(total, i)  # done\n'
+GRAMMAR = "E : T E'\nE' : + T E' | ε\nT : F T'\nT' : * F T' | ε\nF : ( E ) | id\n"
+
+
+def expected_lex(code, engine='regex'):
+    tokens, table = Lexer(code, engine=engine).tokenize()
+    return {'tokens': [[tok_type, display[len(TOKEN_LABELS[tok_type]) + 1:-1], line]
+                       for display, line, tok_type in tokens],
+            'symbol_table': table}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class LexServerTests(unittest.TestCase):
+
+    def answer(self, server, request):
+        async def go():
+            try:
+                return await server.answer(request)
+            finally:
+                server.close()
+        return run(go())
+
+    def test_lex_matches_lexer(self):
+        for engine in ('char', 'regex'):
+            with self.subTest(engine=engine):
+                response = self.answer(LexServer(workers=0), {'id': 1, 'op': 'lex', 'code': CODE,
+                                                              'engine': engine})
+                self.assertEqual(response, {'id': 1, 'ok': True, 'result': expected_lex(CODE, engine)})
+
+    def test_first_follow_matches_analyzer(self):
+        grammar = parse_grammar(GRAMMAR)
+        analyzer = GrammarAnalyzer(grammar, 'E')
+        analyzer.compute_follow_sets()
+        response = self.answer(LexServer(workers=0), {'id': 2, 'op': 'first_follow', 'grammar': GRAMMAR})
+        result = response['result']
+        self.assertEqual(result['first'], {nt: sorted(analyzer.first[nt]) for nt in grammar})
+        self.assertEqual(result['follow'], {nt: sorted(analyzer.follow[nt]) for nt in grammar})
+
+    def test_errors_are_answered(self):
+        for request, error in (({'id': 3, 'op': 'lexx'}, "unknown op 'lexx'"),
+                               ({'id': 4, 'op': 'lex', 'code': 1}, "lex needs a 'code' string"),
+                               ({'id': 5, 'op': 'lex', 'code': 'x', 'engine': 'dfa'}, "unknown engine 'dfa'"),
+                               ([1, 2], "request must be a JSON object")):
+            with self.subTest(request=request):
+                response = self.answer(LexServer(workers=0), request)
+                self.assertFalse(response['ok'])
+                self.assertEqual(response['error'], error)
+
+    def test_batched_requests_through_the_pool(self):
+        sources = [f"x{i} = {i}; // {i}\n" * (i % 5 + 1) for i in range(40)]
+
+        async def go():
+            server = LexServer(workers=1, batch_size=16)
+            try:
+                return await asyncio.gather(*(server.answer({'id': i, 'op': 'lex', 'code': code})
+                                              for i, code in enumerate(sources)))
+            finally:
+                server.close()
+
+        responses = run(go())
+        self.assertEqual([r['result'] for r in responses], [expected_lex(code) for code in sources])
+
+    def test_closed_pool_still_answers(self):
+        # درخواستی که وسط توقف سرور میرسه: submit روی pool بسته RuntimeError میده
+        async def go():
+            server = LexServer(workers=1)
+            server.close()
+            single = await server.answer({'id': 1, 'op': 'lex', 'code': 'x' * (server.small_size + 1)})
+            batched = await asyncio.wait_for(server.answer({'id': 2, 'op': 'lex', 'code': 'x'}), 10)
+            return single, batched
+
+        for response in run(go()):
+            self.assertFalse(response['ok'])
+            self.assertIn("shutting down", response['error'])
+
+    def test_client_round_trip(self):
+        async def go():
+            server = LexServer(workers=0)
+            ready = asyncio.get_running_loop().create_future()
+            serving = asyncio.ensure_future(server.serve(port=0, ready=ready.set_result))
+            host, port = (await ready).rsplit(':', 1)
+            client = await AsyncLexClient.connect(host=host, port=int(port))
+            try:
+                results = await asyncio.gather(client.lex(CODE), client.ping(), client.lex('y = 2'))
+                with self.assertRaises(ServerError):
+                    await client.request('nope')
+                await client.shutdown()
+            finally:
+                await client.close()
+            await serving
+            return results
+
+        self.assertEqual(run(go()), [expected_lex(CODE), 'pong', expected_lex('y = 2')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+آزمون تفاضلی لکسر: همه ی موتورها و مسیرهای دیگر (tokenize_buffer، iter_tokens،
+ورودی bytes و relex) باید دقیقا همان خروجی موتور char را بدن
+
+    python -m unittest discover tests
+    python tests/test_lexer_engines.py
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import ENGINES, Lexer
+
+EDGE_CASES = ['', '.5', '1e+', '1e', '5.', 'a//b', '#x\ny', 'a\r\nb', '!=!', '\n\n@', 'e1 1e1x',
+              '..5', '1.5e+3x', '1E-', '12e+x', '/', '/ /', '//', 'a_1b2 9_a', 'مa1 é5', 'x#', '  \t',
+              'for if2 while_ print', '>=<=!==<>', 'x\n// c\n# d\nz',
+              '\ud800a', 'b\udfff\ud83d 1']
+
+# تکه های تصادفی: هر ترکیبی از این ها یک ورودی آزمون است
+PIECES = ['a', 'x1', '_b', 'for', 'if', 'while', 'print', '0', '12', '3.5', '.', 'e', 'E', '+', '-',
+          '1e5', '2E-3', '4e+', '*', '/', '//', '#', '%', '=', '==', '!', '!=', '<', '>=', ':', ';',
+          '(', ')', '{', '}', '[', ']', ',', ' ', '  ', '\t', '\n', '\r', '@', '$', '"', 'é', 'م', '5.x']
+
+FUZZ_INPUTS = 4000
+
+
+def random_code(rng, ascii_only=False):
+    pieces = [p for p in PIECES if p.isascii()] if ascii_only else PIECES
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+
+
+def reference(code):
+    return Lexer(code, engine='char').tokenize()
+
+
+class LexerEngineTests(unittest.TestCase):
+
+    def assert_same(self, code):
+        expected = reference(code)
+        for engine in ENGINES:
+            self.assertEqual(Lexer(code, engine=engine).tokenize(), expected, f"{engine}: {code!r}")
+
+        buffer, table = Lexer(code).tokenize_buffer()
+        self.assertEqual((list(buffer), table), expected, f"tokenize_buffer: {code!r}")
+
+        for chunk_size in (1, 7):
+            lexer = Lexer(engine='regex')
+            chunks = [code[i:i + chunk_size] for i in range(0, len(code), chunk_size)]
+            tokens = list(lexer.iter_tokens(chunks))
+            self.assertEqual((tokens, lexer.symbol_table), expected, f"iter_tokens: {code!r}")
+
+        if code.isascii():
+            tokens, table = Lexer(code.encode('ascii'), engine='regex').tokenize()
+            self.assertEqual((tokens, table), expected, f"bytes input: {code!r}")
+
+    def test_edge_cases(self):
+        for code in EDGE_CASES:
+            with self.subTest(code=code):
+                self.assert_same(code)
+
+    def test_random_inputs(self):
+        rng = random.Random(1)
+        for i in range(FUZZ_INPUTS):
+            code = random_code(rng, ascii_only=i % 4 == 0)
+            with self.subTest(code=code):
+                self.assert_same(code)
+
+    def test_relex_matches_full_lex(self):
+        rng = random.Random(2)
+        for _ in range(FUZZ_INPUTS // 4):
+            code = '\n'.join(random_code(rng) for _ in range(rng.randint(1, 5)))
+            lexer = Lexer(code)
+            buffer, _ = lexer.tokenize_buffer()
+            offset = rng.randint(0, len(code))
+            deleted = rng.randint(0, len(code) - offset)
+            inserted = random_code(rng)
+            lexer.relex(buffer, offset, deleted, inserted)
+
+            new = code[:offset] + inserted + code[offset + deleted:]
+            with self.subTest(code=code, offset=offset, deleted=deleted, inserted=inserted):
+                self.assertEqual((list(buffer), lexer.symbol_table), reference(new))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+پارسر LL(1): درخت باید یک اشتقاق معتبر گرامر باشه که برگ هایش دقیقا توکن های
+ورودی اند، و پذیرفتن یا رد کردن هر ورودی همان نتیجه ی یک پارسر بازگشتی ساده
+روی مجموعه های FIRST/FOLLOW است
+
+    python -m unittest tests.test_ll1_parser
+"""
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from FirstandFollow import GrammarAnalyzer
+from ll1_parser import LL1Parser, ParseError, token_terminal
+from ll1_table import LL1Table
+from lexer import Lexer
+from synth import STATEMENT_GRAMMAR, generate_program
+
+EXPRESSION_PIECES = ['x', 'y1', '7', '2.5', '+', '-', '*', '/', '%', '(', ')']
+
+
+def terminals(tokens):
+    return [t for t in (token_terminal(display[display.index('(') + 1:-1], tok_type)
+                        for display, _, tok_type in tokens) if t is not None]
+
+
+def reference_accepts(analyzer, symbols):
+    """پارسر پیش بینی بازگشتی با نام نمادها"""
+    grammar, eps, eof = analyzer.grammar, analyzer.epsilon, analyzer.eof
+    symbols = symbols + [eof]
+    pos = 0
+
+    def predicts(A, rule, t):
+        for X in rule.split():
+            fx = {eps} if X == eps else analyzer.first[X] if X in grammar else {X}
+            if t in fx:
+                return True
+            if eps not in fx:
+                return False
+        return t in analyzer.follow[A]
+
+    def parse(A):
+        nonlocal pos
+        rule = next((r for r in grammar[A] if predicts(A, r, symbols[pos])), None)
+        if rule is None:
+            return False
+        for X in rule.split():
+            if X == eps:
+                continue
+            if X in grammar:
+                if not parse(X):
+                    return False
+            elif symbols[pos] == X:
+                pos += 1
+            else:
+                return False
+        return True
+
+    return parse(analyzer.start) and symbols[pos] == eof
+
+
+class LL1ParserTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, 'P', solver='worklist')
+        cls.parser = LL1Parser(LL1Table(cls.analyzer))
+
+    def assert_derivation(self, root):
+        for _, node in root.walk():
+            if node.symbol in STATEMENT_GRAMMAR:
+                self.assertIn(' '.join(child.symbol for child in node.children),
+                              STATEMENT_GRAMMAR[node.symbol], node.symbol)
+
+    def test_tree_leaves_are_the_tokens(self):
+        source = generate_program(300, seed=3)
+        tokens = Lexer(source).tokenize()[0]
+        expected = [(display[display.index('(') + 1:-1], line)
+                    for display, line, tok_type in tokens if tok_type != 'comment']
+        for stream in (tokens, Lexer(source).tokenize_buffer()[0], Lexer().iter_tokens(source)):
+            root = self.parser.parse(stream)
+            self.assertEqual([(n.text, n.line) for _, n in root.walk() if n.text is not None], expected)
+            self.assert_derivation(root)
+        self.assertEqual(self.parser.parse(tokens, build_tree=False), len(expected))
+
+    def test_accepts_like_reference(self):
+        analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, 'E')
+        analyzer.compute_follow_sets()
+        parser = LL1Parser(LL1Table(analyzer))
+        rng = random.Random(7)
+        for _ in range(2000):
+            code = ' '.join(rng.choice(EXPRESSION_PIECES) for _ in range(rng.randint(0, 9)))
+            tokens = Lexer(code).tokenize()[0]
+            try:
+                parser.parse(tokens, build_tree=False)
+                accepted = True
+            except ParseError:
+                accepted = False
+            with self.subTest(code=code):
+                self.assertEqual(accepted, reference_accepts(analyzer, terminals(tokens)))
+
+    def test_errors(self):
+        source = "x = 1;\nprint(x);\nwhile (x < 3) {\n    x = x + ;\n}\n"
+        with self.assertRaises(ParseError) as raised:
+            self.parser.parse(Lexer(source).tokenize()[0])
+        self.assertEqual(raised.exception.line, 4)
+        with self.assertRaises(ParseError) as raised:
+            self.parser.parse(Lexer(source).tokenize_buffer()[0])
+        self.assertEqual((raised.exception.line, raised.exception.column), (4, 13))
+
+        for broken in ("x = 1", "x = 1;\n}\n", "x = 1 @ 2;"):
+            with self.subTest(source=broken):
+                with self.assertRaises(ParseError):
+                    self.parser.parse(Lexer(broken).tokenize()[0], build_tree=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+جدول LL(1): هر خانه باید همان قانونی باشه که ساخت کتابی جدول از روی مجموعه های
+FIRST/FOLLOW (نام نمادها، بدون شماره گذاری) پیش بینی میکنه، و تداخل ها دقیقا
+خانه هایی اند که بیش از یک قانون دارن
+
+    python -m unittest tests.test_ll1_table
+"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from FirstandFollow import SOLVERS, GrammarAnalyzer
+from ll1_table import LL1Table
+from synth import STATEMENT_GRAMMAR, generate_grammar
+
+
+def reference_table(analyzer):
+    """{(A, t): [شماره ی قانون ها به ترتیب]} با قانون های FIRST(α) و FOLLOW(A)"""
+    grammar, eps = analyzer.grammar, analyzer.epsilon
+    cells = {}
+    p = 0
+    for A, rules in grammar.items():
+        for rule in rules:
+            first = set()
+            for X in rule.split():
+                fx = {eps} if X == eps else analyzer.first[X] if X in grammar else {X}
+                first |= fx - {eps}
+                if eps not in fx:
+                    break
+            else:
+                first |= analyzer.follow[A]
+            for t in first:
+                cells.setdefault((A, t), []).append(p)
+            p += 1
+    return cells
+
+
+def grammars():
+    yield 'statement', STATEMENT_GRAMMAR, 'P'
+    yield 'dangling else', {'S': ['if E then S O', 'a'], 'O': ['else S', 'ε'], 'E': ['b']}, 'S'
+    yield 'left recursion', {'E': ['E + T', 'T'], 'T': ['id', '( E )']}, 'E'
+    for seed in range(30):
+        yield f"seed {seed}", generate_grammar(8, rules_per_nt=3, n_terminals=5,
+                                               epsilon_rate=0.2, seed=seed), 'N0'
+
+
+class LL1TableTests(unittest.TestCase):
+
+    def test_matches_reference(self):
+        for name, grammar, start in grammars():
+            for solver in SOLVERS:
+                analyzer = GrammarAnalyzer(grammar, start, solver=solver)
+                table = LL1Table(analyzer)
+                expected = reference_table(analyzer)
+                g = table.grammar
+                with self.subTest(grammar=name, solver=solver):
+                    for A in g.nonterminals:
+                        for t in g.terminals[1:]:
+                            rules = expected.get((A, t), [LL1Table.EMPTY])
+                            self.assertEqual(table.entry(A, t), rules[0], f"[{A}, {t}]")
+                    conflicts = sorted((A, t, rules[0], p) for (A, t), rules in expected.items()
+                                       for p in rules[1:])
+                    self.assertEqual(sorted((A, t, q, p) for _, A, t, q, p in table.conflicts), conflicts)
+                    self.assertEqual(table.is_ll1, not conflicts)
+
+    def test_conflict_kinds(self):
+        table = LL1Table(GrammarAnalyzer({'S': ['if E then S O', 'a'], 'O': ['else S', 'ε'],
+                                          'E': ['b']}, 'S'))
+        self.assertEqual([c[:3] for c in table.conflicts], [('FIRST/FOLLOW', 'O', 'else')])
+        table = LL1Table(GrammarAnalyzer({'E': ['E + T', 'T'], 'T': ['id', '( E )']}, 'E'))
+        self.assertEqual({c[0] for c in table.conflicts}, {'FIRST/FIRST'})
+        self.assertTrue(LL1Table(GrammarAnalyzer(STATEMENT_GRAMMAR, 'P')).is_ll1)
+
+    def test_restore(self):
+        analyzer = GrammarAnalyzer(generate_grammar(20, epsilon_rate=0.2, seed=4), 'N0')
+        table = LL1Table(analyzer)
+        restored = LL1Table.restore(analyzer, table.table.tobytes(), table.conflicts)
+        self.assertEqual((restored.table, restored.conflicts, list(restored.rows())),
+                         (table.table, table.conflicts, list(table.rows())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+جدول ها و پارسر SLR(1)/LALR(1): جدول فشرده همان مقدارهای سطرهای کامل را برمیگردونه،
+تداخل ها روی گرامرهای شناخته شده درست اند و پارسر LR روی گرامر LL(1) همان درخت
+و همان پذیرش/رد پارسر LL(1) را داره
+
+    python -m unittest tests.test_lr_table
+"""
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from FirstandFollow import GrammarAnalyzer
+from ll1_parser import LL1Parser, ParseError
+from ll1_table import LL1Table
+from lexer import Lexer
+from lr_parser import LRParser
+from lr_table import METHODS, LRTable, _pack
+from synth import STATEMENT_GRAMMAR, generate_grammar, generate_program
+
+# کتاب اژدها (4.49): LALR(1) هست ولی SLR(1) نیست
+POINTER_GRAMMAR = {'S': ['L = R', 'R'], 'L': ['* R', 'id'], 'R': ['L']}
+EXPRESSION_PIECES = ['x', 'y1', '7', '2.5', '+', '-', '*', '/', '%', '(', ')']
+
+
+def tree(root):
+    return [(depth, node.symbol, node.text, node.line) for depth, node in root.walk()]
+
+
+def accepts(parser, tokens):
+    try:
+        parser.parse(tokens, build_tree=False)
+    except ParseError:
+        return False
+    return True
+
+
+class LRTableTests(unittest.TestCase):
+
+    def test_pack_lookup(self):
+        rng = random.Random(3)
+        for width in (1, 5, 40):
+            rows = [{c: rng.randint(1, 99) for c in rng.sample(range(width), rng.randint(0, width))}
+                    for _ in range(60)]
+            rows += rows[:10]           # سطرهای تکراری base مشترک میگیرن
+            base, check, value = _pack(rows, width)
+            for s, row in enumerate(rows):
+                for c in range(width):
+                    i = base[s] + c
+                    found = value[i] if check[i] == c else None
+                    self.assertEqual(found, row.get(c), (width, s, c))
+
+    def test_pointer_grammar_conflicts(self):
+        slr = LRTable(GrammarAnalyzer(POINTER_GRAMMAR, 'S'), 'slr')
+        lalr = LRTable(GrammarAnalyzer(POINTER_GRAMMAR, 'S'), 'lalr')
+        self.assertEqual([(kind, t) for kind, _, t, _, _ in slr.conflicts], [('shift/reduce', '=')])
+        self.assertTrue(lalr.is_deterministic)
+        parser = LRParser(lalr)
+        for code, ok in (('* x = * * y', True), ('x', True), ('x = y', True), ('x = = y', False),
+                         ('* = x', False), ('', False)):
+            with self.subTest(code=code):
+                self.assertEqual(accepts(parser, Lexer(code).tokenize()[0]), ok)
+
+    def test_ambiguous_grammar_conflicts(self):
+        table = LRTable(GrammarAnalyzer({'E': ['E + E', 'E * E', 'id']}, 'E'))
+        self.assertEqual({kind for kind, *_ in table.conflicts}, {'shift/reduce'})
+        table = LRTable(GrammarAnalyzer({'S': ['A', 'B'], 'A': ['x'], 'B': ['x']}, 'S'))
+        self.assertEqual({kind for kind, *_ in table.conflicts}, {'reduce/reduce'})
+
+    def test_lalr_is_at_least_slr(self):
+        # lookahead های LALR زیرمجموعه ی FOLLOW اند، پس هر گرامر SLR(1) یک گرامر LALR(1) است
+        for seed in range(40):
+            grammar = generate_grammar(6, rules_per_nt=3, n_terminals=4, max_len=3,
+                                       epsilon_rate=0.2, seed=seed)
+            slr = LRTable(GrammarAnalyzer(grammar, 'N0'), 'slr')
+            lalr = LRTable(GrammarAnalyzer(grammar, 'N0'), 'lalr')
+            with self.subTest(seed=seed):
+                self.assertLessEqual(len(lalr.conflicts), len(slr.conflicts))
+
+    def test_same_tree_as_ll1(self):
+        source = generate_program(300, seed=3)
+        tokens = Lexer(source).tokenize()[0]
+        analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, 'P')
+        expected = tree(LL1Parser(LL1Table(analyzer)).parse(tokens))
+        for method in METHODS:
+            table = LRTable(analyzer, method)
+            with self.subTest(method=method):
+                self.assertTrue(table.is_deterministic)
+                parser = LRParser(table)
+                self.assertEqual(tree(parser.parse(tokens)), expected)
+                self.assertEqual(tree(parser.parse(Lexer().iter_tokens(source))), expected)
+
+    def test_accepts_like_ll1(self):
+        analyzer = GrammarAnalyzer(STATEMENT_GRAMMAR, 'E')
+        ll1 = LL1Parser(LL1Table(analyzer))
+        parsers = {method: LRParser(LRTable(analyzer, method)) for method in METHODS}
+        rng = random.Random(11)
+        for _ in range(2000):
+            code = ' '.join(rng.choice(EXPRESSION_PIECES) for _ in range(rng.randint(0, 9)))
+            tokens = Lexer(code).tokenize()[0]
+            expected = accepts(ll1, tokens)
+            for method, parser in parsers.items():
+                with self.subTest(code=code, method=method):
+                    self.assertEqual(accepts(parser, tokens), expected)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            LRTable(GrammarAnalyzer(POINTER_GRAMMAR, 'S'), 'lr1')
+
+
+if __name__ == '__main__':
+    unittest.main()
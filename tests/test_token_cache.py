@@ -0,0 +1,118 @@
+"""
+کش توکن ها: خروجی از کش (str، bytes و mmap) باید همان tokenize_buffer بدون کش باشه
+و ورودی خراب یا ناقص فقط یک miss است که از پوشه ی کش پاک میشه
+
+    python -m unittest tests.test_token_cache
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_lexer import lex_files
+from lexer import Lexer
+from token_cache import TokenCache
+
+CODE = "total = price * 1.5e3 + tax; // جمع\nfor i in items:\n    print(total, i)  # done\n"
+
+
+def reference(code):
+    buffer, table = Lexer(code).tokenize_buffer()
+    return list(buffer), table
+
+
+class TokenCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def entries(self):
+        return [path for _, _, path in self.cache.cache.entries()]
+
+    def assert_cached(self, code, copy=False):
+        expected = reference(code)
+        buffer, table = self.cache.tokenize(Lexer(code))
+        self.assertEqual((list(buffer), table), expected)
+        cached = self.cache.load(Lexer(code), copy)
+        self.assertIsNotNone(cached)
+        buffer, table = cached
+        self.assertEqual((list(buffer), table), expected)
+
+    def test_round_trip(self):
+        for code in ('', '   \n\t', CODE, CODE * 50):
+            for copy in (False, True):
+                with self.subTest(code=code[:20], copy=copy):
+                    self.assert_cached(code, copy)
+
+    def test_bytes_and_mmap_input(self):
+        code = CODE.encode('utf-8')
+        buffer, table = self.cache.tokenize(Lexer(code))
+        expected = (list(buffer), table)
+        self.assertEqual(expected, reference(code))
+
+        path = os.path.join(self.tmp.name, 'source.txt')
+        with open(path, 'wb') as f:
+            f.write(code)
+        lexer = Lexer.from_file(path)
+        try:
+            buffer, table = self.cache.tokenize(lexer)
+            self.assertEqual((list(buffer), table), expected)
+            self.assertEqual(self.cache.hits, 1)
+            del buffer
+        finally:
+            lexer.code.close()
+
+        # متن و بایت ها کلید جدا دارن (مکان ها بر حسب کاراکتر یا بایت)
+        self.assertIsNone(self.cache.load(Lexer(CODE)))
+
+    def test_lex_files(self):
+        paths = []
+        for i in range(6):
+            path = os.path.join(self.tmp.name, f'file_{i}.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(CODE.replace('total', f'total_{i % 3}'))
+            paths.append(path)
+        expected = lex_files(paths, workers=1)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(lex_files(paths, workers=workers, cache=self.cache), expected)
+        # سه محتوای متفاوت: فقط اولین دیدن هر کدام miss است
+        self.assertEqual((self.cache.hits, self.cache.misses), (9, 3))
+
+    def test_truncated_entry_is_a_miss(self):
+        self.cache.tokenize(Lexer(CODE))
+        [path] = self.entries()
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        for size in (0, 3, 10, len(data) // 2, len(data) - 1):
+            with self.subTest(size=size):
+                with open(path, 'wb') as f:
+                    f.write(data[:size])
+                misses = self.cache.misses
+                self.assertIsNone(self.cache.load(Lexer(CODE)))
+                self.assertEqual(self.cache.misses, misses + 1)
+                self.assertEqual(self.entries(), [])        # ورودی خراب پاک شده
+
+                self.assert_cached(CODE)                     # و دوباره درست ساخته میشه
+                [path] = self.entries()
+
+    def test_corrupt_names_are_a_miss(self):
+        code = 'alpha = beta'
+        self.cache.tokenize(Lexer(code))
+        [path] = self.entries()
+        with open(path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b'\xff')                  # utf-8 نامعتبر در نام شناسه ها
+        self.assertIsNone(self.cache.load(Lexer(code)))
+        self.assertEqual(self.entries(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+خروجی توکن ها: همه ی قالب ها برای لیست توکن ها، TokenBuffer و حالت جریانی یکی اند
+و load_binary همان توکن ها و جدول شناسه ها را برمیگردونه
+
+    python -m unittest tests.test_token_export
+"""
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from token_export import FORMATS, export_file, export_tokens, load_binary
+
+CODE = 'total = price * 1.5e3 + tax; // sum\nfor i in items:\n    print("a, b", i)  # done\n'
+SOURCES = ['', '   \n\t', '// only a comment\n# and another', CODE, 'نام = "x, y" ; é\n' + CODE]
+
+
+class TokenExportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def export(self, tokens, symbol_table, fmt):
+        path = self.path('out.' + fmt)
+        export_tokens(path, tokens, symbol_table, fmt, chunk_size=5)
+        return self.contents(path, fmt)
+
+    @staticmethod
+    def contents(path, fmt):
+        # قالب binary بسته به ورودی بلوک بندی متفاوتی داره؛ محتوای خوانده شده مقایسه میشه
+        if fmt == 'binary':
+            buffer, symbol_table = load_binary(path)
+            return list(buffer), symbol_table
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_inputs_give_the_same_output(self):
+        for code in SOURCES:
+            tokens, symbol_table = Lexer(code).tokenize()
+            buffer, _ = Lexer(code).tokenize_buffer()
+            source = self.path('source.txt')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(code)
+            for fmt in FORMATS:
+                with self.subTest(code=code[:20], fmt=fmt):
+                    expected = self.export(tokens, symbol_table, fmt)
+                    self.assertEqual(self.export(buffer, symbol_table, fmt), expected)
+                    self.assertEqual(self.export(iter(tokens), symbol_table, fmt), expected)
+                    out = self.path('streamed.' + fmt)
+                    count, streamed_symbols = export_file(out, source, fmt, chunk_size=3)
+                    self.assertEqual((count, streamed_symbols), (len(tokens), symbol_table))
+                    self.assertEqual(self.contents(out, fmt), expected)
+
+    def test_binary_round_trip(self):
+        for code in SOURCES:
+            expected = Lexer(code).tokenize()
+            path = self.path('out.tok')
+            for source in (expected[0], Lexer(code).tokenize_buffer()[0],
+                           Lexer(code.encode('utf-8')).tokenize_buffer()[0]):
+                with self.subTest(code=code, source=type(source).__name__):
+                    export_tokens(path, source, expected[1])
+                    buffer, symbol_table = load_binary(path)
+                    self.assertEqual((list(buffer), symbol_table), expected)
+
+    def test_binary_round_trip_from_mmap(self):
+        source = self.path('source.txt')
+        for code in ('', '   \n\t', CODE):
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(code)
+            expected = Lexer(code).tokenize()
+            lexer = Lexer.from_file(source)
+            with self.subTest(code=code):
+                export_tokens(self.path('out.tok'), lexer.tokenize_buffer()[0], lexer.symbol_table)
+                buffer, symbol_table = load_binary(self.path('out.tok'))
+                self.assertEqual((list(buffer), symbol_table), expected)
+
+    def test_text_formats_match_tokens(self):
+        tokens, symbol_table = Lexer(CODE).tokenize()
+        records = [(tok_type, str(line)) for _, line, tok_type in tokens]
+
+        text = self.export(tokens, symbol_table, 'text').decode('utf-8')
+        self.assertEqual(text.split('\n\nsymbol table:\n')[0].splitlines(),
+                         [f"{display} [line:{line}]" for display, line, _ in tokens])
+
+        rows = list(csv.reader(io.StringIO(self.export(tokens, symbol_table, 'csv').decode('utf-8'))))
+        self.assertEqual(rows[0], ['type', 'text', 'line'])
+        self.assertEqual([(row[0], row[2]) for row in rows[1:len(tokens) + 1]], records)
+        self.assertEqual({name: int(i) for name, i in rows[len(tokens) + 3:]}, symbol_table)
+
+        lines = self.export(tokens, symbol_table, 'jsonl').decode('utf-8').splitlines()
+        objects = [json.loads(line) for line in lines]
+        self.assertEqual([(o['type'], str(o['line'])) for o in objects[:-1]], records)
+        self.assertEqual(objects[-1], {'symbol_table': symbol_table})
+
+
+if __name__ == '__main__':
+    unittest.main()
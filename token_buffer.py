@@ -0,0 +1,132 @@
+from array import array
+from collections.abc import Sequence
+
+from line_index import LineIndex
+
+
+# انواع توکن به ترتیب کد عددی آنها در ستون types
+TOKEN_TYPES = ('comment', 'keyword', 'id', 'number', 'relop', 'op', 'delimiter', 'error')
+TYPE_CODES = {name: code for code, name in enumerate(TOKEN_TYPES)}
+
+# برچسب نمایشی هر نوع توکن در خروجی - مثلا num(12) یا lexical error(@)
+TOKEN_LABELS = {
+    'comment': 'comment',
+    'keyword': 'keyword',
+    'id': 'id',
+    'number': 'num',
+    'relop': 'relop',
+    'op': 'op',
+    'delimiter': 'delimiter',
+    'error': 'lexical error',
+}
+
+
+class TokenBuffer(Sequence):
+    """
+    ذخیره ی فشرده ی توکن ها در چهار ستون موازی (array) به جای لیست تاپل ها:
+    کد نوع، شروع، پایان و شماره خط. متن توکن فقط موقع نیاز از source بریده میشه.
+
+    از بیرون مثل لیست قبلی رفتار میکنه - هر عضو (text, line, type) است.
+    source میتونه bytes/mmap هم باشه (Lexer با ورودی بایتی)؛ آن وقت مکان ها بر حسب
+    بایت اند و متن هر توکن موقع خواندن از utf-8 دیکد میشه
+    """
+
+    def __init__(self, source=''):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self._line_index = None
+
+    def append(self, tok_type, start, end, line):
+        self.types.append(TYPE_CODES[tok_type])
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def clear(self):
+        del self.types[:], self.starts[:], self.ends[:], self.lines[:]
+
+    def __len__(self):
+        return len(self.types)
+
+    # ---------- دسترسی تنبل به هر توکن ----------
+
+    def type(self, i):
+        return TOKEN_TYPES[self.types[i]]
+
+    def line(self, i):
+        return self.lines[i]
+
+    def span(self, i):
+        return self.starts[i], self.ends[i]
+
+    def position(self, i):
+        """(خط, ستون) شروع توکن i - ستون از روی line_index حساب میشه"""
+        return self.line_index.position(self.starts[i])
+
+    @property
+    def line_index(self):
+        """شروع خط های source (LineIndex)؛ اگر source عوض شده باشه دوباره ساخته میشه"""
+        index = self._line_index
+        if index is None or index.source is not self.source:
+            index = self._line_index = LineIndex(self.source)
+        return index
+
+    @line_index.setter
+    def line_index(self, index):
+        self._line_index = index
+
+    def text(self, i):
+        value = self.source[self.starts[i]:self.ends[i]]
+        return value if isinstance(value, str) else str(value, 'utf-8', 'replace')
+
+    def display(self, i):
+        # همان رشته ای که لکسر قبلا برای هر توکن میساخت
+        return f"{TOKEN_LABELS[TOKEN_TYPES[self.types[i]]]}({self.text(i)})"
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("token index out of range")
+        return self.display(i), self.lines[i], TOKEN_TYPES[self.types[i]]
+
+    def __iter__(self):
+        source = self.source
+        binary = not isinstance(source, str)
+        for code, start, end, line in zip(self.types, self.starts, self.ends, self.lines):
+            tok_type = TOKEN_TYPES[code]
+            text = str(source[start:end], 'utf-8', 'replace') if binary else source[start:end]
+            yield f"{TOKEN_LABELS[tok_type]}({text})", line, tok_type
+
+    def indices(self, tok_type):
+        """شماره ی همه ی توکن های یک نوع به ترتیب"""
+        code = bytes([TYPE_CODES[tok_type]])
+        types = self.types.tobytes()
+        result = []
+        i = types.find(code)
+        while i != -1:
+            result.append(i)
+            i = types.find(code, i + 1)
+        return result
+
+    def symbol_table(self):
+        """جدول شناسه ها به ترتیب اولین رخداد - همان چیزی که لکسر میسازه"""
+        table = {}
+        source, starts, ends = self.source, self.starts, self.ends
+        for i in self.indices('id'):
+            name = source[starts[i]:ends[i]]
+            if name not in table:
+                table[name] = len(table) + 1
+        if not isinstance(source, str):
+            table = {str(name, 'utf-8'): index for name, index in table.items()}
+        return table
+
+    @property
+    def nbytes(self):
+        """حافظه ی ستون ها (بدون خود متن ورودی)"""
+        return sum(col.itemsize * len(col) for col in (self.types, self.starts, self.ends, self.lines))
@@ -0,0 +1,159 @@
+import struct
+import sys
+from array import array
+
+from disk_cache import DiskCache, content_key, default_directory
+from line_index import LineIndex
+from token_buffer import TokenBuffer
+
+# با هر تغییر در قالب فایل یا رفتار لکسر عوض میشه تا فایل های قدیمی استفاده نشن
+_FORMAT = 'tokens-v2'
+
+# سرآیند: امضا، تعداد توکن ها، طول نام شناسه ها (utf-8)، اندازه ی مکان ها (4 یا 8 بایت)
+_HEADER = struct.Struct('<4sIIB3x')
+_OFFSET_TYPES = {4: 'I', 8: 'Q'}
+_MAGIC = b'TOKC'
+
+
+def _config_text(lexer):
+    # مجموعه ها مرتب میشن چون ترتیب frozenset بین اجراها ثابت نیست
+    return repr([sorted(chars) for chars in lexer._config_key()])
+
+
+class TokenCache:
+    """
+    کش توکن ها بر اساس محتوای فایل: کلید هش متن ورودی به همراه تنظیمات لکسر
+    (کلمات کلیدی، عملگرها و ...) است، پس فایل تغییرنکرده دوباره اسکن نمیشه.
+
+    قالب فایل بعد از سرآیند: ستون types، بعد starts و ends (uint32، یا uint64 برای
+    ورودی های بزرگتر از 4GB) و lines (uint32) با ترتیب بایت همین ماشین - که در کلید
+    هم هست - و در آخر نام شناسه ها با '\\n'.
+    موقع بارگذاری فایل map میشه و ستون های TokenBuffer مستقیم memoryview روی آن هستن.
+    ورودی str و bytes/mmap (Lexer.from_file) کلید جدا دارن چون مکان ها یکی بر حسب
+    کاراکتر و دیگری بر حسب بایت است
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.cache = DiskCache(directory or default_directory('tokens'), max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0    # حجم (utf-8) متن هایی که به خاطر hit دوباره اسکن نشدن
+
+    @staticmethod
+    def _source(lexer):
+        # متنی که هش میشه: str به utf-8، ورودی bytes/mmap همان طور که هست (بدون کپی)
+        code = lexer.code
+        return code.encode('utf-8') if isinstance(code, str) else code
+
+    def key(self, lexer, source=None):
+        if source is None:
+            source = self._source(lexer)
+        unit = 'chars' if isinstance(lexer.code, str) else 'bytes'
+        return content_key(_FORMAT, sys.byteorder, unit, _config_text(lexer), source)
+
+    def record(self, saved):
+        """ثبت یک جستجو: saved حجم متن در hit یا None برای miss"""
+        if saved is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.bytes_saved += saved
+
+    @staticmethod
+    def _check(view):
+        """(count, names_size, offset_size) از سرآیند، اگر با اندازه ی فایل جور باشه"""
+        magic, count, names_size, offset_size = _HEADER.unpack_from(view)
+        if magic != _MAGIC or offset_size not in _OFFSET_TYPES:
+            raise ValueError("not a token cache entry")
+        size = _HEADER.size + count + (-count % 8) + (2 * offset_size + 4) * count + names_size
+        if size != len(view):
+            raise ValueError("truncated token cache entry")
+        return count, names_size, offset_size
+
+    def load(self, lexer, copy=False):
+        """
+        (TokenBuffer, جدول شناسه ها) برای lexer.code یا None.
+        با copy=False ستون ها فقط خواندنی و بدون کپی اند؛ copy=True آرایه ی
+        معمولی میسازه (مثلا برای Lexer.relex که بافر را تغییر میده)
+        """
+        source = self._source(lexer)
+        key = self.key(lexer, source)
+        data = self.cache.open(key)
+        if data is None:
+            self.record(None)
+            return None
+
+        view = memoryview(data)
+        try:
+            count, names_size, offset_size = self._check(view)
+            names = str(view[len(view) - names_size:], 'utf-8')
+        except (struct.error, ValueError):      # فایل خراب یا ناقص: مثل miss و پاک میشه
+            count = None
+        if count is None:
+            view.release()
+            data.close()
+            self.cache.discard(key)
+            self.record(None)
+            return None
+
+        offset = _HEADER.size
+        raw = [view[offset:offset + count]]
+        offset += count + (-count % 8)
+        for size in (offset_size, offset_size, 4):
+            raw.append(view[offset:offset + size * count])
+            offset += size * count
+
+        offset_type = _OFFSET_TYPES[offset_size]
+        columns = []
+        for typecode, column in zip(('B', offset_type, offset_type, 'I'), raw):
+            if copy:
+                a = array(typecode)
+                a.frombytes(column)
+                columns.append(a)
+            else:
+                columns.append(column.cast(typecode))
+
+        buffer = TokenBuffer(lexer.code)
+        buffer.types, buffer.starts, buffer.ends, buffer.lines = columns
+        symbol_table = {name: i for i, name in enumerate(names.split('\n'), 1)} if names else {}
+
+        # وضعیت لکسر مثل بعد از tokenize_buffer
+        lexer.symbol_table = symbol_table
+        lexer.pos = lexer.len
+        if isinstance(lexer.code, str):
+            lexer.line = lexer.code.count('\n') + 1
+        else:
+            # mmap متد count نداره؛ LineIndex همان است که tokenize_buffer هم میسازه
+            buffer.line_index = lexer.line_index = LineIndex(lexer.code)
+            lexer.line = lexer.line_index.last_line
+        self.record(len(source))
+        return buffer, symbol_table
+
+    def store(self, lexer, buffer, symbol_table):
+        count = len(buffer)
+        names = '\n'.join(symbol_table).encode('utf-8')
+        parts = [_HEADER.pack(_MAGIC, count, len(names), buffer.starts.itemsize),
+                 bytes(buffer.types), bytes(-count % 8)]
+        for column in (buffer.starts, buffer.ends, buffer.lines):
+            parts.append(bytes(column))
+        parts.append(names)
+        self.cache.put(self.key(lexer), b''.join(parts))
+
+    def tokenize(self, lexer, copy=False):
+        """مثل lexer.tokenize_buffer ولی از کش (و ذخیره ی نتیجه در miss)"""
+        cached = self.load(lexer, copy)
+        if cached is not None:
+            return cached
+        buffer, symbol_table = lexer.tokenize_buffer()
+        self.store(lexer, buffer, symbol_table)
+        return buffer, symbol_table
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'evictions': self.cache.evictions,
+        }
@@ -0,0 +1,255 @@
+import csv
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from itertools import islice
+from json.encoder import encode_basestring
+
+from lexer import Lexer
+from token_buffer import TOKEN_LABELS, TOKEN_TYPES, TYPE_CODES, TokenBuffer
+
+# قالب ها به ترتیب نمایش؛ پسوند فایل قالب پیش فرض را تعیین میکنه
+FORMATS = ('text', 'csv', 'jsonl', 'binary')
+EXTENSIONS = {'.txt': 'text', '.csv': 'csv', '.jsonl': 'jsonl', '.tok': 'binary'}
+
+# قالب دودویی ستونی:
+#   سرآیند: امضا و نسخه
+#   هر بلوک: (تعداد توکن، حجم متن، 0) + types (u8) + lines و starts و ends (u32) + متن utf-8
+#   پایان: بلوک با تعداد 0 که متنش نام شناسه ها با '\n' است (پس بلوک توکن ها هیچ وقت خالی نیست)
+# همه ی اعداد little-endian اند و مکان ها در کل متن های پشت سر هم معتبرن (حداکثر 4GB)
+_MAGIC = b'TOKX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sI')
+_CHUNK = struct.Struct('<III')
+_WRITE_BLOCK = 1 << 20          # متن های بزرگ (مثلا یک mmap کامل) در این اندازه نوشته میشن
+
+
+def _pad(n):
+    return bytes(-n % 4)
+
+
+def _little(column):
+    # آرایه با ترتیب بایت فایل (کپی فقط روی ماشین های big-endian)
+    if sys.byteorder == 'little':
+        return column
+    column = array(column.typecode, column)
+    column.byteswap()
+    return column
+
+
+def _records(tokens):
+    # (نوع, متن, خط) برای هر توکن - از TokenBuffer بدون ساختن رشته ی نمایشی
+    if isinstance(tokens, TokenBuffer):
+        source = tokens.source
+        binary = not isinstance(source, str)
+        for code, start, end, line in zip(tokens.types, tokens.starts, tokens.ends, tokens.lines):
+            text = str(source[start:end], 'utf-8', 'replace') if binary else source[start:end]
+            yield TOKEN_TYPES[code], text, line
+    else:
+        for token, line, tok_type in tokens:
+            yield tok_type, token[len(TOKEN_LABELS[tok_type]) + 1:-1], line
+
+
+def format_for(path):
+    """قالب از روی پسوند فایل - پیش فرض text"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'text')
+
+
+class TokenWriter:
+    """
+    نوشتن توکن ها و جدول شناسه ها در یکی از FORMATS روی یک فایل دودویی باز.
+
+    توکن ها در بلوک های chunk_size تایی قالب بندی و با یک write نوشته میشن، پس
+    write_tokens میتونه مستقیم خروجی Lexer.iter_tokens را بگیره بدون اینکه لیست
+    توکن ها ساخته بشه (و چند بار هم صدا زده بشه). جدول شناسه ها آخر نوشته میشه
+    چون در حالت جریانی فقط بعد از آخرین توکن کامل است
+
+        with open(path, 'wb') as f:
+            writer = TokenWriter(f, 'csv')
+            writer.write_tokens(lexer.iter_tokens(source))
+            writer.close(lexer.symbol_table)
+    """
+
+    def __init__(self, file, fmt='text', chunk_size=1 << 16):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format {fmt!r}, expected one of {FORMATS}")
+        self.file = file
+        self.format = fmt
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._text_size = 0         # قالب دودویی: حجم متن های نوشته شده تا اینجا
+        if fmt == 'csv':
+            file.write(b'type,text,line\r\n')
+        elif fmt == 'binary':
+            file.write(_HEADER.pack(_MAGIC, _VERSION))
+
+    def write_tokens(self, tokens):
+        """tokens: یک TokenBuffer یا هر iterable از (text, line, type)"""
+        if self.format == 'binary' and isinstance(tokens, TokenBuffer):
+            self._write_buffer(tokens)
+        else:
+            self._write_records(tokens)
+
+    def _write_records(self, tokens):
+        write_chunk = getattr(self, '_' + self.format)
+        records = _records(tokens)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            write_chunk(chunk)
+            self.count += len(chunk)
+
+    def close(self, symbol_table=None):
+        """نوشتن جدول شناسه ها (در صورت وجود) - خود فایل را نمیبنده"""
+        symbol_table = symbol_table or {}
+        write = self.file.write
+        if self.format == 'text':
+            if symbol_table:
+                write(('\nsymbol table:\n' + ''.join(f"{name} {index}\n" for name, index in
+                                                     symbol_table.items())).encode('utf-8'))
+        elif self.format == 'csv':
+            if symbol_table:
+                out = io.StringIO(newline='')
+                rows = csv.writer(out)
+                rows.writerow(())
+                rows.writerow(('identifier', 'index'))
+                rows.writerows(symbol_table.items())
+                write(out.getvalue().encode('utf-8'))
+        elif self.format == 'jsonl':
+            write(json.dumps({'symbol_table': symbol_table}, ensure_ascii=False).encode('utf-8') + b'\n')
+        else:
+            names = '\n'.join(symbol_table).encode('utf-8')
+            write(_CHUNK.pack(0, len(names), 0) + names)
+
+    # ---------- قالب ها (هر کدام یک بلوک از (نوع, متن, خط)) ----------
+
+    def _text(self, chunk):
+        # همان قالب قبلی دکمه ی دانلود
+        labels = TOKEN_LABELS
+        self.file.write(''.join([f"{labels[tok_type]}({text}) [line:{line}]\n"
+                                 for tok_type, text, line in chunk]).encode('utf-8'))
+
+    def _csv(self, chunk):
+        out = io.StringIO(newline='')
+        csv.writer(out).writerows(chunk)
+        self.file.write(out.getvalue().encode('utf-8'))
+
+    def _jsonl(self, chunk):
+        # encode_basestring همان رشته ی JSON با ensure_ascii=False است، بدون هزینه ی json.dumps
+        self.file.write(''.join([f'{{"type":"{tok_type}","text":{encode_basestring(text)},"line":{line}}}\n'
+                                 for tok_type, text, line in chunk]).encode('utf-8'))
+
+    def _binary(self, chunk):
+        texts = [text.encode('utf-8') for _, text, _ in chunk]
+        types = bytes([TYPE_CODES[tok_type] for tok_type, _, _ in chunk])
+        lines = array('I', [line for _, _, line in chunk])
+        starts, ends = array('I'), array('I')
+        offset = self._text_size
+        for text in texts:
+            starts.append(offset)
+            offset += len(text)
+            ends.append(offset)
+        self._write_chunk(types, lines, starts, ends, b''.join(texts))
+
+    def _write_buffer(self, buffer):
+        # TokenBuffer: ستون ها مستقیم نوشته میشن و متن کل ورودی جای متن تک تک توکن هاست
+        source = buffer.source
+        if isinstance(source, str):
+            data = source.encode('utf-8')
+            if len(data) != len(source):
+                # مکان ها بر حسب کاراکترن؛ با ورودی غیر ASCII توکن به توکن نوشته میشه
+                self._write_records(buffer)
+                return
+        else:
+            # bytes/mmap: بدون کپی؛ _write_chunk آن را تکه تکه از روی نگاشت مینویسه
+            data = memoryview(source).cast('B')
+        if self._text_size or buffer.starts.typecode != 'I':
+            self._write_records(buffer)
+            return
+        self._write_chunk(buffer.types, buffer.lines, buffer.starts, buffer.ends, data)
+        self.count += len(buffer)
+
+    def _write_chunk(self, types, lines, starts, ends, text):
+        if not len(types):
+            return      # بلوک بدون توکن با بلوک پایانی اشتباه میشه (مثلا ورودی فقط فاصله یا توضیح)
+        write = self.file.write
+        write(_CHUNK.pack(len(types), len(text), 0))
+        write(types)
+        write(_pad(len(types)))
+        for column in (lines, starts, ends):
+            write(_little(column))
+        if len(text) > _WRITE_BLOCK:
+            text = memoryview(text)
+            for i in range(0, len(text), _WRITE_BLOCK):
+                write(text[i:i + _WRITE_BLOCK])
+        else:
+            write(text)
+        write(_pad(len(text)))
+        self._text_size += len(text)
+
+
+def export_tokens(path, tokens, symbol_table=None, fmt=None, chunk_size=1 << 16):
+    """نوشتن tokens (TokenBuffer یا iterable از (text, line, type)) در path"""
+    with open(path, 'wb', buffering=1 << 20) as f:
+        writer = TokenWriter(f, fmt or format_for(path), chunk_size)
+        writer.write_tokens(tokens)
+        writer.close(symbol_table)
+    return writer.count
+
+
+def export_file(path, source_path, fmt=None, engine='regex', chunk_size=1 << 16):
+    """
+    توکن سازی source_path به صورت جریانی و نوشتن مستقیم در path:
+    نه متن کامل ورودی و نه لیست توکن ها در حافظه ساخته میشه
+    """
+    lexer = Lexer(engine=engine)
+    with open(source_path, encoding='utf-8') as src, open(path, 'wb', buffering=1 << 20) as f:
+        writer = TokenWriter(f, fmt or format_for(path), chunk_size)
+        writer.write_tokens(lexer.iter_tokens(src))
+        writer.close(lexer.symbol_table)
+    return writer.count, lexer.symbol_table
+
+
+def load_binary(path):
+    """
+    خواندن فایل قالب binary: (TokenBuffer, جدول شناسه ها).
+    ستون ها با array.frombytes و بدون حلقه روی توکن ها ساخته میشن؛ source بافر
+    متن توکن ها (bytes) است که هر متن فقط موقع نیاز دیکد میشه
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    view = memoryview(data)
+    magic, version = _HEADER.unpack_from(view)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a binary token export")
+
+    buffer = TokenBuffer(b'')
+    columns = (buffer.lines, buffer.starts, buffer.ends)
+    texts = []
+    pos = _HEADER.size
+    while True:
+        count, text_size, _ = _CHUNK.unpack_from(view, pos)
+        pos += _CHUNK.size
+        if not count:
+            names = str(view[pos:pos + text_size], 'utf-8')
+            break
+        buffer.types.frombytes(view[pos:pos + count])
+        pos += count + (-count % 4)
+        for column in columns:
+            column.frombytes(view[pos:pos + 4 * count])
+            pos += 4 * count
+        texts.append(view[pos:pos + text_size])
+        pos += text_size + (-text_size % 4)
+
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+    if max(buffer.types, default=0) >= len(TOKEN_TYPES):
+        raise ValueError(f"{path}: unknown token type")
+    buffer.source = b''.join(texts)
+    symbol_table = {name: i for i, name in enumerate(names.split('\n'), 1)} if names else {}
+    return buffer, symbol_table
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from tkinter import ttk
+
+from token_buffer import TokenBuffer
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview ای که همیشه فقط height ردیف داره. موقع اسکرول ردیف ها از
+    row_values(i) -> (values, tags) دوباره پر میشن، پس نمایش یک میلیون ردیف
+    همان هزینه ی نمایش height ردیف را داره
+    """
+
+    def __init__(self, master, columns, height=14, **kwargs):
+        super().__init__(master, **kwargs)
+        self.height = height
+        self.count = 0
+        self.top = 0
+        self.rows = None                # فهرست اختیاری شماره ردیف های نمایش داده شده (فیلتر)
+        self.row_values = lambda i: ((), ())
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height,
+                                 selectmode='browse')
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self._slots = [self.tree.insert("", "end", values=()) for _ in range(height)]
+
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3))
+            widget.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.top - self.height))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.top + self.height))
+
+    # ---------- داده ----------
+    def set_rows(self, count, row_values):
+        self.count = count
+        self.row_values = row_values
+        self.rows = None
+        self.top = 0
+        self.refresh()
+
+    def set_filter(self, rows):
+        """rows: شماره ی ردیف های قابل نمایش به ترتیب، یا None برای همه ی ردیف ها"""
+        self.rows = rows
+        self.top = 0
+        self.refresh()
+
+    def clear(self):
+        self.set_rows(0, lambda i: ((), ()))
+
+    def __len__(self):
+        return self.count if self.rows is None else len(self.rows)
+
+    # ---------- اسکرول ----------
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self) - self.height))
+        if top != self.top:
+            self.top = top
+            self.refresh()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self)))
+        else:
+            step = self.height if unit == 'pages' else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.top - (event.delta // 120 or (1 if event.delta > 0 else -1)) * 3)
+
+    def refresh(self):
+        total = len(self)
+        for slot, iid in enumerate(self._slots):
+            pos = self.top + slot
+            if pos < total:
+                row = pos if self.rows is None else self.rows[pos]
+                values, tags = self.row_values(row)
+                self.tree.item(iid, values=values, tags=tags)
+            else:
+                self.tree.item(iid, values=(), tags=())
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.height) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def show(self, pos):
+        """اسکرول تا ردیف pos (در صورت امکان بالای جدول) و انتخاب آن"""
+        self.scroll_to(pos)
+        if 0 <= pos - self.top < self.height and pos < len(self):
+            self.tree.selection_set(self._slots[pos - self.top])
+
+
+# ---------- توابع کمکی توکن ها ----------
+def token_row(tokens):
+    """
+    row_values برای یک دنباله ی توکن: (#, توکن, خط, ستون) با رنگ نوع توکن.
+    فقط TokenBuffer مکان توکن ها را میدونه، پس بقیه ی دنباله ها ستون ندارن
+    """
+    if isinstance(tokens, TokenBuffer):
+        def row_values(i):
+            token, line, ttype = tokens[i]
+            return (i + 1, token, line, tokens.position(i)[1]), (ttype,)
+    else:
+        def row_values(i):
+            token, line, ttype = tokens[i]
+            return (i + 1, token, line, ""), (ttype,)
+    return row_values
+
+
+def rows_of_type(tokens, ttype):
+    """شماره ی همه ی توکن های یک نوع به ترتیب"""
+    if isinstance(tokens, TokenBuffer):
+        return tokens.indices(ttype)
+    return [i for i, (_, _, t) in enumerate(tokens) if t == ttype]
+
+
+def first_row_at_line(tokens, line, rows=None):
+    """جای اولین توکن در خط line یا بعد از آن (در rows، یا در خود توکن ها)"""
+    if isinstance(tokens, TokenBuffer):
+        # شروع خط از LineIndex، بعد جستجوی دودویی روی شروع توکن ها
+        starts = tokens.starts
+        if rows is None:
+            return tokens.line_index.first_at_or_after(starts, line)
+        return tokens.line_index.first_at_or_after(rows, line, key=starts.__getitem__)
+    lines = [t[1] for t in tokens]
+    if rows is None:
+        return bisect_left(lines, line)
+    return bisect_left(rows, line, key=lines.__getitem__)